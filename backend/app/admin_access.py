@@ -0,0 +1,112 @@
+"""
+Admin Authorisation
+Admin users are identified by an admin flag in their Supabase user metadata,
+their email domain (ADMIN_EMAIL_DOMAINS) or their email (ADMIN_EMAILS). The
+lists are read once at import, and each user's decision is cached for a short
+TTL so admin endpoints do not call the Supabase auth API on every request.
+revoke_admin_access() drops cached decisions in every worker.
+
+Operational endpoints (metrics, pool and routing stats) also accept a
+METRICS_TOKEN bearer token, so a Prometheus scraper needs no admin account.
+"""
+
+import hmac
+import os
+import threading
+from typing import FrozenSet, Optional
+
+from fastapi import HTTPException, Request
+
+from app.cache import Cache
+from app.supabase_client import get_supabase_client
+
+# Seconds an admin / not-admin decision is reused
+ADMIN_ACCESS_CACHE_TTL_SECONDS = float(os.getenv("ADMIN_ACCESS_CACHE_TTL_SECONDS", "60"))
+
+
+def _parse_list(value: str) -> FrozenSet[str]:
+    return frozenset(item.strip().lower() for item in value.split(",") if item.strip())
+
+
+ADMIN_EMAILS = _parse_list(os.getenv("ADMIN_EMAILS", ""))
+ADMIN_EMAIL_DOMAINS = _parse_list(os.getenv("ADMIN_EMAIL_DOMAINS", ""))
+
+# Bearer token accepted by the operational endpoints; unset means admins only
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+
+admin_access_cache = Cache("admin_access", maxsize=1024, ttl=ADMIN_ACCESS_CACHE_TTL_SECONDS)
+
+_service_client = None
+_client_lock = threading.Lock()
+
+
+def _supabase_admin():
+    """Service-role client, created once"""
+    global _service_client
+    if _service_client is None:
+        with _client_lock:
+            if _service_client is None:
+                _service_client = get_supabase_client(use_service_key=True)
+    return _service_client
+
+
+def is_admin_user(user) -> bool:
+    """Admin decision for a Supabase auth user"""
+    metadata = user.user_metadata or {}
+    if metadata.get("is_admin") is True or metadata.get("admin") is True:
+        return True
+    email = (user.email or "").lower()
+    if not email:
+        return False
+    return email in ADMIN_EMAILS or email.split("@")[-1] in ADMIN_EMAIL_DOMAINS
+
+
+def check_admin_access(user_id: str) -> bool:
+    """
+    Check if user has admin access
+    Admin users are identified by email domain or explicit admin flag in metadata.
+    Decisions are cached per user id; lookup failures are not cached.
+    """
+    if not user_id:
+        return False
+
+    cached = admin_access_cache.get(user_id)
+    if cached is not None:
+        return cached
+
+    supabase = _supabase_admin()
+    if not supabase:
+        return False
+
+    generation = admin_access_cache.generation
+    try:
+        user_res = supabase.auth.admin.get_user_by_id(user_id)
+    except Exception as e:
+        print(f"Error checking admin access: {e}")
+        return False
+
+    user = getattr(user_res, "user", None) if user_res else None
+    allowed = bool(user) and is_admin_user(user)
+    admin_access_cache.set(user_id, allowed, generation=generation)
+    return allowed
+
+
+def revoke_admin_access(user_id: Optional[str] = None):
+    """Forget the cached decision for one user, or for everyone - the next check asks Supabase again"""
+    if user_id is None:
+        admin_access_cache.clear()
+    else:
+        admin_access_cache.delete(user_id)
+
+
+def require_operator_access(request: Request):
+    """
+    Dependency for operational endpoints: Authorization: Bearer <METRICS_TOKEN>,
+    or an admin user id in X-User-Id
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if METRICS_TOKEN and scheme.lower() == "bearer" and hmac.compare_digest(token.encode(), METRICS_TOKEN.encode()):
+        return
+    if check_admin_access(request.headers.get("x-user-id", "")):
+        return
+    raise HTTPException(status_code=403, detail="Admin access required")
@@ -0,0 +1,165 @@
+"""
+Admin Dashboard Statistics
+Platform statistics are computed in the background on a fixed cadence and
+the admin dashboard is served the latest snapshot, so loading it runs no
+queries. Registrations are rolled up per UTC day and profile type: days
+before yesterday are final and never re-read, each refresh only recounts
+yesterday and today.
+With CACHE_BACKEND=redis one worker at a time holds the refresh lease and
+publishes the snapshot for all of them; with the memory backend every worker
+holds its own lease and refreshes for itself.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from datetime import date, datetime, time as dt_time, timedelta, timezone
+from typing import Dict, Optional
+
+from app.cache import WORKER_ID, Cache
+from app.metrics import metrics
+from app.supabase_client import get_supabase_client
+
+# Seconds between refreshes (0 disables the refresher)
+ADMIN_STATS_REFRESH_SECONDS = float(os.getenv("ADMIN_STATS_REFRESH_SECONDS", "300"))
+# Days of daily registration rollups kept and returned
+ADMIN_STATS_ROLLUP_DAYS = int(os.getenv("ADMIN_STATS_ROLLUP_DAYS", "30"))
+
+PROFILE_TABLES = {"talent": "talent_profiles", "business": "business_profiles"}
+PAGE_SIZE = 1000
+
+# Keys in the shared admin_stats cache
+SNAPSHOT_KEY = "snapshot"
+LEASE_KEY = "refresh_lease"
+
+
+class AdminStats:
+    """Latest statistics snapshot plus the daily rollups it is built from"""
+
+    def __init__(self, rollup_days: int = ADMIN_STATS_ROLLUP_DAYS, shared: Optional[Cache] = None):
+        self.rollup_days = rollup_days
+        # Where the snapshot and the refresh lease are shared with the other workers
+        self.shared = shared
+        self.daily: Dict[date, Counter] = {}
+        self.final_through: Optional[date] = None  # Days up to here are complete
+        self.snapshot: Optional[Dict] = None
+        self._lock = threading.Lock()
+
+    def _count(self, client, table: str) -> int:
+        return client.table(table).select("id", count="exact", head=True).execute().count or 0
+
+    def _registrations_since(self, client, table: str, since: datetime) -> Counter:
+        """Rows per UTC day created at or after since, read a page at a time"""
+        per_day: Counter = Counter()
+        offset = 0
+        while True:
+            rows = (
+                client.table(table).select("created_at")
+                .gte("created_at", since.isoformat())
+                .order("created_at")
+                .range(offset, offset + PAGE_SIZE - 1)
+                .execute().data or []
+            )
+            for row in rows:
+                if row.get("created_at"):
+                    per_day[datetime.fromisoformat(row["created_at"].replace("Z", "+00:00")).date()] += 1
+            if len(rows) < PAGE_SIZE:
+                return per_day
+            offset += PAGE_SIZE
+
+    def refresh(self, client):
+        """Recount totals and the open days, then publish a new snapshot"""
+        today = datetime.now(timezone.utc).date()
+        window_start = today - timedelta(days=self.rollup_days - 1)
+        yesterday = today - timedelta(days=1)
+        # First run fills the whole window; later runs reopen only yesterday and today
+        start = window_start if self.final_through is None else min(self.final_through + timedelta(days=1), yesterday)
+        start = max(start, window_start)
+        since = datetime.combine(start, dt_time.min, tzinfo=timezone.utc)
+
+        totals = {kind: self._count(client, table) for kind, table in PROFILE_TABLES.items()}
+        recounted = {kind: self._registrations_since(client, table, since) for kind, table in PROFILE_TABLES.items()}
+
+        daily = {day: counts for day, counts in self.daily.items() if window_start <= day < start}
+        day = start
+        while day <= today:
+            daily[day] = Counter({kind: recounted[kind].get(day, 0) for kind in PROFILE_TABLES})
+            day += timedelta(days=1)
+
+        week_start = today - timedelta(days=6)
+        recent = Counter()
+        for day, counts in daily.items():
+            if day >= week_start:
+                recent.update(counts)
+
+        snapshot = {
+            "total_talent": totals["talent"],
+            "total_business": totals["business"],
+            # Supabase has no cheap auth user count, so users are estimated from profiles
+            "total_users": totals["talent"] + totals["business"],
+            "recent_talent_7d": recent["talent"],
+            "recent_business_7d": recent["business"],
+            "daily_registrations": [
+                {"date": day.isoformat(), **{kind: daily[day][kind] for kind in PROFILE_TABLES}}
+                for day in sorted(daily)
+            ],
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self.daily = daily
+            self.final_through = yesterday - timedelta(days=1)
+            self.snapshot = snapshot
+        if self.shared is not None:
+            self.shared.set(SNAPSHOT_KEY, snapshot)
+
+    def holds_lease(self, ttl: float, worker_id: str = WORKER_ID) -> bool:
+        """Whether worker_id should refresh: it holds the refresh lease (renewed here) or just took it"""
+        if self.shared is None:
+            return True
+        if self.shared.get(LEASE_KEY) == worker_id:
+            self.shared.set(LEASE_KEY, worker_id, ttl=ttl)
+            return True
+        return self.shared.add(LEASE_KEY, worker_id, ttl=ttl)
+
+    def latest(self) -> Optional[Dict]:
+        """The current snapshot with its age, or None before the first refresh"""
+        snapshot = self.shared.get(SNAPSHOT_KEY) if self.shared is not None else None
+        if snapshot is None:
+            with self._lock:
+                snapshot = self.snapshot
+        if snapshot is None:
+            return None
+        age = datetime.now(timezone.utc) - datetime.fromisoformat(snapshot["generated_at"])
+        return {**snapshot, "age_seconds": round(age.total_seconds(), 1)}
+
+
+admin_stats = AdminStats(shared=Cache("admin_stats", maxsize=8, ttl=max(3 * ADMIN_STATS_REFRESH_SECONDS, 60)))
+
+
+def refresh_admin_stats() -> bool:
+    """One refresh; False if Supabase is not configured or the refresh failed"""
+    client = get_supabase_client(use_service_key=True)
+    if not client:
+        return False
+    started = time.perf_counter()
+    try:
+        admin_stats.refresh(client)
+    except Exception as e:
+        metrics.incr("admin_stats_refresh_errors_total")
+        print(f"[ADMIN STATS] Refresh failed, keeping the previous snapshot: {e}")
+        return False
+    metrics.observe("admin_stats_refresh_seconds", time.perf_counter() - started)
+    return True
+
+
+async def run_admin_stats_refresher(interval: float = ADMIN_STATS_REFRESH_SECONDS):
+    """Background task: refresh the admin statistics now and then every `interval` seconds"""
+    if interval <= 0 or not get_supabase_client(use_service_key=True):
+        return
+    while True:
+        # The lease outlives an interval, so a leader that stops renewing it is replaced within two
+        if admin_stats.holds_lease(ttl=2 * interval):
+            await asyncio.to_thread(refresh_admin_stats)
+        await asyncio.sleep(interval)
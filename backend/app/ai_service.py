@@ -5,9 +5,15 @@ Uses OpenAI and LangChain for intelligent resume parsing and data extraction
 
 import os
 import base64
-from typing import Dict, List, Optional
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
 import json
 from openai import OpenAI
+from app.model_router import ModelRouter, RouteDecision
+from app.metrics import metrics
+from app.resume_stream import ExperienceStreamScanner, find_contact_fields
+from app.resume_text_store import normalize_text, text_hash
+from app.token_budget import OUTPUT_TOKEN_RESERVE, estimate_tokens, input_budget, plan_prompt, to_json, trim_fields
 import PyPDF2
 import docx
 import io
@@ -40,6 +46,8 @@ class AIService:
         else:
             self.openai_client = None
         self.model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+        # Routes each call to the fast or large model (self.model stays the large model)
+        self.router = ModelRouter()
         # Initialize text splitter only if langchain is available
         if LANGCHAIN_AVAILABLE and RecursiveCharacterTextSplitter:
             self.text_splitter = RecursiveCharacterTextSplitter(
@@ -58,14 +66,16 @@ class AIService:
             filename: Original filename
             
         Returns:
-            Dictionary with parsed resume data
+            Dictionary with parsed resume data. The full normalised text is
+            returned under "extracted_text" so callers can persist it; it is
+            not a ResumeData column and must be popped before storing.
         """
         if not self.openai_client:
             raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
         try:
             print(f"[AI_SERVICE] Extracting text from {filename}...")
             # Extract text from file
-            text = self._extract_text(file_content, filename)
+            text = normalize_text(self._extract_text(file_content, filename))
             
             if not text:
                 raise ValueError("Could not extract text from resume file")
@@ -83,6 +93,7 @@ class AIService:
             structured_data["original_filename"] = filename
             structured_data["file_type"] = self._get_file_type(filename)
             structured_data["file_size"] = len(file_content)
+            structured_data["extracted_text"] = text
             
             return structured_data
             
@@ -92,6 +103,124 @@ class AIService:
             print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
             raise Exception(f"Error parsing resume: {str(e)}")
     
+    async def parse_text(self, text: str, filename: str) -> Dict:
+        """
+        Parse already-extracted resume text (used to re-parse stored texts
+        without the original file).
+        """
+        if not self.openai_client:
+            raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
+        return await self._parse_with_ai(normalize_text(text), filename)
+    
+    def stream_parse_resume(self, file_content: bytes, filename: str) -> Iterator[Tuple[str, Dict]]:
+        """
+        Parse a resume progressively, yielding (event, data) pairs as results become available:
+        "page" per extracted page, "contact" when new contact fields are found,
+        "experience" per experience entry as soon as the model has streamed it,
+        "reset" when the fast model's output is rejected and the request escalates
+        (discard all experiences received so far; confirmed ones are re-sent),
+        and finally "complete" with the same data parse_resume returns, including
+        extracted_text for the caller to persist. Failures are yielded as an "error" event.
+        
+        This is a blocking generator (the OpenAI client is synchronous); iterate
+        it in a worker thread.
+        """
+        if not self.openai_client:
+            yield "error", {"detail": "OpenAI API key not configured. Please set OPENAI_API_KEY environment variable."}
+            return
+        started = time.perf_counter()
+        first_experience = True
+        try:
+            # Pages and regex contact fields - available before any model call
+            pages = []
+            contact: Dict[str, str] = {}
+            for number, page_text in enumerate(self._extract_pages(file_content, filename), start=1):
+                pages.append(page_text)
+                yield "page", {"page": number, "characters": len(page_text), "text": page_text}
+                found = {k: v for k, v in find_contact_fields("\n".join(pages)).items() if k not in contact}
+                if found:
+                    contact.update(found)
+                    yield "contact", found
+            
+            text = normalize_text("\n".join(pages))
+            if not text:
+                raise ValueError("Could not extract text from resume file")
+            
+            system_prompt = self._resume_system_prompt()
+            decision = self.router.choose("resume_parse", text)
+            decision, plan = self._preflight("resume_parse", decision, system_prompt + self._resume_user_prompt(""), text)
+            
+            emitted = set()  # Identities sent since the last reset
+            confirmed = []  # Entries from attempts that passed validation
+            parts = []
+            for chunk in (plan.chunks if plan.strategy == "chunk" else [text]):
+                require_experience = plan.strategy != "chunk"
+                while True:
+                    scanner = ExperienceStreamScanner("experience")
+                    attempt = []
+                    for delta in self._stream_completion(
+                        decision,
+                        messages=[
+                            {"role": "system", "content": system_prompt},
+                            {"role": "user", "content": self._resume_user_prompt(chunk)}
+                        ],
+                        temperature=0.1,
+                        max_tokens=OUTPUT_TOKEN_RESERVE["resume_parse"],
+                        response_format={"type": "json_object"}
+                    ):
+                        for entry in scanner.feed(delta):
+                            identity = self._experience_identity(entry)
+                            if identity in emitted:
+                                continue
+                            emitted.add(identity)
+                            attempt.append(entry)
+                            if first_experience:
+                                metrics.observe("resume_stream_first_experience_seconds", time.perf_counter() - started)
+                                first_experience = False
+                            yield "experience", entry
+                    content = scanner.text
+                    if require_experience:
+                        failure = self._validate_resume_response(content)
+                    else:
+                        failure = self._validate_json_response(content)
+                    escalated = self.router.escalate(decision, failure) if failure else None
+                    if escalated:
+                        print(f"[AI_SERVICE] Fast model output failed validation ({failure}), escalating")
+                        # The rejected attempt's entries were already sent - the client drops every
+                        # experience on "reset" and gets the confirmed ones again before the retry
+                        yield "reset", {"reason": failure, "model": escalated.model}
+                        emitted = {self._experience_identity(entry) for entry in confirmed}
+                        for entry in confirmed:
+                            yield "experience", entry
+                        decision = escalated
+                        continue
+                    confirmed.extend(attempt)
+                    parts.append(json.loads(content or ""))
+                    break
+            
+            parsed_data = self._merge_resume_parts(parts) if len(parts) > 1 else parts[0]
+            # The model also reads name/address - report anything the regexes missed
+            found = {
+                k: parsed_data.get(k) for k in ("name", "email", "phone", "address", "linkedin", "github", "website")
+                if parsed_data.get(k) and k not in contact
+            }
+            if found:
+                contact.update(found)
+                yield "contact", found
+            
+            parsed_data["raw_data"] = self._resume_raw_data(text, filename, decision, plan)
+            parsed_data["original_filename"] = filename
+            parsed_data["file_type"] = self._get_file_type(filename)
+            parsed_data["file_size"] = len(file_content)
+            parsed_data["extracted_text"] = text
+            metrics.observe("resume_stream_total_seconds", time.perf_counter() - started)
+            yield "complete", parsed_data
+        except Exception as e:
+            import traceback
+            print(f"[AI_SERVICE] Error streaming resume parse: {str(e)}")
+            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
+            yield "error", {"detail": f"Error parsing resume: {str(e)}"}
+    
     async def polish_text(self, text: str) -> str:
         """
         Polish and format text using AI to improve grammar, spelling, and style.
@@ -123,22 +252,29 @@ Requirements:
 
 Return only the polished text without any explanations or additional commentary."""
             
-            user_prompt = f"""Please polish the following text, fixing grammar, spelling, and making it sound more professional:
+            user_template = """Please polish the following text, fixing grammar, spelling, and making it sound more professional:
 
-{text}"""
-            
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,
-                max_tokens=2000
-            )
+"""
             
-            polished_text = response.choices[0].message.content.strip()
-            return polished_text
+            decision = self.router.choose("polish", text)
+            decision, plan = self._preflight("polish", decision, system_prompt + user_template, text)
+            
+            if plan.strategy == "chunk":
+                # Long text is polished paragraph-group by paragraph-group; each chunk keeps
+                # the whitespace around it so the pieces join back into the original layout
+                polished_chunks = []
+                for chunk in plan.chunks:
+                    body = chunk.strip()
+                    if not body:
+                        polished_chunks.append(chunk)
+                        continue
+                    leading = chunk[:len(chunk) - len(chunk.lstrip())]
+                    trailing = chunk[len(chunk.rstrip()):]
+                    polished = self._polish_once(decision, system_prompt, user_template + body, body)
+                    polished_chunks.append(leading + polished + trailing)
+                return "".join(polished_chunks)
+            
+            return self._polish_once(decision, system_prompt, user_template + text, text)
             
         except Exception as e:
             import traceback
@@ -169,6 +305,19 @@ Return only the polished text without any explanations or additional commentary.
                 print(f"[AI_SERVICE] WARNING: Unknown file extension: {file_ext}")
                 raise ValueError(f"Unsupported file format: {file_ext}")
     
+    def _extract_pages(self, file_content: bytes, filename: str) -> Iterator[str]:
+        """Yield text page by page (PDF), or the whole document as one page for other formats"""
+        file_ext = filename.lower().split('.')[-1] if '.' in filename else ''
+        if file_ext != 'pdf':
+            yield self._extract_text(file_content, filename)
+            return
+        try:
+            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+            for page in pdf_reader.pages:
+                yield page.extract_text() or ""
+        except Exception as e:
+            raise Exception(f"Error extracting PDF text: {str(e)}")
+    
     def _extract_from_pdf(self, file_content: bytes) -> str:
         """Extract text from PDF file"""
         try:
@@ -216,12 +365,147 @@ Return only the polished text without any explanations or additional commentary.
         ext = filename.lower().split('.')[-1] if '.' in filename else 'unknown'
         return ext
     
+    def _polish_once(self, decision: RouteDecision, system_prompt: str, user_prompt: str, original: str) -> str:
+        """Single polish call; empty output is retried once on the large model"""
+        while True:
+            response = self._create_completion(
+                decision,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.3,
+                max_tokens=OUTPUT_TOKEN_RESERVE["polish"]
+            )
+            
+            polished_text = (response.choices[0].message.content or "").strip()
+            if polished_text:
+                return polished_text
+            # Empty output counts as a validation failure - retry once on the large model
+            decision = self.router.escalate(decision, "empty_output")
+            if not decision:
+                return original
+    
+    def _preflight(self, task: str, decision: RouteDecision, fixed_prompt: str, text: str):
+        """
+        Budget a request before sending it.
+        
+        If the input does not fit the routed model but fits the large model, the
+        request is escalated instead of being trimmed or chunked.
+        """
+        large_model = self.router.large_model
+        if decision.model != large_model:
+            input_tokens = estimate_tokens(text, decision.model)
+            if (input_tokens > input_budget(task, decision.model, fixed_prompt)
+                    and input_tokens <= input_budget(task, large_model, fixed_prompt)):
+                decision = self.router.escalate(decision, "context_limit") or decision
+        plan = plan_prompt(task, decision.model, fixed_prompt, text)
+        return decision, plan
+    
+    def _create_completion(self, decision: RouteDecision, **kwargs):
+        """Call the chat completions API on the routed model and record its latency"""
+        started = time.perf_counter()
+        try:
+            response = self.openai_client.chat.completions.create(model=decision.model, **kwargs)
+        except Exception as e:
+            self.router.record(decision, time.perf_counter() - started, success=False)
+            if getattr(e, "code", None) == "context_length_exceeded":
+                # Should not happen once pre-flight budgeting is in place - track it if it does
+                metrics.incr("ai_context_limit_failures_total", model=decision.model, task=decision.task)
+            raise
+        self.router.record(decision, time.perf_counter() - started)
+        return response
+    
+    def _stream_completion(self, decision: RouteDecision, **kwargs) -> Iterator[str]:
+        """Streaming variant of _create_completion - yields content deltas, records latency once drained"""
+        started = time.perf_counter()
+        try:
+            stream = self.openai_client.chat.completions.create(model=decision.model, stream=True, **kwargs)
+            for event in stream:
+                if event.choices and event.choices[0].delta and event.choices[0].delta.content:
+                    yield event.choices[0].delta.content
+        except Exception as e:
+            self.router.record(decision, time.perf_counter() - started, success=False)
+            if getattr(e, "code", None) == "context_length_exceeded":
+                metrics.incr("ai_context_limit_failures_total", model=decision.model, task=decision.task)
+            raise
+        self.router.record(decision, time.perf_counter() - started)
+    
+    def _validate_json_response(self, content: Optional[str], required_key: Optional[str] = None) -> Optional[str]:
+        """Return a failure reason if the response is not usable JSON, else None"""
+        if not content:
+            return "empty_output"
+        try:
+            data = json.loads(content)
+        except json.JSONDecodeError:
+            return "invalid_json"
+        if not isinstance(data, dict):
+            return "invalid_json"
+        if required_key and not data.get(required_key):
+            return f"missing_{required_key}"
+        return None
+    
+    def _validate_resume_response(self, content: Optional[str]) -> Optional[str]:
+        """Resume-specific validation: JSON with a non-empty experience list"""
+        failure = self._validate_json_response(content)
+        if failure:
+            return failure
+        experiences = json.loads(content).get("experience")
+        if not isinstance(experiences, list) or len(experiences) == 0:
+            return "missing_experience"
+        return None
+    
     async def _parse_with_ai(self, text: str, filename: str) -> Dict:
         """Use OpenAI to parse and structure resume text"""
         if not self.openai_client:
             raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
         
-        system_prompt = """You are an expert resume parser. Your primary task is to extract ALL work experience entries from the resume text.
+        system_prompt = self._resume_system_prompt()
+        
+        try:
+            decision = self.router.choose("resume_parse", text)
+            decision, plan = self._preflight("resume_parse", decision, system_prompt + self._resume_user_prompt(""), text)
+            
+            if plan.strategy == "chunk":
+                # Oversized resumes are parsed section by section and merged
+                parts = []
+                for i, chunk in enumerate(plan.chunks):
+                    print(f"[AI_SERVICE] Parsing resume chunk {i+1}/{len(plan.chunks)} ({len(chunk)} characters)")
+                    part, decision = self._parse_resume_once(decision, system_prompt, chunk, require_experience=False)
+                    parts.append(part)
+                parsed_data = self._merge_resume_parts(parts)
+            else:
+                parsed_data, decision = self._parse_resume_once(decision, system_prompt, text, require_experience=True)
+            
+            # Validate that we got experience data
+            experiences = parsed_data.get("experience", [])
+            print(f"[AI_SERVICE] Parsed {len(experiences)} experiences from AI response")
+            
+            if len(experiences) == 0:
+                print(f"[AI_SERVICE] WARNING: No experiences in parsed data!")
+                print(f"[AI_SERVICE] All keys in parsed_data: {list(parsed_data.keys())}")
+                # Try to see if experiences are under a different key
+                for key in parsed_data.keys():
+                    if 'experience' in key.lower() or 'work' in key.lower() or 'employment' in key.lower():
+                        print(f"[AI_SERVICE] Found potential experience key: {key} = {type(parsed_data[key])}")
+            
+            # Store raw data
+            parsed_data["raw_data"] = self._resume_raw_data(text, filename, decision, plan)
+            
+            return parsed_data
+            
+        except json.JSONDecodeError as e:
+            print(f"[AI_SERVICE] JSON decode error: {str(e)}")
+            raise Exception(f"Error parsing AI response as JSON: {str(e)}")
+        except Exception as e:
+            import traceback
+            print(f"[AI_SERVICE] Error in AI parsing: {str(e)}")
+            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
+            raise Exception(f"Error in AI parsing: {str(e)}")
+    
+    def _resume_system_prompt(self) -> str:
+        """System prompt for resume parsing"""
+        return """You are an expert resume parser. Your primary task is to extract ALL work experience entries from the resume text.
 
 CRITICAL: You MUST extract every work experience entry, even if the format is non-standard. Look for:
 - Job titles and company names
@@ -317,69 +601,110 @@ IMPORTANT RULES:
 
 Extract all available information. If a field is not present, use null or empty array/object as appropriate.
 Be thorough and accurate in extraction. The work experience section is the most critical part."""
-        
-        user_prompt = f"""Parse the following resume text and extract ALL work experience entries. Pay special attention to the "Work Experience" section and extract every job entry you find.
+    
+    def _resume_raw_data(self, text: str, filename: str, decision: RouteDecision, plan) -> Dict:
+        """raw_data stored alongside a parsed resume"""
+        return {
+            "original_text": text[:1000],  # Store first 1000 chars for debugging
+            "text_hash": text_hash(text),  # Full text lives in resume_texts under this hash
+            "filename": filename,
+            "parsing_model": decision.model,
+            "routing_reason": decision.reason,
+            "preflight_strategy": plan.strategy
+        }
+    
+    def _resume_user_prompt(self, text: str) -> str:
+        """User prompt for resume parsing"""
+        return f"""Parse the following resume text and extract ALL work experience entries. Pay special attention to the "Work Experience" section and extract every job entry you find.
 
 Resume text:
 {text}
 
 IMPORTANT: Make sure you extract EVERY work experience entry. Look carefully through the entire text for any employment history, work experience, or job positions."""
+    
+    def _parse_resume_once(self, decision: RouteDecision, system_prompt: str, text: str, require_experience: bool = True):
+        """
+        Parse one piece of resume text, escalating to the large model on validation failure.
         
-        try:
-            print(f"[AI_SERVICE] Sending request to OpenAI model: {self.model}")
+        Returns:
+            Tuple of (parsed dict, decision that produced it)
+        """
+        user_prompt = self._resume_user_prompt(text)
+        while True:
+            print(f"[AI_SERVICE] Sending request to OpenAI model: {decision.model}")
             print(f"[AI_SERVICE] Text length: {len(text)} characters")
             print(f"[AI_SERVICE] System prompt length: {len(system_prompt)} characters")
             print(f"[AI_SERVICE] User prompt length: {len(user_prompt)} characters")
             
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
+            response = self._create_completion(
+                decision,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
                 temperature=0.1,
+                max_tokens=OUTPUT_TOKEN_RESERVE["resume_parse"],
                 response_format={"type": "json_object"}
             )
             
             print(f"[AI_SERVICE] OpenAI API response received")
             
-            # Parse JSON response
             response_content = response.choices[0].message.content
-            print(f"[AI_SERVICE] Response content length: {len(response_content)} characters")
-            print(f"[AI_SERVICE] First 500 chars of response: {response_content[:500]}")
-            
-            parsed_data = json.loads(response_content)
-            
-            # Validate that we got experience data
-            experiences = parsed_data.get("experience", [])
-            print(f"[AI_SERVICE] Parsed {len(experiences)} experiences from AI response")
-            
-            if len(experiences) == 0:
-                print(f"[AI_SERVICE] WARNING: No experiences in parsed data!")
-                print(f"[AI_SERVICE] All keys in parsed_data: {list(parsed_data.keys())}")
-                # Try to see if experiences are under a different key
-                for key in parsed_data.keys():
-                    if 'experience' in key.lower() or 'work' in key.lower() or 'employment' in key.lower():
-                        print(f"[AI_SERVICE] Found potential experience key: {key} = {type(parsed_data[key])}")
-            
-            # Store raw data
-            parsed_data["raw_data"] = {
-                "original_text": text[:1000],  # Store first 1000 chars for debugging
-                "filename": filename,
-                "parsing_model": self.model
-            }
-            
-            return parsed_data
-            
-        except json.JSONDecodeError as e:
-            print(f"[AI_SERVICE] JSON decode error: {str(e)}")
-            print(f"[AI_SERVICE] Response content: {response_content[:1000] if 'response_content' in locals() else 'N/A'}")
-            raise Exception(f"Error parsing AI response as JSON: {str(e)}")
-        except Exception as e:
-            import traceback
-            print(f"[AI_SERVICE] Error in AI parsing: {str(e)}")
-            print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
-            raise Exception(f"Error in AI parsing: {str(e)}")
+            print(f"[AI_SERVICE] Response content length: {len(response_content or '')} characters")
+            print(f"[AI_SERVICE] First 500 chars of response: {(response_content or '')[:500]}")
+            
+            # Validate the fast model's output; escalate to the large model if it is unusable
+            if require_experience:
+                failure = self._validate_resume_response(response_content)
+            else:
+                failure = self._validate_json_response(response_content)
+            if failure:
+                escalated = self.router.escalate(decision, failure)
+                if escalated:
+                    print(f"[AI_SERVICE] Fast model output failed validation ({failure}), escalating")
+                    decision = escalated
+                    continue
+            return json.loads(response_content or ""), decision
+    
+    def _experience_identity(self, entry: Dict) -> Tuple[str, str, str]:
+        """Key that identifies the same role across chunks or retries"""
+        return (
+            str(entry.get("company") or "").strip().lower(),
+            str(entry.get("title") or "").strip().lower(),
+            str(entry.get("start_date") or "").strip().lower(),
+        )
+    
+    def _merge_resume_parts(self, parts: List[Dict]) -> Dict:
+        """Merge resume dicts parsed from separate chunks of the same resume"""
+        merged: Dict = {}
+        for part in parts:
+            for key, value in part.items():
+                if key == "experience" and isinstance(value, list):
+                    existing = merged.setdefault("experience", [])
+                    for entry in value:
+                        if not isinstance(entry, dict):
+                            continue
+                        identity = self._experience_identity(entry)
+                        duplicate = next((e for e in existing if self._experience_identity(e) == identity), None)
+                        if duplicate is None:
+                            existing.append(entry)
+                        elif len(str(entry.get("description") or "")) > len(str(duplicate.get("description") or "")):
+                            # Chunk overlap can cut an entry in half - keep the fuller copy
+                            duplicate.update(entry)
+                elif isinstance(value, list):
+                    existing = merged.setdefault(key, [])
+                    existing.extend(item for item in value if item not in existing)
+                elif isinstance(value, dict):
+                    target = merged.setdefault(key, {})
+                    for sub_key, sub_value in value.items():
+                        if isinstance(sub_value, list):
+                            bucket = target.setdefault(sub_key, [])
+                            bucket.extend(item for item in sub_value if item not in bucket)
+                        elif sub_value and not target.get(sub_key):
+                            target[sub_key] = sub_value
+                elif value and not merged.get(key):
+                    merged[key] = value
+        return merged
     
     async def summarize_conversation(self, transcription_text: str, conversation_context: Optional[Dict] = None) -> Dict:
         """
@@ -429,29 +754,40 @@ Be professional, accurate, and focus on actionable insights."""
                 if conversation_context.get('topic'):
                     context_info += f"\nMeeting topic: {conversation_context['topic']}"
             
-            user_prompt = f"""Please summarize the following conversation transcription.{context_info}
+            def build_user_prompt(transcript: str) -> str:
+                return f"""Please summarize the following conversation transcription.{context_info}
 
 Transcription:
-{transcription_text}
+{transcript}
 
 Provide a comprehensive summary in JSON format."""
             
             print(f"[AI_SERVICE] Calling OpenAI API for conversation summary...")
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt}
-                ],
-                temperature=0.3,  # Lower temperature for more consistent summaries
-                response_format={"type": "json_object"}
-            )
-            
-            response_content = response.choices[0].message.content
-            print(f"[AI_SERVICE] OpenAI API response received ({len(response_content)} characters)")
-            
-            # Parse JSON response
-            summary_data = json.loads(response_content)
+            decision = self.router.choose("summary", transcription_text)
+            decision, plan = self._preflight("summary", decision, system_prompt + build_user_prompt(""), transcription_text)
+            
+            if plan.strategy == "chunk":
+                # Map-reduce: summarize each part, then summarize the partial summaries
+                partials = []
+                for i, chunk in enumerate(plan.chunks):
+                    print(f"[AI_SERVICE] Summarizing transcript part {i+1}/{len(plan.chunks)}")
+                    partial, decision = self._summarize_once(decision, system_prompt, build_user_prompt(chunk))
+                    partials.append(partial)
+                combined = "\n\n".join(
+                    f"Part {i+1} summary: {p.get('summary', '')}\n"
+                    f"Key points: {'; '.join(map(str, p.get('key_points', [])))}\n"
+                    f"Action items: {'; '.join(map(str, p.get('action_items', [])))}"
+                    for i, p in enumerate(partials)
+                )
+                result = await self.summarize_conversation(combined, conversation_context)
+                # Action items are concrete commitments - keep every one found in the parts
+                for partial in partials:
+                    for item in partial.get("action_items", []):
+                        if item not in result["action_items"]:
+                            result["action_items"].append(item)
+                return result
+            
+            summary_data, decision = self._summarize_once(decision, system_prompt, build_user_prompt(transcription_text))
             
             # Validate and structure response
             result = {
@@ -460,7 +796,7 @@ Provide a comprehensive summary in JSON format."""
                 "action_items": summary_data.get("action_items", []),
                 "sentiment": summary_data.get("sentiment", "neutral"),
                 "topics": summary_data.get("topics", []),
-                "ai_model_used": self.model
+                "ai_model_used": decision.model
             }
             
             print(f"[AI_SERVICE] Summary generated: {len(result['summary'])} chars, {len(result['key_points'])} key points, {len(result['action_items'])} action items")
@@ -469,7 +805,6 @@ Provide a comprehensive summary in JSON format."""
             
         except json.JSONDecodeError as e:
             print(f"[AI_SERVICE] JSON decode error in summarization: {str(e)}")
-            print(f"[AI_SERVICE] Response content: {response_content[:1000] if 'response_content' in locals() else 'N/A'}")
             raise Exception(f"Error parsing AI summary response: {str(e)}")
         except Exception as e:
             import traceback
@@ -477,18 +812,55 @@ Provide a comprehensive summary in JSON format."""
             print(f"[AI_SERVICE] Traceback: {traceback.format_exc()}")
             raise Exception(f"Error summarizing conversation: {str(e)}")
     
+    def _summarize_once(self, decision: RouteDecision, system_prompt: str, user_prompt: str):
+        """Single summary call, escalating to the large model on validation failure"""
+        while True:
+            response = self._create_completion(
+                decision,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.3,  # Lower temperature for more consistent summaries
+                max_tokens=OUTPUT_TOKEN_RESERVE["summary"],
+                response_format={"type": "json_object"}
+            )
+            
+            response_content = response.choices[0].message.content
+            print(f"[AI_SERVICE] OpenAI API response received ({len(response_content or '')} characters)")
+            
+            failure = self._validate_json_response(response_content, required_key="summary")
+            if failure:
+                escalated = self.router.escalate(decision, failure)
+                if escalated:
+                    decision = escalated
+                    continue
+            return json.loads(response_content or ""), decision
+    
     async def enhance_resume_data(self, resume_data: Dict) -> Dict:
         """Enhance resume data with AI insights and suggestions"""
+        enhancements, _ = await self.enhance_resume_data_routed(resume_data)
+        return enhancements
+    
+    async def enhance_resume_data_routed(self, resume_data: Dict) -> Tuple[Dict, RouteDecision]:
+        """
+        enhance_resume_data, also returning the routing decision that produced the
+        result - its model is the one actually called, after any escalation
+        """
         if not self.openai_client:
             raise Exception("OpenAI API key not configured. Please set OPENAI_API_KEY environment variable.")
         try:
-            prompt = f"""Analyze this resume data and provide enhancements:
+            resume_json = to_json(resume_data)
+            system_prompt = "You are a career advisor and resume expert."
+            
+            def build_prompt(resume_text: str) -> str:
+                return f"""Analyze this resume data and provide enhancements:
             - Suggest missing skills based on experience
             - Identify strengths and areas for improvement
             - Suggest keywords for ATS optimization
             - Provide career recommendations
             
-            Resume Data: {json.dumps(resume_data, indent=2)}
+            Resume Data: {resume_text}
             
             Return JSON with:
             {{
@@ -499,18 +871,37 @@ Provide a comprehensive summary in JSON format."""
                 "career_recommendations": ["recommendation1", "recommendation2"]
             }}"""
             
-            response = self.openai_client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a career advisor and resume expert."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.7,
-                response_format={"type": "json_object"}
-            )
-            
-            enhancements = json.loads(response.choices[0].message.content)
-            return enhancements
+            decision = self.router.choose("enhance", resume_json)
+            decision, plan = self._preflight("enhance", decision, system_prompt + build_prompt(""), resume_json)
+            if plan.strategy == "trim":
+                # Drop whole entries and trailing fields - the leading ones (name, summary,
+                # experience) matter most, and cutting the JSON text would leave it malformed
+                resume_json = to_json(trim_fields(resume_data, plan.max_input_tokens, decision.model))
+            prompt = build_prompt(resume_json)
+            
+            while True:
+                response = self._create_completion(
+                    decision,
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": prompt}
+                    ],
+                    temperature=0.7,
+                    max_tokens=OUTPUT_TOKEN_RESERVE["enhance"],
+                    response_format={"type": "json_object"}
+                )
+                
+                response_content = response.choices[0].message.content
+                failure = self._validate_json_response(response_content)
+                if failure:
+                    escalated = self.router.escalate(decision, failure)
+                    if escalated:
+                        decision = escalated
+                        continue
+                break
+            
+            enhancements = json.loads(response_content)
+            return enhancements, decision
             
         except Exception as e:
             raise Exception(f"Error enhancing resume: {str(e)}")
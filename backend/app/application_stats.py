@@ -0,0 +1,133 @@
+"""
+Per-Job Application Statistics
+Counts in job_application_stats are adjusted in the same transaction as every
+application insert, status change and delete, and dropped with their job, so
+per-job and per-status applicant numbers are a primary-key lookup instead of a
+scan of applications
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, Tuple
+
+from sqlalchemy import DateTime, delete, event, func, inspect, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.models import Application, Job, JobApplicationStat
+
+APPLICATION_STATUSES = ("applied", "shortlisted", "rejected", "hired")
+
+DeltaKey = Tuple[int, str]
+
+
+def _upsert_delta(connection, job_id: int, status: str, delta: int):
+    """Atomically add delta to one counter, creating it if needed"""
+    table = JobApplicationStat.__table__
+    dialect = connection.dialect.name
+    now = datetime.utcnow()
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(table).values(job_id=job_id, status=status, count=delta, updated_at=now)
+        connection.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.job_id, table.c.status],
+            set_={"count": table.c.count + stmt.excluded.count, "updated_at": now},
+        ))
+        return
+    result = connection.execute(
+        update(table)
+        .where(table.c.job_id == job_id, table.c.status == status)
+        .values(count=table.c.count + delta, updated_at=now)
+    )
+    if result.rowcount == 0:
+        connection.execute(insert(table).values(job_id=job_id, status=status, count=delta, updated_at=now))
+
+
+def apply_deltas(connection, deltas: Dict[DeltaKey, int]):
+    for (job_id, status), delta in sorted(deltas.items()):
+        # Sorted so concurrent writers lock counter rows in the same order
+        if delta:
+            _upsert_delta(connection, job_id, status, delta)
+
+
+def _history_value(state, name: str, default):
+    history = state.attrs[name].history
+    if history.deleted:
+        return history.deleted[0]
+    if history.unchanged:
+        return history.unchanged[0]
+    return default
+
+
+@event.listens_for(Application.status, "set", active_history=True)
+@event.listens_for(Application.job_id, "set", active_history=True)
+def _keep_previous_value(target, value, oldvalue, initiator):
+    # active_history loads an expired attribute before it is replaced, so the
+    # flush below knows which counter the application leaves
+    pass
+
+
+@event.listens_for(Session, "after_flush")
+def _count_application_writes(session, flush_context):
+    # new/dirty/deleted and attribute history still describe the flush that just ran
+    deltas: Dict[DeltaKey, int] = defaultdict(int)
+    for obj in session.new:
+        if isinstance(obj, Application):
+            deltas[(obj.job_id, obj.status)] += 1
+    for obj in session.dirty:
+        if isinstance(obj, Application):
+            state = inspect(obj)
+            if state.attrs.status.history.has_changes() or state.attrs.job_id.history.has_changes():
+                deltas[(_history_value(state, "job_id", obj.job_id), _history_value(state, "status", obj.status))] -= 1
+                deltas[(obj.job_id, obj.status)] += 1
+    for obj in session.deleted:
+        if isinstance(obj, Application):
+            state = inspect(obj)
+            deltas[(_history_value(state, "job_id", obj.job_id), _history_value(state, "status", obj.status))] -= 1
+    # A deleted job's counters go with it - SQLite does not enforce the ON DELETE CASCADE
+    deleted_jobs = {obj.id for obj in session.deleted if isinstance(obj, Job)}
+    deltas = {key: delta for key, delta in deltas.items() if key[0] is not None and key[0] not in deleted_jobs}
+    if deltas:
+        apply_deltas(session.connection(), deltas)
+    if deleted_jobs:
+        table = JobApplicationStat.__table__
+        session.connection().execute(delete(table).where(table.c.job_id.in_(sorted(deleted_jobs))))
+
+
+def install_application_stats(connection):
+    """Create job_application_stats and count existing applications (migration 5)"""
+    table = JobApplicationStat.__table__
+    table.create(bind=connection, checkfirst=True)
+    connection.execute(table.delete())
+    connection.execute(insert(table).from_select(
+        ["job_id", "status", "count", "updated_at"],
+        select(Application.job_id, Application.status, func.count(), literal(datetime.utcnow(), DateTime))
+        .group_by(Application.job_id, Application.status),
+    ))
+
+
+# ==================== Reads ====================
+
+def stats_query(job_ids: Iterable[int]):
+    return select(
+        JobApplicationStat.job_id, JobApplicationStat.status, JobApplicationStat.count
+    ).where(JobApplicationStat.job_id.in_(list(job_ids)))
+
+
+def stats_by_job(job_ids: Iterable[int], rows) -> Dict[int, Dict]:
+    """{job_id: {"total": n, "applied": n, ...}} from stats_query rows; every job and known status is present"""
+    stats = {job_id: {"total": 0, **{status: 0 for status in APPLICATION_STATUSES}} for job_id in job_ids}
+    for job_id, status, count in rows:
+        entry = stats[job_id]
+        entry[status] = entry.get(status, 0) + count
+        entry["total"] += count
+    return stats
+
+
+def load_job_stats(db, job_ids: Iterable[int]) -> Dict[int, Dict]:
+    job_ids = list(job_ids)
+    if not job_ids:
+        return {}
+    return stats_by_job(job_ids, db.execute(stats_query(job_ids)).all())
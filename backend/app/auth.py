@@ -5,22 +5,30 @@ Handles user registration, login, and JWT token generation
 
 import os
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import NamedTuple, Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 from pydantic import BaseModel, EmailStr
+from sqlalchemy import event, inspect, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from app.models import User
+from app.cache import Cache
+from app.models import BusinessProfile, TalentProfile, User
 
 # Password hashing - Using Argon2id (no password length limit)
 # Explicitly set to argon2 only, no fallback schemes
 pwd_context = CryptContext(schemes=["argon2"])
 
 # JWT settings
-SECRET_KEY = os.getenv("SECRET_KEY", "dev_secret_key_change_in_production")
+DEFAULT_SECRET_KEY = "dev_secret_key_change_in_production"
+SECRET_KEY = os.getenv("SECRET_KEY", DEFAULT_SECRET_KEY)
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
 
+# User identity cache (per process)
+USER_CACHE_TTL_SECONDS = float(os.getenv("USER_CACHE_TTL_SECONDS", "30"))
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+
 
 # ==================== Pydantic Models ====================
 
@@ -102,6 +110,14 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> Optional[dict]:
+    """Claims of a genuine, unexpired access token; None for anything else"""
+    try:
+        return jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+    except JWTError:
+        return None
+
+
 # ==================== User Operations ====================
 
 def get_user_by_email(db: Session, email: str) -> Optional[User]:
@@ -109,6 +125,12 @@ def get_user_by_email(db: Session, email: str) -> Optional[User]:
     return db.query(User).filter(User.email == email).first()
 
 
+async def aget_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    """Get user by email (async session)"""
+    result = await db.execute(select(User).where(User.email == email).limit(1))
+    return result.scalars().first()
+
+
 def get_user_by_username(db: Session, username: str) -> Optional[User]:
     """Get user by username"""
     return db.query(User).filter(User.username == username).first()
@@ -158,3 +180,103 @@ def authenticate_user(db: Session, email: str) -> Optional[User]:
     return user
 
 
+# ==================== User Identity Cache ====================
+# Most endpoints resolve the caller by email before doing anything else. The
+# columns they need are cached by email and by id; commits that change them
+# evict the entry here and, through the invalidation channel, in every worker.
+
+class UserIdentity(NamedTuple):
+    """The users columns request handlers need - not an ORM object, so it cannot be modified"""
+    id: int
+    email: str
+    username: str
+    full_name: Optional[str]
+    user_type: str
+    is_active: bool
+    talent_profile_id: Optional[int]
+    business_profile_id: Optional[int]
+    created_at: Optional[datetime]
+
+
+user_cache = Cache("users", maxsize=USER_CACHE_SIZE, ttl=USER_CACHE_TTL_SECONDS, value_type=UserIdentity)
+
+_IDENTITY_COLUMNS = [getattr(User, name) for name in UserIdentity._fields]
+
+
+def _remember(row, generation: int) -> Optional[UserIdentity]:
+    if row is None:
+        return None
+    identity = UserIdentity(*row)
+    user_cache.set(("email", identity.email), identity, generation=generation)
+    user_cache.set(("id", identity.id), identity, generation=generation)
+    return identity
+
+
+def get_user_identity(db: Session, email: str) -> Optional[UserIdentity]:
+    """Cached identity of the user with this email; unknown emails are not cached"""
+    identity = user_cache.get(("email", email))
+    if identity is None:
+        generation = user_cache.generation
+        row = db.execute(select(*_IDENTITY_COLUMNS).where(User.email == email).limit(1)).first()
+        identity = _remember(row, generation)
+    return identity
+
+
+async def aget_user_identity(db: AsyncSession, email: str) -> Optional[UserIdentity]:
+    """get_user_identity for an async session"""
+    identity = user_cache.get(("email", email))
+    if identity is None:
+        generation = user_cache.generation
+        result = await db.execute(select(*_IDENTITY_COLUMNS).where(User.email == email).limit(1))
+        identity = _remember(result.first(), generation)
+    return identity
+
+
+def get_user_identity_by_id(db: Session, user_id: int) -> Optional[UserIdentity]:
+    """Cached identity of the user with this id"""
+    identity = user_cache.get(("id", user_id))
+    if identity is None:
+        generation = user_cache.generation
+        identity = _remember(db.execute(select(*_IDENTITY_COLUMNS).where(User.id == user_id)).first(), generation)
+    return identity
+
+
+def invalidate_user(user_id: Optional[int] = None, email: Optional[str] = None):
+    """Evict a cached identity by id and/or email"""
+    user_cache.delete(("id", user_id), ("email", email))
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_user_changes(session, flush_context):
+    # Evicted on commit rather than now: until then other requests must keep reading the committed row
+    pending = session.info.setdefault("user_cache_evict", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, User):
+            state = inspect(obj)
+            if obj in session.dirty and not any(
+                state.attrs[name].history.has_changes() for name in UserIdentity._fields
+            ):
+                continue
+            pending.add((obj.id, obj.email))
+            for old_email in state.attrs.email.history.deleted:
+                pending.add((None, old_email))
+        elif isinstance(obj, (TalentProfile, BusinessProfile)) and obj in session.deleted:
+            # Users pointing at a deleted profile are not known by profile id - drop everything
+            pending.add(None)
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_committed_users(session):
+    pending = session.info.pop("user_cache_evict", None)
+    if not pending:
+        return
+    if None in pending:
+        user_cache.clear()
+        return
+    for user_id, email in pending:
+        invalidate_user(user_id, email)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_user_changes(session):
+    session.info.pop("user_cache_evict", None)
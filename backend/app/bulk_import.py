@@ -0,0 +1,258 @@
+"""
+Bulk Ingestion
+Imports jobs, business profiles and talent profiles from a JSON array or an
+NDJSON stream: the request is read in full (at most BULK_MAX_ROWS rows, so an
+oversized import is rejected before anything is written), then rows are
+validated a chunk at a time and written with one multi-row INSERT per chunk,
+each chunk in its own transaction
+"""
+
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy import func, insert, select
+from sqlalchemy.exc import DBAPIError
+
+from app.metrics import metrics
+from app.models import (
+    BusinessProfile,
+    BusinessProfileCreate,
+    Job,
+    JobCreate,
+    TalentProfile,
+    TalentProfileCreate,
+)
+from app.skills import index_job_skills, index_talent_skills
+
+# Rows per INSERT / transaction
+BULK_CHUNK_SIZE = int(os.getenv("BULK_CHUNK_SIZE", "500"))
+# Upper bound on rows in one request
+BULK_MAX_ROWS = int(os.getenv("BULK_MAX_ROWS", "10000"))
+
+NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl", "application/x-jsonlines")
+
+
+# ==================== Import schemas ====================
+# The single-row create endpoints accept a few columns the API schemas leave out
+
+class JobImport(JobCreate):
+    location: Optional[str] = None
+    status: str = "draft"
+    is_active: bool = True
+
+
+class BusinessProfileImport(BusinessProfileCreate):
+    location: Optional[str] = None
+
+
+class TalentProfileImport(TalentProfileCreate):
+    location: Optional[str] = None
+
+
+# ==================== Request parsing ====================
+
+async def read_bulk_rows(request: Request) -> AsyncIterator[Tuple[int, object]]:
+    """
+    (index, row) pairs from a JSON array body (or {"items": [...]}) or an NDJSON
+    stream. NDJSON is parsed line by line as it arrives; an unparseable line is
+    yielded as a ValueError so it is reported against its row.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_TYPES:
+        index = 0
+        pending = b""
+        async for chunk in request.stream():
+            pending += chunk
+            *lines, pending = pending.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, _parse_line(line)
+                    index += 1
+        if pending.strip():
+            yield index, _parse_line(pending)
+        return
+
+    try:
+        body = await request.json()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    if isinstance(body, dict):
+        body = body.get("items")
+    if not isinstance(body, list):
+        raise HTTPException(status_code=400, detail="Body must be a JSON array or NDJSON")
+    for index, row in enumerate(body):
+        yield index, row
+
+
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        return ValueError(f"Invalid JSON: {e}")
+
+
+# ==================== Importer ====================
+
+class BulkImporter:
+    """
+    Validates and inserts one model's rows in chunks.
+    check_chunk(db, rows) returns {position in chunk: error} for checks that need
+    the database (foreign keys, uniqueness) - one query per chunk.
+    after_insert(connection, rows, ids) maintains derived indexes.
+    """
+
+    def __init__(
+        self,
+        model,
+        schema,
+        check_chunk: Optional[Callable] = None,
+        after_insert: Optional[Callable] = None,
+    ):
+        self.model = model
+        self.schema = schema
+        self.check_chunk = check_chunk
+        self.after_insert = after_insert
+
+    def _validate(self, row) -> Tuple[Optional[Dict], Optional[str]]:
+        if isinstance(row, ValueError):
+            return None, str(row)
+        if not isinstance(row, dict):
+            return None, "Row must be a JSON object"
+        try:
+            return self.schema.model_validate(row).model_dump(), None
+        except ValidationError as e:
+            return None, "; ".join(
+                f"{'.'.join(str(p) for p in err['loc']) or 'row'}: {err['msg']}" for err in e.errors()
+            )
+
+    def _insert(self, db, rows: List[Dict]) -> List[int]:
+        # SQLite has no sentinel support, so ordered RETURNING would fall back to one
+        # INSERT per row. Its rowids are assigned in VALUES order under the write
+        # lock, so sorting the returned ids recovers the input order instead.
+        ordered = db.get_bind().dialect.name != "sqlite"
+        stmt = insert(self.model).returning(self.model.id, sort_by_parameter_order=ordered)
+        ids = list(db.execute(stmt, rows).scalars())
+        if not ordered:
+            ids.sort()
+        if self.after_insert:
+            self.after_insert(db.connection(), rows, ids)
+        return ids
+
+    def _write_chunk(self, db, chunk: List[Tuple[int, object]], results: List[Dict]):
+        valid: List[Tuple[int, Dict]] = []
+        for index, row in chunk:
+            data, error = self._validate(row)
+            if error:
+                results.append({"index": index, "status": "error", "error": error})
+            else:
+                valid.append((index, data))
+
+        if valid and self.check_chunk:
+            errors = self.check_chunk(db, [data for _, data in valid])
+            for position in sorted(errors):
+                results.append({"index": valid[position][0], "status": "error", "error": errors[position]})
+            valid = [item for position, item in enumerate(valid) if position not in errors]
+        if not valid:
+            return
+
+        try:
+            ids = self._insert(db, [data for _, data in valid])
+            db.commit()
+        except DBAPIError as e:
+            # Something the chunk checks did not catch (a constraint, a value the column
+            # rejects) - retry row by row to find it. A lost connection is not a row's fault.
+            db.rollback()
+            if e.connection_invalidated:
+                raise
+            ids = []
+            for index, data in valid:
+                try:
+                    with db.begin_nested():
+                        ids.extend(self._insert(db, [data]))
+                except DBAPIError as row_error:
+                    if row_error.connection_invalidated:
+                        raise
+                    ids.append(None)
+                    results.append({"index": index, "status": "error", "error": str(row_error.orig)})
+            db.commit()
+        for (index, _), row_id in zip(valid, ids):
+            if row_id is not None:
+                results.append({"index": index, "status": "created", "id": row_id})
+
+    def _write_all(self, db, rows: List[Tuple[int, object]]) -> List[Dict]:
+        results: List[Dict] = []
+        for start in range(0, len(rows), BULK_CHUNK_SIZE):
+            self._write_chunk(db, rows[start:start + BULK_CHUNK_SIZE], results)
+        return results
+
+    async def run(self, db, rows: AsyncIterator[Tuple[int, object]]) -> Dict:
+        """
+        Import every row; returns per-row results ordered by input index.
+        More than BULK_MAX_ROWS rows is a 413 with nothing written.
+        """
+        started = time.perf_counter()
+        pending: List[Tuple[int, object]] = []
+        async for index, row in rows:
+            if len(pending) >= BULK_MAX_ROWS:
+                raise HTTPException(status_code=413, detail=f"At most {BULK_MAX_ROWS} rows per request")
+            pending.append((index, row))
+        total = len(pending)
+
+        # The session is blocking - write from a worker thread so the event loop keeps serving
+        results = await asyncio.to_thread(self._write_all, db, pending)
+
+        results.sort(key=lambda r: r["index"])
+        created = sum(1 for r in results if r["status"] == "created")
+        table = self.model.__tablename__
+        metrics.observe("bulk_import_seconds", time.perf_counter() - started, table=table)
+        metrics.incr("bulk_import_rows_total", created, table=table)
+        return {"total": total, "created": created, "failed": total - created, "results": results}
+
+
+# ==================== Per-model checks ====================
+
+def _check_job_businesses(db, rows: List[Dict]) -> Dict[int, str]:
+    wanted = {row["business_profile_id"] for row in rows}
+    existing: Set[int] = set(db.execute(
+        select(BusinessProfile.id).where(BusinessProfile.id.in_(wanted))
+    ).scalars())
+    return {
+        position: f"business_profile_id {row['business_profile_id']} does not exist"
+        for position, row in enumerate(rows) if row["business_profile_id"] not in existing
+    }
+
+
+def _check_talent_emails(db, rows: List[Dict]) -> Dict[int, str]:
+    emails = [row["email"].lower() for row in rows]
+    taken: Set[str] = {email.lower() for email in db.execute(
+        select(TalentProfile.email).where(func.lower(TalentProfile.email).in_(emails))
+    ).scalars()}
+    errors: Dict[int, str] = {}
+    seen: Set[str] = set()
+    for position, email in enumerate(emails):
+        if email in taken:
+            errors[position] = f"A talent profile with email {email} already exists"
+        elif email in seen:
+            errors[position] = f"Duplicate email {email} in this import"
+        seen.add(email)
+    return errors
+
+
+def _index_job_rows(connection, rows: List[Dict], ids: List[int]):
+    index_job_skills(connection, [
+        (job_id, row.get("required_skills"), row.get("preferred_skills")) for row, job_id in zip(rows, ids)
+    ])
+
+
+def _index_talent_rows(connection, rows: List[Dict], ids: List[int]):
+    index_talent_skills(connection, [(talent_id, row.get("skills")) for row, talent_id in zip(rows, ids)])
+
+
+job_importer = BulkImporter(Job, JobImport, _check_job_businesses, _index_job_rows)
+business_importer = BulkImporter(BusinessProfile, BusinessProfileImport)
+talent_importer = BulkImporter(TalentProfile, TalentProfileImport, _check_talent_emails, _index_talent_rows)
@@ -0,0 +1,494 @@
+"""
+Caches and Cross-Worker Invalidation
+Named caches on a pluggable backend: in-process memory (default) or a Redis
+server shared by every worker. Deletes and clears are also published on an
+invalidation channel, so in-memory caches in the other uvicorn workers evict
+the same entries instead of serving them until their TTL runs out.
+
+CACHE_BACKEND=memory|redis selects where entries live; CACHE_REDIS_URL is the
+server for the redis backend and for invalidation messages (either backend).
+Both need the optional redis package (pip install redis).
+"""
+
+import base64
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Hashable, Iterable, List, Optional
+
+from app.metrics import metrics
+
+# Optional Redis client - without it every cache stays in memory and workers are not told about evictions
+try:
+    import redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_REDIS_URL = os.getenv("CACHE_REDIS_URL", "")
+CACHE_KEY_PREFIX = os.getenv("CACHE_KEY_PREFIX", "creerlio:cache:")
+CACHE_INVALIDATION_CHANNEL = os.getenv("CACHE_INVALIDATION_CHANNEL", "creerlio:cache:invalidate")
+
+# Identifies this worker's own messages on the invalidation channel
+WORKER_ID = uuid.uuid4().hex
+
+# Evictions waiting to be published; beyond this they are dropped (and counted)
+PUBLISH_QUEUE_SIZE = 10000
+
+_MISSING = object()
+
+_REDIS_ERRORS = (redis.RedisError, OSError) if REDIS_AVAILABLE else (OSError,)
+
+
+class TTLCache:
+    """LRU of at most maxsize entries, each expiring ttl seconds after it was set; thread-safe"""
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            if entry[0] <= now:
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: Hashable, value, ttl: Optional[float] = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._store(key, value, expires)
+
+    def add(self, key: Hashable, value, ttl: Optional[float] = None) -> bool:
+        """Set key only if it is absent or expired; True if it was set"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                return False
+            self._store(key, value, now + (self.ttl if ttl is None else ttl))
+            return True
+
+    def _store(self, key: Hashable, value, expires: float):
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def delete(self, *keys: Hashable):
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# ==================== Backends ====================
+
+class MemoryBackend:
+    """Entries private to this worker"""
+
+    shared = False
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.entries = TTLCache(maxsize, ttl)
+
+    def get(self, key):
+        return self.entries.get(key, _MISSING)
+
+    def set(self, key, value, ttl: float):
+        self.entries.set(key, value, ttl)
+
+    def add(self, key, value, ttl: float) -> bool:
+        return self.entries.add(key, value, ttl)
+
+    def delete(self, keys: List):
+        self.entries.delete(*keys)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class _ServerHealth:
+    """Logs when the cache server goes away and comes back, instead of on every failed call"""
+
+    def __init__(self):
+        self.failing = False
+
+    def ok(self):
+        if self.failing:
+            self.failing = False
+            print("[CACHE] Cache server reachable again")
+
+    def failed(self, error: Exception):
+        metrics.incr("cache_backend_errors_total")
+        if not self.failing:
+            self.failing = True
+            print(f"[CACHE] Cache server unavailable, continuing without it: {error}")
+
+
+# ==================== Serialisation ====================
+# Shared entries are JSON, never pickle: whatever is on the server is data, not code
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"{type(value).__name__} is not cacheable")
+
+
+def _json_object_hook(obj: Dict):
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__bytes__" in obj:
+        return base64.b64decode(obj["__bytes__"])
+    return obj
+
+
+def encode_value(value) -> bytes:
+    return json.dumps(value, default=_json_default, separators=(",", ":")).encode("utf-8")
+
+
+def decode_value(raw: bytes, value_type=None):
+    """JSON entry back to a value; value_type rebuilds a NamedTuple stored as a list"""
+    value = json.loads(raw, object_hook=_json_object_hook)
+    if value_type is not None and isinstance(value, list):
+        return value_type(*value)
+    return value
+
+
+def _redis_client(url: str, timeout: Optional[float]):
+    return redis.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout or 2.0)
+
+
+class RedisBackend:
+    """
+    Entries on a Redis server shared by every worker, stored as JSON.
+    Any server error reads as a miss, so a cache outage slows requests but
+    never fails them.
+    """
+
+    shared = True
+
+    def __init__(self, name: str, client, health: _ServerHealth, value_type=None):
+        self.prefix = f"{CACHE_KEY_PREFIX}{name}:"
+        self.client = client
+        self.health = health
+        self.value_type = value_type
+
+    def _key(self, key) -> str:
+        return self.prefix + repr(key)
+
+    def _call(self, method: str, *args, default=None, **kwargs):
+        try:
+            result = getattr(self.client, method)(*args, **kwargs)
+        except _REDIS_ERRORS as e:
+            self.health.failed(e)
+            return default
+        self.health.ok()
+        return result
+
+    def _keys(self) -> List[bytes]:
+        try:
+            keys = list(self.client.scan_iter(match=f"{self.prefix}*", count=1000))
+        except _REDIS_ERRORS as e:
+            self.health.failed(e)
+            return []
+        self.health.ok()
+        return keys
+
+    def get(self, key):
+        raw = self._call("get", self._key(key))
+        if raw is None:
+            return _MISSING
+        try:
+            return decode_value(raw, self.value_type)
+        except (TypeError, ValueError):
+            return _MISSING
+
+    def set(self, key, value, ttl: float):
+        self._call("set", self._key(key), encode_value(value), px=max(1, int(ttl * 1000)))
+
+    def add(self, key, value, ttl: float) -> bool:
+        # SET NX: exactly one worker wins; a server error counts as losing
+        return bool(self._call("set", self._key(key), encode_value(value), px=max(1, int(ttl * 1000)), nx=True))
+
+    def delete(self, keys: List):
+        if keys:
+            self._call("delete", *[self._key(key) for key in keys])
+
+    def clear(self):
+        keys = self._keys()
+        for start in range(0, len(keys), 500):
+            self._call("delete", *keys[start:start + 500])
+
+    def __len__(self) -> int:
+        return len(self._keys())
+
+
+_shared: Optional[object] = None
+_redis_health = _ServerHealth()
+
+
+def _shared_client():
+    global _shared
+    if _shared is None:
+        _shared = _redis_client(CACHE_REDIS_URL, timeout=0.25)
+    return _shared
+
+
+def _make_backend(name: str, maxsize: int, ttl: float, value_type=None):
+    if CACHE_BACKEND == "redis":
+        if not CACHE_REDIS_URL:
+            print(f"[CACHE] CACHE_BACKEND=redis needs CACHE_REDIS_URL; cache '{name}' stays in memory")
+        elif not REDIS_AVAILABLE:
+            print(f"[CACHE] CACHE_BACKEND=redis needs the redis package; cache '{name}' stays in memory")
+        else:
+            return RedisBackend(name, _shared_client(), _redis_health, value_type)
+    return MemoryBackend(name, maxsize, ttl)
+
+
+# ==================== Caches ====================
+
+class Cache:
+    """
+    A named cache. get/set go to the backend; delete/clear also tell the other
+    workers. generation changes on every eviction, so a value computed before
+    an eviction can be dropped instead of stored (pass the generation read
+    before computing it to set). Values must be JSON-serialisable (datetimes
+    and bytes included); value_type names the NamedTuple the values are.
+    bus is the invalidation channel this cache publishes on and listens to.
+    """
+
+    def __init__(
+        self, name: str, maxsize: int = 1024, ttl: float = 60.0, value_type=None,
+        bus: Optional["InvalidationBus"] = None,
+    ):
+        self.name = name
+        self.ttl = ttl
+        self.backend = _make_backend(name, maxsize, ttl, value_type)
+        self.generation = 0
+        # Held across the generation check and the write, so an eviction cannot land between them
+        self._lock = threading.Lock()
+        self.bus = bus or invalidation_bus
+        self.bus.caches[name] = self
+
+    def get(self, key: Hashable, default=None):
+        value = self.backend.get(key)
+        if value is _MISSING:
+            metrics.incr("cache_misses_total", cache=self.name)
+            return default
+        metrics.incr("cache_hits_total", cache=self.name)
+        return value
+
+    def set(self, key: Hashable, value, ttl: Optional[float] = None, generation: Optional[int] = None):
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            self.backend.set(key, value, self.ttl if ttl is None else ttl)
+
+    def add(self, key: Hashable, value, ttl: Optional[float] = None) -> bool:
+        """
+        Store value only if key is absent; True if this call stored it. On a
+        shared backend only one worker can win, which makes it a lease.
+        """
+        with self._lock:
+            return self.backend.add(key, value, self.ttl if ttl is None else ttl)
+
+    def delete(self, *keys: Hashable):
+        self._evict(list(keys))
+        self.bus.publish(self.name, list(keys))
+
+    def clear(self):
+        self._evict(None)
+        self.bus.publish(self.name, None)
+
+    def _evict(self, keys: Optional[List]):
+        with self._lock:
+            self.generation += 1
+            if keys is None:
+                self.backend.clear()
+            else:
+                self.backend.delete(keys)
+
+    def apply_remote(self, keys: Optional[List]):
+        """Invalidation published by another worker; a shared backend has already dropped the entries"""
+        if self.backend.shared:
+            with self._lock:
+                self.generation += 1
+        else:
+            self._evict(keys)
+
+    def __len__(self) -> int:
+        return len(self.backend)
+
+
+def _as_key(value):
+    # JSON turns tuple keys into lists
+    return tuple(_as_key(v) for v in value) if isinstance(value, list) else value
+
+
+# ==================== Invalidation channel ====================
+
+class InvalidationBus:
+    """
+    Publishes this worker's cache evictions on CACHE_INVALIDATION_CHANNEL and
+    applies the other workers' from a listener thread. publish() only queues
+    the message - evictions happen in commit hooks, often on the event loop,
+    so a sender thread does the network round trip. Without CACHE_REDIS_URL
+    (or the redis package) there is only one worker's view to keep right and
+    publishing is a no-op. worker_id tells this worker's own messages apart.
+    """
+
+    def __init__(self, url: str, channel: str, worker_id: str = WORKER_ID):
+        self.url = url if REDIS_AVAILABLE else ""
+        self.worker_id = worker_id
+        # Caches by name, for applying the other workers' evictions
+        self.caches: Dict[str, Cache] = {}
+        if url and not REDIS_AVAILABLE:
+            print("[CACHE] CACHE_REDIS_URL is set but the redis package is not installed; "
+                  "cache invalidations stay in this worker")
+        self.channel = channel
+        self._queue: "queue.Queue[Optional[tuple]]" = queue.Queue(maxsize=PUBLISH_QUEUE_SIZE)
+        self._sender: Optional[threading.Thread] = None
+        self._sender_lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._health = _ServerHealth()
+        self.subscribed = threading.Event()
+
+    def publish(self, cache_name: str, keys: Optional[Iterable]):
+        """Queue an eviction for the other workers; never blocks"""
+        if not self.url:
+            return
+        self._ensure_sender()
+        message = json.dumps({"origin": self.worker_id, "cache": cache_name, "keys": keys}, default=str)
+        try:
+            self._queue.put_nowait((cache_name, message))
+        except queue.Full:
+            metrics.incr("cache_invalidations_dropped_total", cache=cache_name)
+
+    def _ensure_sender(self):
+        if self._sender is not None:
+            return
+        with self._sender_lock:
+            if self._sender is None:
+                self._sender = threading.Thread(target=self._send, name="cache-invalidation-sender", daemon=True)
+                self._sender.start()
+
+    def _send(self):
+        client = _redis_client(self.url, timeout=2.0)
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            cache_name, message = item
+            try:
+                client.publish(self.channel, message)
+            except _REDIS_ERRORS as e:
+                # Lost: the other workers fall back on their TTLs for this eviction
+                self._health.failed(e)
+                continue
+            self._health.ok()
+            metrics.incr("cache_invalidations_published_total", cache=cache_name)
+
+    def flush(self, timeout: float = 2.0):
+        """Wait until queued evictions have been sent (tests and shutdown)"""
+        deadline = time.monotonic() + timeout
+        while not self._queue.empty() and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def apply(self, message: bytes):
+        try:
+            payload = json.loads(message)
+        except ValueError:
+            return
+        if payload.get("origin") == self.worker_id:
+            return
+        cache = self.caches.get(payload.get("cache"))
+        if cache is None:
+            return
+        keys = payload.get("keys")
+        cache.apply_remote(None if keys is None else [_as_key(key) for key in keys])
+        metrics.incr("cache_invalidations_received_total", cache=cache.name)
+
+    def _listen(self):
+        delay = 0.5
+        reconnected = False
+        while not self._stopping.is_set():
+            pubsub = _redis_client(self.url, timeout=None).pubsub(ignore_subscribe_messages=True)
+            try:
+                pubsub.subscribe(self.channel)
+                if reconnected:
+                    # Messages published while disconnected were lost
+                    for cache in list(self.caches.values()):
+                        cache.apply_remote(None)
+                self.subscribed.set()
+                self._health.ok()
+                delay = 0.5
+                while not self._stopping.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self.apply(message["data"])
+            except _REDIS_ERRORS as e:
+                self.subscribed.clear()
+                if self._stopping.is_set():
+                    break
+                reconnected = True
+                self._health.failed(e)
+                self._stopping.wait(delay)
+                delay = min(delay * 2, 30.0)
+            finally:
+                try:
+                    pubsub.close()
+                except _REDIS_ERRORS:
+                    pass
+
+    def start(self):
+        """Start the listener thread (no-op without CACHE_REDIS_URL)"""
+        if not self.url or self._thread is not None:
+            return
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._listen, name="cache-invalidation", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+        if self._sender is not None:
+            self.flush()
+            try:
+                self._queue.put(None, timeout=1)
+            except queue.Full:
+                pass
+            self._sender.join(timeout=2)
+            self._sender = None
+
+
+invalidation_bus = InvalidationBus(CACHE_REDIS_URL, CACHE_INVALIDATION_CHANNEL)
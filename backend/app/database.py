@@ -4,13 +4,25 @@ SQLAlchemy setup for Creerlio Platform
 Supports both PostgreSQL (including Supabase) and SQLite
 """
 
+import asyncio
+import hashlib
+import hmac
+import math
 import os
-from sqlalchemy import create_engine, text
+import time
+from typing import List
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import DisconnectionError, OperationalError, TimeoutError as PoolTimeoutError
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker, Session
-from sqlalchemy.pool import NullPool
-from contextlib import contextmanager
-from fastapi import HTTPException
-from app.models import Base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool, StaticPool
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from fastapi import HTTPException, Request, Response
+from app.auth import DEFAULT_SECRET_KEY, SECRET_KEY, decode_access_token
+from app.cache import Cache
+from app.metrics import metrics
+from app.query_tracker import instrument_engine
 
 # Database URL from environment
 # For Supabase, use: postgresql://postgres:[PASSWORD]@[PROJECT_REF].supabase.co:5432/postgres
@@ -24,27 +36,170 @@ SUPABASE_URL = os.getenv("SUPABASE_URL")
 SUPABASE_ANON_KEY = os.getenv("SUPABASE_ANON_KEY")
 SUPABASE_SERVICE_ROLE_KEY = os.getenv("SUPABASE_SERVICE_ROLE_KEY")
 
+# Connection pool settings (PostgreSQL) - size pools per worker:
+# total connections = workers x (DB_POOL_SIZE + DB_MAX_OVERFLOW)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+# Seconds between background pings of an idle pool (0 disables)
+DB_POOL_VALIDATE_INTERVAL = float(os.getenv("DB_POOL_VALIDATE_INTERVAL", "60"))
+
+
+class _CheckoutTimingMixin:
+    """Records how long each pool checkout waits for a connection"""
+    metrics_label = "sync"
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            metrics.incr("db_pool_checkout_timeouts_total", pool=self.metrics_label)
+            raise
+        finally:
+            metrics.observe("db_pool_checkout_wait_seconds", time.perf_counter() - started, pool=self.metrics_label)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool used by the sync engine"""
+    metrics_label = "sync"
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """Queue pool used by the async engine"""
+    metrics_label = "async"
+
+
+# SQLite profile - WAL lets readers run alongside a writer, NORMAL sync is safe under WAL.
+# SQLITE_TUNING=false restores the old behaviour (NullPool, default pragmas).
+SQLITE_TUNING = os.getenv("SQLITE_TUNING", "true").lower() == "true"
+SQLITE_PRAGMAS = {
+    "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+    "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+    "mmap_size": int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+    "cache_size": int(os.getenv("SQLITE_CACHE_SIZE", "-64000")),  # negative = KiB, i.e. 64 MB
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "temp_store": "MEMORY",
+}
+
+
+def apply_sqlite_pragmas(dbapi_connection, connection_record=None, pragmas: dict = None):
+    """Connect-event hook: apply the SQLite profile to every new connection"""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in (pragmas or SQLITE_PRAGMAS).items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def sqlite_engine_options(url: str, tuned: bool = True, is_async: bool = False) -> dict:
+    """create_engine keyword arguments for a SQLite URL"""
+    if not tuned:
+        options = {"poolclass": NullPool}
+    elif ":memory:" in url or url.rstrip("/").endswith(":"):
+        # An in-memory database only exists on its one connection
+        options = {"poolclass": StaticPool}
+    else:
+        options = {
+            "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+            "pool_size": DB_POOL_SIZE,
+            "max_overflow": DB_MAX_OVERFLOW,
+            "pool_timeout": DB_POOL_TIMEOUT,
+        }
+    if not is_async:
+        options["connect_args"] = {"check_same_thread": False}
+    return options
+
+
+def create_sqlite_engine(url: str, tuned: bool = True):
+    """Sync SQLite engine; with tuned=True, pooled and with the pragma profile applied"""
+    sqlite_engine = create_engine(
+        url,
+        echo=os.getenv("DB_ECHO", "False").lower() == "true",
+        **sqlite_engine_options(url, tuned)
+    )
+    if tuned:
+        event.listen(sqlite_engine, "connect", apply_sqlite_pragmas)
+    return sqlite_engine
+
+
+def build_engine(url: str):
+    """Sync engine for a database URL with the pool settings above, instrumented per request"""
+    if "sqlite" in url.lower():
+        return instrument_engine(create_sqlite_engine(url, tuned=SQLITE_TUNING))
+    # PostgreSQL or other databases
+    return instrument_engine(create_engine(
+        url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=True,  # Ping on checkout; stale connections are replaced transparently
+        pool_recycle=DB_POOL_RECYCLE,
+        echo=os.getenv("DB_ECHO", "False").lower() == "true"
+    ))
+
+
+def _async_database_url(url: str) -> str:
+    """Map the sync DATABASE_URL to its async driver (asyncpg / aiosqlite)"""
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False)
+    if backend == "postgresql":
+        query = dict(parsed.query)
+        # asyncpg takes "ssl" rather than libpq's "sslmode"
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return parsed.set(drivername="postgresql+asyncpg", query=query).render_as_string(hide_password=False)
+    return url
+
+
+def build_async_engine(url: str):
+    """Async engine (asyncpg / aiosqlite) for a sync database URL"""
+    from sqlalchemy.ext.asyncio import create_async_engine
+    async_url = _async_database_url(url)
+    if "sqlite" in url.lower():
+        sqlite_async_engine = create_async_engine(
+            async_url,
+            echo=os.getenv("DB_ECHO", "False").lower() == "true",
+            **sqlite_engine_options(async_url, SQLITE_TUNING, is_async=True)
+        )
+        if SQLITE_TUNING:
+            event.listen(sqlite_async_engine.sync_engine, "connect", apply_sqlite_pragmas)
+        return instrument_engine(sqlite_async_engine)
+    connect_args = {}
+    if ":6543" in url or "pooler" in url:
+        # Transaction-mode poolers (PgBouncer/Supavisor) cannot hold prepared statements
+        connect_args["statement_cache_size"] = 0
+    return instrument_engine(create_async_engine(
+        async_url,
+        poolclass=InstrumentedAsyncQueuePool,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_timeout=DB_POOL_TIMEOUT,
+        pool_pre_ping=True,
+        pool_recycle=DB_POOL_RECYCLE,
+        connect_args=connect_args,
+        echo=os.getenv("DB_ECHO", "False").lower() == "true"
+    ))
+
+
+def _async_sessionmaker(bind):
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+    # expire_on_commit=False: attributes stay loaded after commit, no implicit IO on access
+    return async_sessionmaker(bind, class_=AsyncSession, expire_on_commit=False)
+
+
 # Create engine with connection pool settings
-# For SQLite, use NullPool and enable check_same_thread=False
+# For SQLite, see create_sqlite_engine (SQLITE_TUNING selects the profile)
 # On Railway, we should use Supabase PostgreSQL, not SQLite
 engine = None
 if DATABASE_URL:
     try:
-        if "sqlite" in DATABASE_URL.lower():
-            engine = create_engine(
-                DATABASE_URL,
-                poolclass=NullPool,
-                connect_args={"check_same_thread": False},
-                echo=os.getenv("DB_ECHO", "False").lower() == "true"
-            )
-        else:
-            # PostgreSQL or other databases
-            engine = create_engine(
-                DATABASE_URL,
-                pool_pre_ping=True,  # Verify connections before using
-                pool_recycle=3600,   # Recycle connections after 1 hour
-                echo=os.getenv("DB_ECHO", "False").lower() == "true"
-            )
+        engine = build_engine(DATABASE_URL)
         print(f"Database engine created successfully")
     except Exception as e:
         print(f"Warning: Failed to create database engine: {e}")
@@ -62,40 +217,399 @@ else:
     SessionLocal = None
 
 
+# Async engine for hot read paths - same database, non-blocking driver.
+# Optional: without asyncpg/aiosqlite installed, get_async_db reports 503.
+async_engine = None
+AsyncSessionLocal = None
+if DATABASE_URL:
+    try:
+        async_engine = build_async_engine(DATABASE_URL)
+        AsyncSessionLocal = _async_sessionmaker(async_engine)
+        print(f"Async database engine created successfully")
+    except Exception as e:
+        print(f"Warning: Async database engine unavailable ({e}); async endpoints will return 503")
+        async_engine = None
+        AsyncSessionLocal = None
+
+
+# Optional read replica. Read-only GET endpoints use it through get_read_db /
+# get_async_read_db; anything else, and clients that just wrote, use the primary.
+DATABASE_READ_URL = os.getenv("DATABASE_READ_URL", "")
+# Replica is skipped while its replay lag exceeds this many seconds
+READ_REPLICA_MAX_LAG_SECONDS = float(os.getenv("READ_REPLICA_MAX_LAG_SECONDS", "5"))
+READ_REPLICA_CHECK_INTERVAL = float(os.getenv("READ_REPLICA_CHECK_INTERVAL", "10"))
+# After a write, the same client reads from the primary for this long (read-your-writes)
+READ_AFTER_WRITE_SECONDS = float(os.getenv("READ_AFTER_WRITE_SECONDS", "5"))
+
+read_engine = None
+ReadSessionLocal = None
+async_read_engine = None
+AsyncReadSessionLocal = None
+if DATABASE_URL and DATABASE_READ_URL:
+    try:
+        read_engine = build_engine(DATABASE_READ_URL)
+        ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+        async_read_engine = build_async_engine(DATABASE_READ_URL)
+        AsyncReadSessionLocal = _async_sessionmaker(async_read_engine)
+        print(f"Read replica engine created successfully")
+    except Exception as e:
+        print(f"Warning: Read replica unavailable ({e}); reads will use the primary")
+        read_engine = ReadSessionLocal = async_read_engine = AsyncReadSessionLocal = None
+
+
 def init_db():
-    """Initialize database tables"""
+    """Initialize database tables by applying pending schema migrations (no-op when current)"""
     if not engine:
         print("Warning: Database engine not available, skipping table creation")
         return
     try:
-        Base.metadata.create_all(bind=engine)
+        from app.migrations import run_migrations
+        run_migrations(engine)
     except Exception as e:
         print(f"Warning: Database initialization failed: {e}")
         # Don't raise - allow app to start even if DB init fails
         pass
 
 
+def _session_scope(session_factory, on_connection_error=None):
+    """
+    Yield a session from session_factory, mapping connection failures to 503.
+    on_connection_error may return headers for the 503 response.
+    """
+    db = session_factory()
+    try:
+        yield db
+    except (OperationalError, DisconnectionError, PoolTimeoutError) as e:
+        db.rollback()
+        print(f"Database connection error: {e}")
+        headers = on_connection_error(e) if on_connection_error else None
+        raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}", headers=headers)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
 def get_db():
-    """Dependency for getting database session"""
+    """
+    Dependency for getting database session.
+    Connection health is handled by the pool (ping on checkout plus the
+    background validator), so no test query is issued per request.
+    """
     if not SessionLocal:
-        from fastapi import HTTPException
         raise HTTPException(status_code=503, detail="Database not configured")
+    yield from _session_scope(SessionLocal)
+
+
+def _queue_pool_status(pool, label: str) -> dict:
+    if not isinstance(pool, QueuePool):
+        return {"pool": type(pool).__name__}
+    return {
+        "pool": type(pool).__name__,
+        "size": pool.size(),
+        "max_overflow": DB_MAX_OVERFLOW,
+        "timeout": DB_POOL_TIMEOUT,
+        "recycle": DB_POOL_RECYCLE,
+        "in_use": pool.checkedout(),
+        "idle": pool.checkedin(),
+        "overflow": max(0, pool.overflow()),
+        "checkout_wait_seconds": metrics.summary("db_pool_checkout_wait_seconds", pool=label),
+    }
+
+
+def pool_status() -> dict:
+    """Current pool occupancy, for sizing pools per worker"""
+    if not engine:
+        return {"configured": False}
+    status = {"configured": True, **_queue_pool_status(engine.pool, "sync")}
+    if async_engine:
+        status["async"] = _queue_pool_status(async_engine.sync_engine.pool, "async")
+    status["replica"] = replica_status()
+    return status
+
+
+def _pool_gauge(field: str, async_pool: bool = False):
+    def read():
+        status = pool_status()
+        if async_pool:
+            status = status.get("async") or {}
+        value = status.get(field)
+        return value if isinstance(value, (int, float)) else None
+    return read
+
+
+for _field in ("in_use", "idle", "overflow", "size"):
+    metrics.register_gauge(f"db_pool_{_field}", _pool_gauge(_field))
+    metrics.register_gauge(f"db_async_pool_{_field}", _pool_gauge(_field, async_pool=True))
+
+
+def validate_pool() -> bool:
+    """Ping the database once; on failure drop every pooled connection so the next checkout reconnects"""
+    if not engine:
+        return False
+    started = time.perf_counter()
     try:
-        db = SessionLocal()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+        metrics.observe("db_validation_seconds", time.perf_counter() - started)
+        metrics.set_gauge("db_healthy", 1)
+        return True
+    except Exception as e:
+        print(f"Warning: Database validation failed, resetting pool: {e}")
+        metrics.incr("db_validation_failures_total")
+        metrics.set_gauge("db_healthy", 0)
+        engine.dispose()
+        return False
+
+
+async def run_pool_validator(interval: float = DB_POOL_VALIDATE_INTERVAL):
+    """Background task: validate the pool every `interval` seconds"""
+    if not engine or interval <= 0:
+        return
+    while True:
+        await asyncio.sleep(interval)
+        await asyncio.to_thread(validate_pool)
+
+
+@asynccontextmanager
+async def _async_session_scope(session_factory, on_connection_error=None):
+    """
+    Async variant of _session_scope. A context manager rather than a generator:
+    dependencies enter it with `async with`, which passes the endpoint's exception
+    in (an `async for` over a generator would not).
+    """
+    async with session_factory() as db:
         try:
-            # Test connection (SQLAlchemy 2.0 syntax)
-            db.execute(text("SELECT 1"))
             yield db
-        except Exception as e:
-            db.rollback()
+        except (OperationalError, DisconnectionError, PoolTimeoutError) as e:
+            await db.rollback()
             print(f"Database connection error: {e}")
-            from fastapi import HTTPException
-            raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}")
-        finally:
-            db.close()
+            headers = on_connection_error(e) if on_connection_error else None
+            raise HTTPException(status_code=503, detail=f"Database connection failed: {str(e)}", headers=headers)
+        except Exception:
+            await db.rollback()
+            raise
+
+
+async def get_async_db():
+    """Dependency for getting an AsyncSession - queries do not block the event loop"""
+    if not AsyncSessionLocal:
+        raise HTTPException(status_code=503, detail="Database not configured")
+    async with _async_session_scope(AsyncSessionLocal) as db:
+        yield db
+
+
+# ==================== Read Replica Routing ====================
+
+_replica_state = {"healthy": True, "lag_seconds": 0.0, "checked_at": None, "error": None}
+
+# Read-your-writes pins. A write pins the writer's reads to the primary two ways:
+# an entry per authenticated user (the verified access token's subject) in the
+# read_after_write cache (shared between workers when CACHE_BACKEND=redis), and
+# a signed pin carrying its expiry, sent back as a cookie and an
+# X-Read-After-Write header for the client to return. The signed pin needs no
+# shared state, so it holds across workers either way - but only with a real
+# SECRET_KEY, since anyone can sign with the default one.
+READ_AFTER_WRITE_COOKIE = "read_after_write"
+READ_AFTER_WRITE_HEADER = "X-Read-After-Write"
+read_after_write_pins = Cache("read_after_write", maxsize=10000, ttl=READ_AFTER_WRITE_SECONDS)
+SIGNED_READ_PINS = SECRET_KEY != DEFAULT_SECRET_KEY
+if DATABASE_READ_URL and not SIGNED_READ_PINS:
+    print("Warning: SECRET_KEY is not set; signed read-after-write pins are disabled")
+
+# Marks the 503 of a replica that failed mid-request, so ReplicaFallbackMiddleware retries on the primary
+REPLICA_FAILED_HEADER = "X-Replica-Failed"
+
+_REPLICA_LAG_SQL = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+""")
+
+
+def _identity_keys(request: Request) -> List[str]:
+    """
+    Identity a write is pinned under: the subject of a verified bearer token.
+    Unauthenticated hints (X-User-Id, ?email=) are not used - anyone could send them.
+    """
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() != "bearer" or not token.strip():
+        return []
+    claims = decode_access_token(token.strip())
+    subject = claims.get("sub") if claims else None
+    return [f"user:{str(subject).lower()}"] if subject else []
+
+
+def _pin_signature(until: int) -> str:
+    return hmac.new(SECRET_KEY.encode(), f"read_after_write:{until}".encode(), hashlib.sha256).hexdigest()
+
+
+def sign_read_pin(until: int) -> str:
+    """Pin token "<expiry epoch seconds>.<signature>" """
+    return f"{until}.{_pin_signature(until)}"
+
+
+def read_pin_valid(token: str) -> bool:
+    """Whether a pin token is genuine and not yet expired (never, with the default SECRET_KEY)"""
+    if not SIGNED_READ_PINS:
+        return False
+    until, _, signature = (token or "").partition(".")
+    if not until.isdigit() or not hmac.compare_digest(signature, _pin_signature(int(until))):
+        return False
+    return int(until) > time.time()
+
+
+def mark_client_write(request: Request, response: Response):
+    """Pin this client's reads to the primary for READ_AFTER_WRITE_SECONDS"""
+    if not ReadSessionLocal or READ_AFTER_WRITE_SECONDS <= 0:
+        return
+    for key in _identity_keys(request):
+        read_after_write_pins.set(key, True)
+    if not SIGNED_READ_PINS:
+        return
+    token = sign_read_pin(math.ceil(time.time() + READ_AFTER_WRITE_SECONDS))
+    response.headers[READ_AFTER_WRITE_HEADER] = token
+    response.set_cookie(
+        READ_AFTER_WRITE_COOKIE, token, max_age=math.ceil(READ_AFTER_WRITE_SECONDS),
+        httponly=True, samesite="lax",
+    )
+
+
+def _recently_wrote(request: Request) -> bool:
+    for token in (request.headers.get(READ_AFTER_WRITE_HEADER), request.cookies.get(READ_AFTER_WRITE_COOKIE)):
+        if token and read_pin_valid(token):
+            return True
+    return any(read_after_write_pins.get(key) for key in _identity_keys(request))
+
+
+def _read_target(request: Request) -> str:
+    """"replica" or the reason the primary must be used"""
+    if not ReadSessionLocal:
+        return "no_replica"
+    if not _replica_state["healthy"]:
+        return "replica_unhealthy"
+    if _replica_state["lag_seconds"] > READ_REPLICA_MAX_LAG_SECONDS:
+        return "replica_lag"
+    if getattr(request.state, "replica_failed", False):
+        return "replica_failed"
+    if request.headers.get("x-read-consistency", "").lower() == "strong":
+        return "strong_consistency"
+    if _recently_wrote(request):
+        return "read_after_write"
+    return "replica"
+
+
+def _replica_connection_failed(error: Exception):
+    # Fall back to the primary until the monitor sees the replica healthy again
+    _replica_state["healthy"] = False
+    _replica_state["error"] = str(error)
+    metrics.set_gauge("db_replica_healthy", 0)
+
+
+def _replica_request_failed(error: Exception) -> dict:
+    _replica_connection_failed(error)
+    return {REPLICA_FAILED_HEADER: "1"}
+
+
+class ReplicaFallbackMiddleware:
+    """
+    Replays a GET on the primary when the replica fails mid-request.
+    The failed attempt's 503 (marked with REPLICA_FAILED_HEADER) is never sent;
+    read endpoints have no side effects, so running one twice is safe.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD") or not ReadSessionLocal:
+            await self.app(scope, receive, send)
+            return
+        marker = REPLICA_FAILED_HEADER.lower().encode()
+        replica_failed = False
+
+        async def send_unless_replica_failed(message):
+            nonlocal replica_failed
+            if message["type"] == "http.response.start" and message["status"] == 503:
+                replica_failed = any(name.lower() == marker for name, _ in message.get("headers", []))
+            if not replica_failed:
+                await send(message)
+
+        await self.app(scope, receive, send_unless_replica_failed)
+        if replica_failed:
+            metrics.incr("db_replica_fallbacks_total")
+            state = {**scope.get("state", {}), "replica_failed": True}
+            await self.app({**scope, "state": state}, receive, send)
+
+
+def get_read_db(request: Request):
+    """Dependency for read-only endpoints: a replica session when safe, else the primary"""
+    target = _read_target(request)
+    metrics.incr("db_read_routing_total", target="replica" if target == "replica" else "primary", reason=target)
+    if target == "replica":
+        yield from _session_scope(ReadSessionLocal, _replica_request_failed)
+    else:
+        yield from get_db()
+
+
+async def get_async_read_db(request: Request):
+    """Async variant of get_read_db"""
+    target = _read_target(request)
+    metrics.incr("db_read_routing_total", target="replica" if target == "replica" else "primary", reason=target)
+    if target == "replica" and AsyncReadSessionLocal:
+        async with _async_session_scope(AsyncReadSessionLocal, _replica_request_failed) as db:
+            yield db
+    else:
+        if not AsyncSessionLocal:
+            raise HTTPException(status_code=503, detail="Database not configured")
+        async with _async_session_scope(AsyncSessionLocal) as db:
+            yield db
+
+
+def check_replica_lag() -> dict:
+    """Measure replica replay lag (PostgreSQL) and record whether the replica is usable"""
+    if not read_engine:
+        return dict(_replica_state)
+    try:
+        with read_engine.connect() as connection:
+            if read_engine.dialect.name == "postgresql":
+                lag = float(connection.execute(_REPLICA_LAG_SQL).scalar() or 0)
+            else:
+                connection.execute(text("SELECT 1"))
+                lag = 0.0
+        _replica_state.update(healthy=True, lag_seconds=lag, error=None)
+        metrics.set_gauge("db_replica_healthy", 1)
+        metrics.set_gauge("db_replica_lag_seconds", lag)
     except Exception as e:
-        from fastapi import HTTPException
-        raise HTTPException(status_code=503, detail=f"Database error: {str(e)}")
+        print(f"Warning: Read replica check failed, reads fall back to the primary: {e}")
+        _replica_connection_failed(e)
+        read_engine.dispose()
+    _replica_state["checked_at"] = datetime.utcnow().isoformat()
+    return dict(_replica_state)
+
+
+def replica_status() -> dict:
+    if not read_engine:
+        return {"configured": False}
+    return {
+        "configured": True,
+        **_replica_state,
+        "max_lag_seconds": READ_REPLICA_MAX_LAG_SECONDS,
+        "read_after_write_seconds": READ_AFTER_WRITE_SECONDS,
+        "pool": _queue_pool_status(read_engine.pool, "sync"),
+    }
+
+
+async def run_replica_monitor(interval: float = READ_REPLICA_CHECK_INTERVAL):
+    """Background task: refresh replica health and lag every `interval` seconds"""
+    if not read_engine:
+        return
+    while True:
+        await asyncio.to_thread(check_replica_lag)
+        await asyncio.sleep(max(1.0, interval))
 
 
 @contextmanager
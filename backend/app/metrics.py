@@ -0,0 +1,177 @@
+"""
+In-process Metrics Registry
+Lightweight counters, gauges and latency summaries for the Creerlio API
+Exposed as JSON (/api/metrics) and Prometheus text (/metrics)
+"""
+
+import threading
+from collections import deque
+from typing import Callable, Dict, Tuple
+
+# Number of recent observations kept per summary for percentile estimates
+SUMMARY_WINDOW = 512
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label_value(value) -> str:
+    """Label value escaped for the Prometheus text format (backslash, double quote, newline)"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))
+    return ordered[index]
+
+
+class _Summary:
+    """Count/sum/max plus a rolling window for p50/p95"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.recent = deque(maxlen=SUMMARY_WINDOW)
+
+    def observe(self, value: float):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        self.recent.append(value)
+
+    def to_dict(self) -> Dict:
+        recent = list(self.recent)
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "avg": round(self.total / self.count, 6) if self.count else 0.0,
+            "max": round(self.max, 6),
+            "p50": round(_percentile(recent, 0.50), 6),
+            "p95": round(_percentile(recent, 0.95), 6),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe registry shared by every module in the process"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._summaries: Dict[str, Dict[LabelKey, _Summary]] = {}
+        self._gauge_callbacks: Dict[str, Callable[[], Dict]] = {}
+
+    def incr(self, name: str, value: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._gauges.setdefault(name, {})[key] = value
+
+    def observe(self, name: str, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.get(key)
+            if summary is None:
+                summary = series[key] = _Summary()
+            summary.observe(value)
+
+    def register_gauge(self, name: str, callback: Callable[[], Dict]):
+        """
+        Register a gauge computed on read.
+        The callback returns a plain number (or None to skip), or a dict keyed by
+        label pairs: {(("pool", "primary"),): 3, (): 5} - dicts are not hashable,
+        so labels are given as a tuple of (name, value) tuples, () for none.
+        """
+        with self._lock:
+            self._gauge_callbacks[name] = callback
+
+    def summary(self, name: str, **labels) -> Dict:
+        key = _label_key(labels)
+        with self._lock:
+            summary = self._summaries.get(name, {}).get(key)
+            return summary.to_dict() if summary else _Summary().to_dict()
+
+    def _collect_gauges(self) -> Dict[str, Dict[LabelKey, float]]:
+        with self._lock:
+            gauges = {name: dict(series) for name, series in self._gauges.items()}
+            callbacks = dict(self._gauge_callbacks)
+        for name, callback in callbacks.items():
+            try:
+                result = callback()
+            except Exception as e:
+                print(f"[METRICS] Gauge callback {name} failed: {e}")
+                continue
+            if isinstance(result, dict):
+                series = gauges.setdefault(name, {})
+                for labels, value in result.items():
+                    series[_label_key(dict(labels or ()))] = value
+            elif result is not None:
+                gauges.setdefault(name, {})[()] = result
+        return gauges
+
+    def snapshot(self) -> Dict:
+        """JSON-friendly view of every metric"""
+        gauges = self._collect_gauges()
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+            summaries = {
+                name: {key: summary.to_dict() for key, summary in series.items()}
+                for name, series in self._summaries.items()
+            }
+
+        def _series(data: Dict[LabelKey, object]):
+            return [{"labels": dict(key), "value": value} for key, value in data.items()]
+
+        return {
+            "counters": {name: _series(series) for name, series in counters.items()},
+            "gauges": {name: _series(series) for name, series in gauges.items()},
+            "summaries": {name: _series(series) for name, series in summaries.items()},
+        }
+
+    def render_prometheus(self) -> str:
+        """Prometheus text exposition format"""
+        snapshot = self.snapshot()
+        lines = []
+
+        def _fmt_labels(labels: Dict) -> str:
+            if not labels:
+                return ""
+            inner = ",".join(f'{k}="{_escape_label_value(v)}"' for k, v in labels.items())
+            return "{" + inner + "}"
+
+        for name, series in snapshot["counters"].items():
+            lines.append(f"# TYPE {name} counter")
+            for item in series:
+                lines.append(f"{name}{_fmt_labels(item['labels'])} {item['value']}")
+        for name, series in snapshot["gauges"].items():
+            lines.append(f"# TYPE {name} gauge")
+            for item in series:
+                lines.append(f"{name}{_fmt_labels(item['labels'])} {item['value']}")
+        for name, series in snapshot["summaries"].items():
+            lines.append(f"# TYPE {name} summary")
+            for item in series:
+                labels = item["labels"]
+                value = item["value"]
+                for quantile, field in (("0.5", "p50"), ("0.95", "p95")):
+                    lines.append(f"{name}{_fmt_labels({**labels, 'quantile': quantile})} {value[field]}")
+                lines.append(f"{name}_sum{_fmt_labels(labels)} {value['sum']}")
+                lines.append(f"{name}_count{_fmt_labels(labels)} {value['count']}")
+        return "\n".join(lines) + "\n"
+
+
+# Global registry instance
+metrics = MetricsRegistry()
@@ -0,0 +1,157 @@
+"""
+Versioned Schema Migrations
+Replaces create_all-on-every-boot with an ordered list of migrations recorded in
+schema_migrations; startup costs one query when the schema is current
+"""
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateIndex
+
+from app.models import Application, Base, BusinessProfile, Job, TalentProfile
+from app.application_stats import install_application_stats
+from app.resume_insights import install_insights_retry
+from app.search import install_fulltext
+from app.skills import install_skill_index
+
+_migration_metadata = MetaData()
+
+schema_migrations = Table(
+    "schema_migrations",
+    _migration_metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime, default=datetime.utcnow),
+)
+
+# Arbitrary constant for pg_advisory_lock - serialises migrations across workers
+MIGRATION_LOCK_KEY = 72410035
+
+
+@dataclass(frozen=True)
+class Migration:
+    version: int
+    name: str
+    apply: Callable
+    # False for steps that must run outside a transaction (CREATE INDEX CONCURRENTLY)
+    transactional: bool = True
+
+
+def _baseline_schema(connection):
+    """Every table in app.models - on a fresh database this already includes later indexes"""
+    Base.metadata.create_all(bind=connection)
+
+
+def _create_index(connection, index):
+    """CREATE INDEX IF NOT EXISTS; concurrently on PostgreSQL so writes are not blocked"""
+    ddl = str(CreateIndex(index, if_not_exists=True).compile(dialect=connection.dialect))
+    if connection.dialect.name == "postgresql":
+        # A failed concurrent build leaves an INVALID index that IF NOT EXISTS would keep
+        invalid = connection.execute(text(
+            "SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid "
+            "WHERE c.relname = :name AND NOT i.indisvalid"
+        ), {"name": index.name}).first()
+        if invalid:
+            connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS "{index.name}"'))
+        ddl = ddl.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+    connection.execute(text(ddl))
+
+
+def _index_pack(connection):
+    """Indexes for the listing queries, declared in the models' __table_args__"""
+    for model in (Job, Application, BusinessProfile, TalentProfile):
+        for index in sorted(model.__table__.indexes, key=lambda i: i.name):
+            if index.name in INDEX_PACK:
+                _create_index(connection, index)
+
+
+def _talent_email_index(connection):
+    """lower(email) index for the bulk import's case-insensitive duplicate check"""
+    for index in TalentProfile.__table__.indexes:
+        if index.name == "ix_talent_profiles_email_lower":
+            _create_index(connection, index)
+
+
+INDEX_PACK = {
+    "ix_jobs_status_active_created",
+    "ix_jobs_active_status_created",
+    "ix_jobs_active_business_created",
+    "ix_applications_talent_created",
+    "ix_applications_job_created",
+    "ix_business_profiles_active_created",
+    "ix_talent_profiles_active_created",
+}
+
+# Append only. Steps must be idempotent: on a fresh database the baseline
+# already creates the current model schema, and later steps then re-apply.
+MIGRATIONS: List[Migration] = [
+    Migration(1, "baseline_schema", _baseline_schema),
+    Migration(2, "index_pack_listing_queries", _index_pack, transactional=False),
+    Migration(3, "full_text_search", install_fulltext),
+    Migration(4, "skills_index", install_skill_index),
+    Migration(5, "job_application_stats", install_application_stats),
+    Migration(6, "resume_insights_retry", install_insights_retry),
+    Migration(7, "talent_email_lower_index", _talent_email_index, transactional=False),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1].version
+
+
+def current_version(engine) -> Optional[int]:
+    """Applied schema version, or None if migrations never ran"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(func.max(schema_migrations.c.version))).scalar()
+    except (OperationalError, ProgrammingError):
+        return None
+
+
+def _record(engine, migration: Migration):
+    with engine.begin() as connection:
+        connection.execute(schema_migrations.insert().values(
+            version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+        ))
+
+
+def run_migrations(engine) -> int:
+    """
+    Bring the schema to SCHEMA_VERSION.
+    Returns immediately (one query) when the schema is already current.
+    """
+    version = current_version(engine)
+    if version is not None and version >= SCHEMA_VERSION:
+        print(f"Schema up to date (version {version})")
+        return version
+
+    is_postgres = engine.dialect.name == "postgresql"
+    lock_connection = None
+    if is_postgres:
+        # Session-level lock held across steps, some of which cannot run in a transaction
+        lock_connection = engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        lock_connection.execute(text("SELECT pg_advisory_lock(:key)"), {"key": MIGRATION_LOCK_KEY})
+    try:
+        with engine.begin() as connection:
+            schema_migrations.create(bind=connection, checkfirst=True)
+        # Another worker may have migrated while we waited for the lock
+        version = current_version(engine) or 0
+        for migration in MIGRATIONS:
+            if migration.version <= version:
+                continue
+            print(f"Applying migration {migration.version}: {migration.name}")
+            if migration.transactional or not is_postgres:
+                with engine.begin() as connection:
+                    migration.apply(connection)
+            else:
+                with engine.connect() as connection:
+                    migration.apply(connection.execution_options(isolation_level="AUTOCOMMIT"))
+            _record(engine, migration)
+            version = migration.version
+        return version
+    finally:
+        if lock_connection is not None:
+            lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": MIGRATION_LOCK_KEY})
+            lock_connection.close()
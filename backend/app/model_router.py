@@ -0,0 +1,148 @@
+"""
+Model Routing Policy for AIService
+Sends small inputs to a fast, cheap model and escalates to the large model
+for long/complex inputs or when the fast model's output fails validation
+"""
+
+import os
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Dict, Optional
+
+from app.metrics import metrics
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        print(f"Warning: Invalid value for {name}, using default {default}")
+        return default
+
+
+# Matches years such as 2019 or 1998 - a cheap proxy for the number of dated entries
+_YEAR_PATTERN = re.compile(r"\b(?:19|20)\d{2}\b")
+
+
+@dataclass(frozen=True)
+class RouteDecision:
+    """Which model a request goes to and why"""
+    task: str
+    model: str
+    reason: str
+    input_chars: int
+    escalated: bool = False
+
+
+class ModelRouter:
+    """
+    Routing policy configured through environment variables.
+
+    OPENAI_MODEL                  Large model (default gpt-4-turbo-preview)
+    OPENAI_FAST_MODEL             Fast model (default gpt-4o-mini)
+    AI_ROUTING_ENABLED            Set to "false" to always use the large model
+    AI_ROUTE_<TASK>_MAX_CHARS     Inputs up to this size go to the fast model
+    AI_ROUTE_RESUME_MAX_DATES     Resumes with more year mentions are treated as complex
+    AI_LATENCY_BUDGET_<TASK>_MS   If the large model's p95 exceeds this budget, inputs up
+                                  to twice the size threshold stay on the fast model
+    """
+
+    TASKS = ("polish", "resume_parse", "summary", "enhance")
+
+    def __init__(self):
+        self.large_model = os.getenv("OPENAI_MODEL", "gpt-4-turbo-preview")
+        self.fast_model = os.getenv("OPENAI_FAST_MODEL", "gpt-4o-mini")
+        self.enabled = os.getenv("AI_ROUTING_ENABLED", "true").lower() == "true"
+        self.max_chars = {
+            "polish": _env_int("AI_ROUTE_POLISH_MAX_CHARS", 1500),
+            "resume_parse": _env_int("AI_ROUTE_RESUME_PARSE_MAX_CHARS", 6000),
+            "summary": _env_int("AI_ROUTE_SUMMARY_MAX_CHARS", 8000),
+            "enhance": _env_int("AI_ROUTE_ENHANCE_MAX_CHARS", 6000),
+        }
+        self.resume_max_dates = _env_int("AI_ROUTE_RESUME_MAX_DATES", 16)
+        self.latency_budget_ms = {
+            task: _env_int(f"AI_LATENCY_BUDGET_{task.upper()}_MS", 0) for task in self.TASKS
+        }
+        self._lock = threading.Lock()
+        self._recent = deque(maxlen=50)
+
+    def choose(self, task: str, text: str) -> RouteDecision:
+        """Pick a model for a task based on input size and complexity"""
+        size = len(text or "")
+        if not self.enabled or self.fast_model == self.large_model:
+            return self._decide(task, self.large_model, "routing_disabled", size)
+
+        threshold = self.max_chars.get(task, 0)
+        if task == "resume_parse" and len(_YEAR_PATTERN.findall(text or "")) > self.resume_max_dates:
+            return self._decide(task, self.large_model, "complex_input", size)
+
+        if size <= threshold:
+            return self._decide(task, self.fast_model, "small_input", size)
+
+        budget_ms = self.latency_budget_ms.get(task, 0)
+        if budget_ms and size <= threshold * 2:
+            large_p95_ms = metrics.summary("ai_model_latency_seconds", model=self.large_model, task=task)["p95"] * 1000
+            if large_p95_ms > budget_ms:
+                return self._decide(task, self.fast_model, "latency_budget", size)
+
+        return self._decide(task, self.large_model, "large_input", size)
+
+    def escalate(self, decision: RouteDecision, reason: str) -> Optional[RouteDecision]:
+        """Return a decision on the large model, or None if already there"""
+        if decision.model == self.large_model:
+            return None
+        escalated = replace(decision, model=self.large_model, reason=reason, escalated=True)
+        self._log(escalated)
+        return escalated
+
+    def record(self, decision: RouteDecision, latency_seconds: float, success: bool = True):
+        """Record call latency and outcome for a routed request"""
+        metrics.observe("ai_model_latency_seconds", latency_seconds, model=decision.model, task=decision.task)
+        if not success:
+            metrics.incr("ai_model_failures_total", model=decision.model, task=decision.task)
+
+    def stats(self) -> Dict:
+        """Routing configuration, decision counts and per-model latency"""
+        snapshot = metrics.snapshot()
+        with self._lock:
+            recent = list(self._recent)
+        return {
+            "enabled": self.enabled,
+            "fast_model": self.fast_model,
+            "large_model": self.large_model,
+            "thresholds": {
+                "max_chars": self.max_chars,
+                "resume_max_dates": self.resume_max_dates,
+                "latency_budget_ms": self.latency_budget_ms,
+            },
+            "decisions": snapshot["counters"].get("ai_route_decisions_total", []),
+            "failures": snapshot["counters"].get("ai_model_failures_total", []),
+            "latency_seconds": snapshot["summaries"].get("ai_model_latency_seconds", []),
+            "preflight_plans": snapshot["counters"].get("ai_preflight_plans_total", []),
+            "context_limit_failures": snapshot["counters"].get("ai_context_limit_failures_total", []),
+            "recent_decisions": recent,
+        }
+
+    def _decide(self, task: str, model: str, reason: str, size: int) -> RouteDecision:
+        decision = RouteDecision(task=task, model=model, reason=reason, input_chars=size)
+        self._log(decision)
+        return decision
+
+    def _log(self, decision: RouteDecision):
+        metrics.incr(
+            "ai_route_decisions_total",
+            task=decision.task,
+            model=decision.model,
+            reason=decision.reason,
+        )
+        with self._lock:
+            self._recent.append({
+                "task": decision.task,
+                "model": decision.model,
+                "reason": decision.reason,
+                "input_chars": decision.input_chars,
+                "escalated": decision.escalated,
+            })
+        print(f"[AI_ROUTER] {decision.task} -> {decision.model} ({decision.reason}, {decision.input_chars} chars)")
@@ -3,7 +3,7 @@ Data Models for Creerlio Platform
 SQLAlchemy models for business profiles, talent profiles, and resume data
 """
 
-from sqlalchemy import Column, Integer, String, Float, Text, JSON, DateTime, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Float, Text, JSON, DateTime, Boolean, ForeignKey, UniqueConstraint, LargeBinary, Index, func
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -72,6 +72,12 @@ class BusinessProfile(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = Column(Boolean, default=True)
+    
+    # Index pack (see app/migrations.py) - partial on active rows, which is all listings read
+    __table_args__ = (
+        Index("ix_business_profiles_active_created", "created_at",
+              postgresql_where=(is_active == True), sqlite_where=(is_active == True)),
+    )
 
 
 class TalentProfile(Base):
@@ -115,6 +121,14 @@ class TalentProfile(Base):
     
     # Relationships
     resume = relationship("ResumeData", back_populates="talent_profiles")
+    
+    # Index pack (see app/migrations.py)
+    __table_args__ = (
+        Index("ix_talent_profiles_active_created", "created_at",
+              postgresql_where=(is_active == True), sqlite_where=(is_active == True)),
+        # Case-insensitive email lookups (bulk import duplicate check)
+        Index("ix_talent_profiles_email_lower", func.lower(email)),
+    )
 
 
 class ResumeData(Base):
@@ -176,6 +190,70 @@ class ResumeData(Base):
     talent_profiles = relationship("TalentProfile", back_populates="resume")
 
 
+class ResumeInsights(Base):
+    """
+    Cached AI insights for a parsed resume.
+
+    Rows are written by the post-parse pipeline stage and keyed on the resume id
+    plus a hash of the resume content, so re-running enhancement is skipped when
+    the resume has not changed.
+    """
+    __tablename__ = "resume_insights"
+
+    id = Column(Integer, primary_key=True, index=True)
+    resume_id = Column(Integer, ForeignKey("resume_data.id"), nullable=False, unique=True, index=True)
+    content_hash = Column(String(64), nullable=False)
+
+    status = Column(String(20), default="pending")  # "pending", "completed", "failed"
+    insights = Column(JSON)  # Output of AIService.enhance_resume_data
+    error = Column(Text, nullable=True)
+    model = Column(String(100), nullable=True)
+    attempts = Column(Integer, default=0)  # Consecutive failures for this content
+    retry_after = Column(DateTime, nullable=True)  # A failed row is not retried before this
+
+    # Timestamps
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    completed_at = Column(DateTime, nullable=True)
+
+
+class ResumeText(Base):
+    """
+    Full normalised text extracted from a resume file, stored compressed.
+
+    Keyed by the SHA-256 of the normalised text so identical uploads share one
+    row. ResumeData.raw_data["text_hash"] points here, which lets resumes be
+    re-parsed (new schema, new model) without the original files.
+    """
+    __tablename__ = "resume_texts"
+
+    content_hash = Column(String(64), primary_key=True)
+    compression = Column(String(10), nullable=False, default="zlib")
+    compressed_text = Column(LargeBinary, nullable=False)
+    original_length = Column(Integer)  # Characters before compression
+    compressed_length = Column(Integer)  # Bytes after compression
+    filename = Column(String(255))  # First filename seen for this text
+
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class ReparseCheckpoint(Base):
+    """Progress of a bulk re-parse job, so an interrupted run resumes where it stopped"""
+    __tablename__ = "reparse_checkpoints"
+
+    job_name = Column(String(100), primary_key=True)
+    status = Column(String(20), default="running")  # "running", "completed", "failed"
+    last_resume_id = Column(Integer, default=0)
+    total = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    skipped = Column(Integer, default=0)
+    parsing_model = Column(String(100), nullable=True)  # Models the router used, comma-separated
+
+    started_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class Job(Base):
     """Job posting model"""
     __tablename__ = "jobs"
@@ -232,6 +310,15 @@ class Job(Base):
     
     # Relationships
     business_profile = relationship("BusinessProfile", backref="jobs")
+    
+    # Index pack (see app/migrations.py): listing filters are status + is_active ordered by recency
+    __table_args__ = (
+        Index("ix_jobs_status_active_created", "status", "is_active", "created_at"),
+        Index("ix_jobs_active_status_created", "status", "created_at",
+              postgresql_where=(is_active == True), sqlite_where=(is_active == True)),
+        Index("ix_jobs_active_business_created", "business_profile_id", "created_at",
+              postgresql_where=(is_active == True), sqlite_where=(is_active == True)),
+    )
 
 
 class Application(Base):
@@ -263,9 +350,61 @@ class Application(Base):
     # Unique constraint: one application per job per talent
     __table_args__ = (
         UniqueConstraint('job_id', 'talent_profile_id', name='_job_talent_uc'),
+        # Index pack (see app/migrations.py): "my applications" and "applications for a job", newest first
+        Index("ix_applications_talent_created", "talent_profile_id", "created_at"),
+        Index("ix_applications_job_created", "job_id", "created_at"),
+    )
+
+
+class Skill(Base):
+    """Canonical skill - talent and job skill lists are indexed against these (see app/skills.py)"""
+    __tablename__ = "skills"
+    
+    id = Column(Integer, primary_key=True, index=True)
+    key = Column(String(100), unique=True, nullable=False, index=True)  # Case/alias folded, e.g. "nodejs"
+    name = Column(String(255), nullable=False)  # Display form, e.g. "Node.js"
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+class TalentSkill(Base):
+    """Talent profile -> skill index, rebuilt from TalentProfile.skills on every write"""
+    __tablename__ = "talent_skills"
+    
+    talent_profile_id = Column(Integer, ForeignKey("talent_profiles.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    
+    # Skill-first for "who has these skills" lookups
+    __table_args__ = (
+        Index("ix_talent_skills_skill_talent", "skill_id", "talent_profile_id"),
+    )
+
+
+class JobSkill(Base):
+    """Job -> skill index, rebuilt from Job.required_skills / preferred_skills on every write"""
+    __tablename__ = "job_skills"
+    
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    skill_id = Column(Integer, ForeignKey("skills.id", ondelete="CASCADE"), primary_key=True)
+    required = Column(Boolean, nullable=False, default=True)  # False for preferred skills
+    
+    __table_args__ = (
+        Index("ix_job_skills_skill_job", "skill_id", "job_id"),
     )
 
 
+class JobApplicationStat(Base):
+    """
+    Applications per job and status, maintained on every application write (see
+    app/application_stats.py) so dashboards never count the applications table
+    """
+    __tablename__ = "job_application_stats"
+    
+    job_id = Column(Integer, ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True)
+    status = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class TalentBankItem(Base):
     """
     Canonical Talent Bank item model.
@@ -0,0 +1,185 @@
+"""
+Keyset (Cursor) Pagination
+Stable newest-first ordering on (created_at, id) with opaque cursor tokens,
+so every page costs the same as the first. Relevance-ranked search results
+seek the same way on (rank..., created_at, id), with the last row's rank
+values carried in the token.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, or_, select, text
+
+# Upper bound for ?limit= on listing endpoints - larger values are clamped, not rejected
+MAX_PAGE_SIZE = 200
+LIMIT_DESCRIPTION = f"Page size (at most {MAX_PAGE_SIZE}; larger values are clamped)"
+
+
+def clamp_limit(limit: int) -> int:
+    """?limit= within 1..MAX_PAGE_SIZE"""
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def _encode(payload: dict) -> str:
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> dict:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque token for the position after (created_at, id)"""
+    return _encode({"c": created_at.isoformat(), "i": row_id})
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Inverse of encode_cursor; a malformed token is a 400"""
+    try:
+        payload = _decode(cursor)
+        return datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_ranked_cursor(ranks: Sequence[Any], created_at: datetime, row_id: int) -> str:
+    """Opaque token for the position after (ranks..., created_at, id) in a ranked listing"""
+    return _encode({"r": list(ranks), "c": created_at.isoformat(), "i": row_id})
+
+
+def decode_ranked_cursor(cursor: str, rank_count: int) -> Tuple[List[Any], datetime, int]:
+    """Inverse of encode_ranked_cursor; a malformed token, or one from another ordering, is a 400"""
+    try:
+        payload = _decode(cursor)
+        ranks = payload["r"]
+        if not isinstance(ranks, list) or len(ranks) != rank_count:
+            raise ValueError("rank count")
+        return ranks, datetime.fromisoformat(payload["c"]), int(payload["i"])
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _seek_after(columns: Sequence, values: Sequence):
+    """Rows after values when ordered by columns, every column descending"""
+    condition = columns[-1] < values[-1]
+    for column, value in zip(reversed(columns[:-1]), reversed(values[:-1])):
+        condition = or_(column < value, and_(column == value, condition))
+    return condition
+
+
+def paginate(stmt, model, cursor: Optional[str], limit: int, skip: int = 0):
+    """
+    Order stmt newest first on (created_at, id) and seek past the cursor.
+    Fetches limit + 1 rows so page_result can tell whether another page exists.
+    skip is only honoured without a cursor, for old clients.
+    """
+    # created_at is always set by the model default, so NULL ordering does not come into play
+    stmt = stmt.order_by(model.created_at.desc(), model.id.desc())
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        stmt = stmt.where(_seek_after([model.created_at, model.id], [created_at, row_id]))
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit + 1)
+
+
+def rank_labels(count: int) -> List[str]:
+    return [f"page_rank_{i}" for i in range(count)]
+
+
+def paginate_ranked(stmt, rank, model, cursor: Optional[str], limit: int, skip: int = 0):
+    """
+    Order stmt by relevance (rank descending, newest first on ties) and seek
+    past the cursor. rank may be a list of expressions, compared in order; each
+    is also selected (labelled by rank_labels) so page_result can build the
+    next cursor from the last row.
+    """
+    ranks = list(rank) if isinstance(rank, (list, tuple)) else [rank]
+    labels = rank_labels(len(ranks))
+    stmt = stmt.add_columns(*[r.label(label) for r, label in zip(ranks, labels)])
+    stmt = stmt.order_by(*[r.desc() for r in ranks], model.created_at.desc(), model.id.desc())
+    if cursor:
+        values, created_at, row_id = decode_ranked_cursor(cursor, len(ranks))
+        stmt = stmt.where(_seek_after(ranks + [model.created_at, model.id], values + [created_at, row_id]))
+    elif skip:
+        stmt = stmt.offset(skip)
+    return stmt.limit(limit + 1)
+
+
+def page_statement(stmt, model, cursor: Optional[str], limit: int, skip: int = 0, rank=None):
+    """
+    paginate or paginate_ranked depending on whether results are relevance-ranked.
+    Returns (statement, rank_count) - pass rank_count on to page_result.
+    """
+    if rank is None:
+        return paginate(stmt, model, cursor, limit, skip), 0
+    rank_count = len(rank) if isinstance(rank, (list, tuple)) else 1
+    return paginate_ranked(stmt, rank, model, cursor, limit, skip), rank_count
+
+
+def page_result(rows: Sequence, limit: int, rank_count: int = 0) -> Tuple[List, Optional[str]]:
+    """
+    Split the limit + 1 rows from paginate into (page, next_cursor).
+    Pass rank_count for rows from paginate_ranked.
+    """
+    rows = list(rows)
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    last = page[-1]
+    if rank_count:
+        ranks = [last._mapping[label] for label in rank_labels(rank_count)]
+        return page, encode_ranked_cursor(ranks, last.created_at, last.id)
+    return page, encode_cursor(last.created_at, last.id)
+
+
+def _count_statement(stmt):
+    return select(func.count()).select_from(stmt.order_by(None).limit(None).offset(None).subquery())
+
+
+def _explain_statement(db_dialect, stmt):
+    """EXPLAIN of the filtered query - the planner's row estimate avoids a full count on PostgreSQL"""
+    compiled = stmt.order_by(None).limit(None).offset(None).compile(
+        dialect=db_dialect, compile_kwargs={"literal_binds": True}
+    )
+    return text(f"EXPLAIN (FORMAT JSON) {compiled}")
+
+
+def _plan_rows(plan) -> Optional[int]:
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    try:
+        return int(plan[0]["Plan"]["Plan Rows"])
+    except (KeyError, IndexError, TypeError, ValueError):
+        return None
+
+
+def estimate_total(db, stmt) -> int:
+    """Estimated row count for an unpaginated statement (exact on SQLite)"""
+    if db.get_bind().dialect.name == "postgresql":
+        try:
+            rows = _plan_rows(db.execute(_explain_statement(db.get_bind().dialect, stmt)).scalar())
+            if rows is not None:
+                return rows
+        except Exception:
+            db.rollback()
+    return db.execute(_count_statement(stmt)).scalar() or 0
+
+
+async def aestimate_total(db, stmt) -> int:
+    """estimate_total for an AsyncSession"""
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql":
+        try:
+            rows = _plan_rows((await db.execute(_explain_statement(dialect, stmt))).scalar())
+            if rows is not None:
+                return rows
+        except Exception:
+            await db.rollback()
+    return (await db.execute(_count_statement(stmt))).scalar() or 0
@@ -0,0 +1,63 @@
+"""
+List Endpoint Projections
+Slim default field sets for list endpoints and ?fields= parsing. List queries
+select only the projected columns, so heavy Text/JSON columns are never loaded
+and no ORM objects are built for a page
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+from fastapi import HTTPException
+from sqlalchemy import inspect, select
+
+from app.models import BusinessProfile, Job, ResumeData, TalentProfile
+
+# Always selected: the keyset cursor is built from them
+REQUIRED_FIELDS = ["id", "created_at"]
+
+# Default list fields per table - summary columns only, no descriptions or JSON blobs
+LIST_FIELDS: Dict[str, List[str]] = {
+    Job.__tablename__: [
+        "business_profile_id", "title", "employment_type", "salary_min", "salary_max",
+        "salary_currency", "remote_allowed", "city", "state", "country", "location",
+        "experience_level", "status", "is_active", "application_deadline", "published_at", "updated_at",
+    ],
+    ResumeData.__tablename__: [
+        "name", "email", "original_filename", "file_type", "file_size", "updated_at",
+    ],
+    BusinessProfile.__tablename__: [
+        "name", "industry", "website", "city", "state", "country", "location",
+        "latitude", "longitude", "tags", "is_active", "updated_at",
+    ],
+    TalentProfile.__tablename__: [
+        "name", "title", "skills", "experience_years", "city", "state", "country", "location",
+        "portfolio_url", "is_active", "updated_at",
+    ],
+}
+
+FIELDS_DESCRIPTION = "Comma-separated fields to return, or 'all' (default: summary fields)"
+
+
+def list_fields(model, fields: Optional[str]) -> List[str]:
+    """Fields to return for ?fields= - the summary set by default, every column for 'all'"""
+    columns = [attr.key for attr in inspect(model).column_attrs]
+    if fields is None or not fields.strip():
+        requested = LIST_FIELDS[model.__tablename__]
+    elif fields.strip() in ("all", "*"):
+        requested = columns
+    else:
+        requested = [f.strip() for f in fields.split(",") if f.strip()]
+        unknown = [f for f in requested if f not in columns]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return list(dict.fromkeys(REQUIRED_FIELDS + requested))
+
+
+def select_fields(model, names: Sequence[str]):
+    """select() of just the named columns, labelled with their attribute names"""
+    return select(*[getattr(model, name).label(name) for name in names])
+
+
+def row_dicts(rows: Sequence, names: Sequence[str]) -> List[Dict]:
+    """Response dicts for projected rows"""
+    return [{name: row._mapping[name] for name in names} for row in rows]
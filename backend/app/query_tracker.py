@@ -0,0 +1,132 @@
+"""
+Per-Request SQL Instrumentation
+Engine events record every statement against the current request's tracker:
+query count, total DB time, the slowest statements, and statement shapes that
+repeat often enough to be a likely N+1. Slow statements are logged and
+everything feeds the metrics registry
+"""
+
+import os
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+
+from sqlalchemy import event
+
+from app.metrics import metrics
+
+# Statements slower than this are logged
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+# The same statement shape more often than this in one request is flagged as N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", "10"))
+# Add X-DB-* headers to every response (debug only - they describe server internals)
+SQL_DEBUG_HEADERS = os.getenv("SQL_DEBUG_HEADERS", "false").lower() == "true"
+# Slowest statements kept per request
+SLOWEST_KEPT = 5
+
+_PLACEHOLDER = r"(?:\?|%s|%\(\w+\)s|\$\d+|:\w+)"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement with whitespace collapsed and IN/VALUES placeholder lists folded, so repeats compare equal"""
+    return _PLACEHOLDER_LIST.sub("(?)", _WHITESPACE.sub(" ", statement).strip())
+
+
+class RequestQueries:
+    """SQL statements executed while handling one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.total_seconds = 0.0
+        self.shapes: Counter = Counter()
+        self.slowest: List[Tuple[float, str]] = []
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.total_seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+        if len(self.slowest) < SLOWEST_KEPT or seconds > self.slowest[-1][0]:
+            self.slowest.append((seconds, statement))
+            self.slowest.sort(key=lambda item: item[0], reverse=True)
+            del self.slowest[SLOWEST_KEPT:]
+
+    def n_plus_one(self, threshold: Optional[int] = None) -> List[Tuple[str, int]]:
+        """(shape, count) for shapes repeated more than threshold times, most repeated first"""
+        threshold = N_PLUS_ONE_THRESHOLD if threshold is None else threshold
+        return [(shape, count) for shape, count in self.shapes.most_common() if count > threshold]
+
+    def headers(self) -> dict:
+        headers = {
+            "X-DB-Query-Count": str(self.count),
+            "X-DB-Time-Ms": f"{self.total_seconds * 1000:.1f}",
+        }
+        suspects = self.n_plus_one()
+        if suspects:
+            headers["X-DB-N-Plus-One"] = "; ".join(f"{count}x {shape[:120]}" for shape, count in suspects[:3])
+        return headers
+
+
+_current: ContextVar[Optional[RequestQueries]] = ContextVar("request_queries", default=None)
+
+
+def start_request() -> Tuple[RequestQueries, object]:
+    """Begin tracking for the current context; pass the token to end_request"""
+    tracker = RequestQueries()
+    return tracker, _current.set(tracker)
+
+
+def end_request(token):
+    _current.reset(token)
+
+
+def current_queries() -> Optional[RequestQueries]:
+    return _current.get()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get("query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    metrics.observe("db_query_seconds", elapsed)
+    tracker = _current.get()
+    if tracker is not None:
+        tracker.record(statement, elapsed)
+    if elapsed * 1000 >= SLOW_QUERY_MS:
+        metrics.incr("db_slow_queries_total")
+        print(f"Slow query ({elapsed * 1000:.0f} ms): {_WHITESPACE.sub(' ', statement)[:1000]}")
+
+
+def _handle_error(exception_context):
+    # A failed statement never reaches after_cursor_execute
+    starts = exception_context.connection.info.get("query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+
+
+def instrument_engine(engine):
+    """Attach the timing hooks to a sync engine or an AsyncEngine; returns the engine"""
+    target = getattr(engine, "sync_engine", engine)
+    event.listen(target, "before_cursor_execute", _before_cursor_execute)
+    event.listen(target, "after_cursor_execute", _after_cursor_execute)
+    event.listen(target, "handle_error", _handle_error)
+    return engine
+
+
+def finish_request(tracker: RequestQueries, route: str):
+    """Per-request metrics and the N+1 warning"""
+    if not tracker.count:
+        return
+    metrics.observe("db_queries_per_request", tracker.count, route=route)
+    metrics.observe("db_time_per_request_seconds", tracker.total_seconds, route=route)
+    for shape, count in tracker.n_plus_one():
+        metrics.incr("db_n_plus_one_total", route=route)
+        print(f"Possible N+1 in {route}: {count}x {shape[:300]}")
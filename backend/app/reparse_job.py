@@ -0,0 +1,191 @@
+"""
+Bulk Resume Re-parse Job
+Streams stored resume texts through AIService with bounded concurrency,
+checkpointing progress so interrupted runs resume where they stopped
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from app.metrics import metrics
+from app.models import ResumeData, ReparseCheckpoint
+from app.resume_text_store import load_resume_text
+
+# ResumeData columns refreshed from a new parse
+REPARSED_FIELDS = [
+    "name", "email", "phone", "address", "linkedin", "github", "website",
+    "summary", "objective", "experience", "education", "skills",
+    "certifications", "projects", "languages", "awards",
+]
+
+
+def _print_progress(checkpoint: Dict):
+    print(
+        f"[REPARSE] {checkpoint['job_name']}: {checkpoint['processed']}/{checkpoint['total']} processed, "
+        f"{checkpoint['failed']} failed, {checkpoint['skipped']} skipped "
+        f"(last resume id {checkpoint['last_resume_id']})"
+    )
+
+
+def _add_model(models: Optional[str], model: Optional[str]) -> Optional[str]:
+    """Comma-separated models the router actually used for this job, in first-use order"""
+    names = [name for name in (models or "").split(",") if name]
+    if model and model not in names:
+        names.append(model)
+    return ",".join(names)[:100] or None
+
+
+def _checkpoint_dict(checkpoint: ReparseCheckpoint) -> Dict:
+    return {
+        "job_name": checkpoint.job_name,
+        "status": checkpoint.status,
+        "last_resume_id": checkpoint.last_resume_id,
+        "total": checkpoint.total,
+        "processed": checkpoint.processed,
+        "failed": checkpoint.failed,
+        "skipped": checkpoint.skipped,
+        "parsing_model": checkpoint.parsing_model,
+        "started_at": checkpoint.started_at.isoformat() if checkpoint.started_at else None,
+        "updated_at": checkpoint.updated_at.isoformat() if checkpoint.updated_at else None,
+    }
+
+
+def get_checkpoint(db, job_name: str) -> Optional[Dict]:
+    checkpoint = db.query(ReparseCheckpoint).filter(ReparseCheckpoint.job_name == job_name).first()
+    return _checkpoint_dict(checkpoint) if checkpoint else None
+
+
+async def run_reparse_job(
+    ai_service,
+    session_factory,
+    job_name: str = "resume_reparse",
+    concurrency: int = 4,
+    batch_size: int = 50,
+    restart: bool = False,
+    max_resumes: Optional[int] = None,
+    progress: Callable[[Dict], None] = _print_progress,
+) -> Dict:
+    """
+    Re-parse every resume that has stored text.
+
+    Resumes are read in id order, batch_size at a time. Each batch is parsed
+    with at most `concurrency` OpenAI calls in flight (identical texts in a
+    batch are parsed once), written back in a single transaction, and then the checkpoint
+    advances past the batch. Re-running with the same job_name continues after
+    the last completed batch; restart=True starts over.
+
+    Returns:
+        Final checkpoint as a dict
+    """
+    if not ai_service or not session_factory:
+        raise RuntimeError("Re-parse job needs AIService and a configured database")
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    db = session_factory()
+    try:
+        checkpoint = db.query(ReparseCheckpoint).filter(ReparseCheckpoint.job_name == job_name).first()
+        if checkpoint is None or restart:
+            if checkpoint is None:
+                checkpoint = ReparseCheckpoint(job_name=job_name)
+                db.add(checkpoint)
+            checkpoint.last_resume_id = 0
+            checkpoint.processed = 0
+            checkpoint.failed = 0
+            checkpoint.skipped = 0
+            checkpoint.started_at = datetime.utcnow()
+            checkpoint.parsing_model = None
+        checkpoint.status = "running"
+        checkpoint.total = db.query(ResumeData.id).count()
+        db.commit()
+
+        # Parse results by text hash for the current batch - cleared once it is written
+        parsed: Dict[str, tuple] = {}
+        handled = 0
+        while max_resumes is None or handled < max_resumes:
+            limit = batch_size if max_resumes is None else min(batch_size, max_resumes - handled)
+            batch = (
+                db.query(ResumeData)
+                .filter(ResumeData.id > checkpoint.last_resume_id)
+                .order_by(ResumeData.id)
+                .limit(limit)
+                .all()
+            )
+            if not batch:
+                break
+
+            # One parse per distinct text in the batch
+            texts: Dict[str, str] = {}
+            for resume in batch:
+                content_hash = (resume.raw_data or {}).get("text_hash")
+                if content_hash and content_hash not in texts:
+                    text = load_resume_text(db, content_hash)
+                    if text:
+                        texts[content_hash] = text
+
+            async def parse(content_hash: str, text: str, filename: str):
+                async with semaphore:
+                    started = time.perf_counter()
+                    try:
+                        # The OpenAI client is blocking - run each parse in a worker thread
+                        result = await asyncio.to_thread(asyncio.run, ai_service.parse_text(text, filename))
+                        metrics.observe("reparse_seconds", time.perf_counter() - started)
+                        return content_hash, result, None
+                    except Exception as e:
+                        return content_hash, None, str(e)
+
+            filenames = {}
+            for resume in batch:
+                content_hash = (resume.raw_data or {}).get("text_hash")
+                if content_hash in texts and content_hash not in filenames:
+                    filenames[content_hash] = resume.original_filename or "resume"
+            results = await asyncio.gather(*(
+                parse(content_hash, text, filenames[content_hash]) for content_hash, text in texts.items()
+            ))
+            parsed.update({content_hash: (result, error) for content_hash, result, error in results})
+
+            for resume in batch:
+                content_hash = (resume.raw_data or {}).get("text_hash")
+                if content_hash not in parsed:
+                    checkpoint.skipped += 1
+                    continue
+                result, error = parsed[content_hash]
+                if error:
+                    checkpoint.failed += 1
+                    print(f"[REPARSE] Resume {resume.id} failed: {error}")
+                    continue
+                for field in REPARSED_FIELDS:
+                    if field in result:
+                        setattr(resume, field, result[field])
+                raw_data = dict(result.get("raw_data") or {})
+                raw_data["reparsed_at"] = datetime.utcnow().isoformat()
+                resume.raw_data = raw_data
+                checkpoint.processed += 1
+                checkpoint.parsing_model = _add_model(checkpoint.parsing_model, raw_data.get("parsing_model"))
+
+            checkpoint.last_resume_id = batch[-1].id
+            db.commit()
+            handled += len(batch)
+            parsed.clear()
+
+            state = _checkpoint_dict(checkpoint)
+            metrics.set_gauge("reparse_processed", state["processed"], job=job_name)
+            metrics.set_gauge("reparse_failed", state["failed"], job=job_name)
+            progress(state)
+
+        if max_resumes is None or handled < max_resumes:
+            checkpoint.status = "completed"
+        db.commit()
+        state = _checkpoint_dict(checkpoint)
+        progress(state)
+        return state
+    except Exception:
+        db.rollback()
+        checkpoint_row = db.query(ReparseCheckpoint).filter(ReparseCheckpoint.job_name == job_name).first()
+        if checkpoint_row:
+            checkpoint_row.status = "failed"
+            db.commit()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,151 @@
+"""
+Conditional GET and Response Caching
+Rendered JSON bodies are cached per normalised query with a strong ETag
+(a hash of the body) and a Last-Modified time. A repeat request is answered
+from memory, and a client that already has the body gets 304 Not Modified.
+Last-Modified is when this worker first rendered a body with that ETag, so it
+moves forward whenever the content changes - including when rows drop out of
+the result, which no column timestamp would show.
+Caches are cleared, in every worker, when a commit touches the rows they
+were built from
+"""
+
+import hashlib
+import os
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Hashable, NamedTuple, Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.cache import Cache, TTLCache
+from app.metrics import metrics
+from app.models import Job
+
+PUBLIC_JOBS_CACHE_TTL_SECONDS = float(os.getenv("PUBLIC_JOBS_CACHE_TTL_SECONDS", "60"))
+PUBLIC_JOBS_CACHE_SIZE = int(os.getenv("PUBLIC_JOBS_CACHE_SIZE", "512"))
+
+# How long an ETag's first-rendered time is remembered for reuse as Last-Modified
+FIRST_SEEN_TTL_SECONDS = 24 * 3600
+
+# Clients and proxies may store the body but must revalidate before reusing it
+CACHE_CONTROL = "public, no-cache"
+
+
+class CachedBody(NamedTuple):
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": CACHE_CONTROL}
+        if self.last_modified:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+
+def _http_time(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC column value as an aware datetime at HTTP-date (whole second) precision"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).replace(microsecond=0)
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in (tag[2:] if tag.startswith("W/") else tag for tag in candidates)
+
+
+def is_not_modified(request: Request, entry: CachedBody) -> bool:
+    """Whether the client's copy is current; If-None-Match takes precedence over If-Modified-Since"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        return _etag_matches(if_none_match, entry.etag)
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and entry.last_modified:
+        try:
+            return entry.last_modified <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+class ResponseCache:
+    """
+    Rendered response bodies keyed by normalised query. Pass store() the
+    generation read before querying, so a fill that raced an invalidation
+    does not store a stale body.
+    """
+
+    def __init__(self, name: str, maxsize: int, ttl: float):
+        self.name = name
+        self.entries = Cache(name, maxsize=maxsize, ttl=ttl, value_type=CachedBody)
+        # ETag -> Last-Modified, so re-rendering unchanged content keeps its date
+        self.first_seen = TTLCache(maxsize=maxsize * 4, ttl=FIRST_SEEN_TTL_SECONDS)
+
+    @property
+    def generation(self) -> int:
+        return self.entries.generation
+
+    def get(self, key: Hashable) -> Optional[CachedBody]:
+        return self.entries.get(key)
+
+    def store(self, key: Hashable, content, generation: int) -> CachedBody:
+        body = JSONResponse(content=jsonable_encoder(content)).body
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        last_modified = self.first_seen.get(etag)
+        if last_modified is None:
+            last_modified = _http_time(datetime.now(timezone.utc))
+            self.first_seen.set(etag, last_modified)
+        entry = CachedBody(body, etag, last_modified)
+        self.entries.set(key, entry, generation=generation)
+        return entry
+
+    def respond(self, request: Request, entry: CachedBody) -> Response:
+        if is_not_modified(request, entry):
+            metrics.incr("http_not_modified_total", cache=self.name)
+            return Response(status_code=304, headers=entry.headers())
+        return Response(content=entry.body, media_type="application/json", headers=entry.headers())
+
+    def invalidate(self):
+        self.entries.clear()
+
+
+public_jobs_cache = ResponseCache(
+    "public_jobs", maxsize=PUBLIC_JOBS_CACHE_SIZE, ttl=PUBLIC_JOBS_CACHE_TTL_SECONDS
+)
+
+
+def public_jobs_key(
+    location: Optional[str], keyword: Optional[str], cursor: Optional[str],
+    skip: int, limit: int, include_total: bool, names,
+) -> tuple:
+    """Cache key for /api/jobs/public - matching is case-insensitive, so the text filters are folded"""
+    def fold(value: Optional[str]) -> Optional[str]:
+        value = " ".join((value or "").split()).lower()
+        return value or None
+    return fold(location), fold(keyword), cursor or None, 0 if cursor else skip, limit, include_total, tuple(names)
+
+
+@event.listens_for(Session, "after_flush")
+def _note_job_writes(session, flush_context):
+    if any(isinstance(obj, Job) for obj in list(session.new) + list(session.dirty) + list(session.deleted)):
+        session.info["public_jobs_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_public_jobs(session):
+    if session.info.pop("public_jobs_changed", False):
+        public_jobs_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_job_writes(session):
+    session.info.pop("public_jobs_changed", None)
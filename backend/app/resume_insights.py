@@ -0,0 +1,208 @@
+"""
+Resume Insights Pipeline
+Post-parse stage that precomputes AI insights for stored resumes
+Results are cached in resume_insights keyed on resume id and content hash
+"""
+
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy import and_, case, inspect, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models import ResumeData, ResumeInsights
+
+# Resume columns sent to the model - file metadata and raw_data are left out
+# because they do not change the insights and only inflate the prompt
+INSIGHT_FIELDS = [
+    "name",
+    "summary",
+    "objective",
+    "experience",
+    "education",
+    "skills",
+    "certifications",
+    "projects",
+    "languages",
+    "awards",
+]
+
+# A pending row older than this is assumed to belong to a crashed worker
+PENDING_TIMEOUT_SECONDS = 300
+
+# A failed row is retried after 1, 2, 4 ... minutes, at most once per hour
+RETRY_BASE_SECONDS = 60
+RETRY_MAX_SECONDS = 3600
+
+
+def resume_payload(resume: ResumeData) -> Dict:
+    """Build the compact dict passed to AIService.enhance_resume_data"""
+    payload = {}
+    for field in INSIGHT_FIELDS:
+        value = getattr(resume, field, None)
+        if value not in (None, "", [], {}):
+            payload[field] = value
+    return payload
+
+
+def compute_content_hash(payload: Dict) -> str:
+    """Stable SHA-256 of the resume payload (key order independent)"""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def get_cached_insights(db: Session, resume: ResumeData) -> Optional[ResumeInsights]:
+    """Return the insights row for a resume if it matches the current content"""
+    row = db.query(ResumeInsights).filter(ResumeInsights.resume_id == resume.id).first()
+    if not row:
+        return None
+    if row.content_hash != compute_content_hash(resume_payload(resume)):
+        return None
+    return row
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff after the given number of consecutive failures"""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0), RETRY_MAX_SECONDS))
+
+
+def needs_generation(row: Optional[ResumeInsights], content_hash: str, now: Optional[datetime] = None) -> bool:
+    """
+    Whether a generation task should run for this row: there is none yet, the
+    content changed, a pending task was abandoned, or a failure's backoff is over
+    """
+    if row is None or row.content_hash != content_hash:
+        return True
+    now = now or datetime.utcnow()
+    if row.status == "completed":
+        return False
+    if row.status == "pending":
+        return not row.updated_at or (now - row.updated_at).total_seconds() >= PENDING_TIMEOUT_SECONDS
+    return not row.retry_after or row.retry_after <= now
+
+
+def _claimable(content_hash: str, now: datetime):
+    """needs_generation as a WHERE clause, so claiming a row is one atomic UPDATE"""
+    return or_(
+        ResumeInsights.content_hash != content_hash,
+        and_(
+            ResumeInsights.status == "pending",
+            or_(
+                ResumeInsights.updated_at.is_(None),
+                ResumeInsights.updated_at <= now - timedelta(seconds=PENDING_TIMEOUT_SECONDS),
+            ),
+        ),
+        and_(
+            ResumeInsights.status.notin_(("completed", "pending")),
+            or_(ResumeInsights.retry_after.is_(None), ResumeInsights.retry_after <= now),
+        ),
+    )
+
+
+def _claim(db: Session, row: Optional[ResumeInsights], resume_id: int, content_hash: str) -> Optional[ResumeInsights]:
+    """
+    Mark the insights row pending for this worker. The existing row is taken with
+    a conditional UPDATE, so of two workers that both saw it claimable only one
+    wins; a new row relies on the unique resume_id. None if another worker has it.
+    """
+    if row is None:
+        row = ResumeInsights(resume_id=resume_id, content_hash=content_hash, status="pending")
+        db.add(row)
+        try:
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            return None
+        return row
+
+    now = datetime.utcnow()
+    claimed = db.execute(
+        update(ResumeInsights)
+        .where(ResumeInsights.id == row.id, _claimable(content_hash, now))
+        .values(
+            content_hash=content_hash,
+            status="pending",
+            error=None,
+            # A changed resume starts its failure count again
+            attempts=case((ResumeInsights.content_hash == content_hash, ResumeInsights.attempts), else_=0),
+            updated_at=now,
+        )
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    db.commit()
+    if not claimed:
+        return None
+    db.refresh(row)
+    return row
+
+
+def install_insights_retry(connection):
+    """Add the retry columns to an existing resume_insights table (migration 6)"""
+    existing = {column["name"] for column in inspect(connection).get_columns("resume_insights")}
+    if "attempts" not in existing:
+        connection.exec_driver_sql("ALTER TABLE resume_insights ADD COLUMN attempts INTEGER DEFAULT 0")
+    if "retry_after" not in existing:
+        column_type = "TIMESTAMP" if connection.dialect.name == "postgresql" else "DATETIME"
+        connection.exec_driver_sql(f"ALTER TABLE resume_insights ADD COLUMN retry_after {column_type}")
+
+
+def generate_resume_insights(resume_id: int, ai_service, session_factory) -> None:
+    """
+    Compute and store insights for a resume.
+
+    Runs as a FastAPI background task. It is a plain function so Starlette
+    executes it in the threadpool - the OpenAI client call is blocking and must
+    not run on the event loop.
+    """
+    if not ai_service or not session_factory:
+        return
+
+    db = session_factory()
+    try:
+        resume = db.query(ResumeData).filter(ResumeData.id == resume_id).first()
+        if not resume:
+            print(f"[RESUME_INSIGHTS] Resume {resume_id} not found, skipping")
+            return
+
+        payload = resume_payload(resume)
+        content_hash = compute_content_hash(payload)
+
+        row = db.query(ResumeInsights).filter(ResumeInsights.resume_id == resume_id).first()
+        # Already computed, in progress elsewhere, or failed and still backing off
+        if not needs_generation(row, content_hash):
+            return
+
+        row = _claim(db, row, resume_id, content_hash)
+        if row is None:
+            # Another worker claimed it first - let it do the work
+            return
+
+        print(f"[RESUME_INSIGHTS] Generating insights for resume {resume_id}")
+        try:
+            insights, decision = asyncio.run(ai_service.enhance_resume_data_routed(payload))
+        except Exception as e:
+            row.status = "failed"
+            row.error = str(e)
+            row.attempts = (row.attempts or 0) + 1
+            row.retry_after = datetime.utcnow() + retry_delay(row.attempts)
+            db.commit()
+            print(f"[RESUME_INSIGHTS] Failed for resume {resume_id} (attempt {row.attempts}), retry after {row.retry_after}: {e}")
+            return
+
+        row.insights = insights
+        row.model = decision.model
+        row.status = "completed"
+        row.attempts = 0
+        row.retry_after = None
+        row.completed_at = datetime.utcnow()
+        db.commit()
+        print(f"[RESUME_INSIGHTS] Stored insights for resume {resume_id}")
+    except Exception as e:
+        db.rollback()
+        print(f"[RESUME_INSIGHTS] Error processing resume {resume_id}: {e}")
+    finally:
+        db.close()
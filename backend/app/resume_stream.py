@@ -0,0 +1,125 @@
+"""
+Progressive Resume Parsing Helpers
+Server-sent event encoding, regex contact detection on extracted pages, and an
+incremental scanner that pulls experience entries out of a streamed JSON response
+"""
+
+import json
+import re
+from typing import Dict, List, Optional
+
+_EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+_PHONE_PATTERN = re.compile(r"(?<!\w)\+?\(?\d[\d\s().-]{7,}\d(?!\w)")
+_LINKEDIN_PATTERN = re.compile(r"(?:https?://)?(?:[a-z]{2,3}\.)?linkedin\.com/[^\s,;)]+", re.IGNORECASE)
+_GITHUB_PATTERN = re.compile(r"(?:https?://)?(?:www\.)?github\.com/[^\s,;)]+", re.IGNORECASE)
+_WEBSITE_PATTERN = re.compile(r"https?://[^\s,;)]+", re.IGNORECASE)
+
+
+def sse_event(event: str, data: Dict) -> str:
+    """Encode one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+def find_contact_fields(text: str) -> Dict[str, str]:
+    """
+    Find contact details with regexes - available as soon as the first page is
+    extracted, long before the model answers.
+    """
+    fields: Dict[str, str] = {}
+    email = _EMAIL_PATTERN.search(text)
+    if email:
+        fields["email"] = email.group(0)
+    for match in _PHONE_PATTERN.finditer(text):
+        candidate = match.group(0).strip()
+        digits = re.sub(r"\D", "", candidate)
+        # Skip date ranges such as "2019 - 2021" that look like digit runs
+        if 8 <= len(digits) <= 15 and not re.fullmatch(r"(?:19|20)\d{2}\s*[-–]\s*(?:19|20)\d{2}", candidate):
+            fields["phone"] = candidate
+            break
+    linkedin = _LINKEDIN_PATTERN.search(text)
+    if linkedin:
+        fields["linkedin"] = linkedin.group(0)
+    github = _GITHUB_PATTERN.search(text)
+    if github:
+        fields["github"] = github.group(0)
+    for match in _WEBSITE_PATTERN.finditer(text):
+        url = match.group(0)
+        if "linkedin.com" not in url.lower() and "github.com" not in url.lower():
+            fields["website"] = url
+            break
+    return fields
+
+
+class ExperienceStreamScanner:
+    """
+    Incrementally scans a streamed JSON object and returns each element of its
+    top-level array under `key` as soon as the element's closing brace arrives.
+    """
+
+    def __init__(self, key: str = "experience"):
+        self.key = key
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._pending_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return self._buffer
+
+    def feed(self, delta: str) -> List[Dict]:
+        """Add streamed content and return the entries completed by it"""
+        completed: List[Dict] = []
+        self._buffer += delta
+        buffer = self._buffer
+        for i in range(self._pos, len(buffer)):
+            ch = buffer[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = buffer[self._string_start:i + 1]
+                continue
+            if ch == '"':
+                self._in_string = True
+                self._string_start = i
+            elif ch == ":":
+                # Keys of the root object sit at depth 1
+                if self._depth == 1 and self._last_string:
+                    try:
+                        self._pending_key = json.loads(self._last_string)
+                    except json.JSONDecodeError:
+                        self._pending_key = None
+            elif ch == ",":
+                self._pending_key = None
+            elif ch in "{[":
+                if ch == "[" and self._depth == 1 and self._pending_key == self.key:
+                    self._array_depth = self._depth + 1
+                elif ch == "{" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._item_start = i
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if ch == "}" and self._item_start is not None and self._depth == self._array_depth:
+                    try:
+                        entry = json.loads(buffer[self._item_start:i + 1])
+                        if isinstance(entry, dict):
+                            completed.append(entry)
+                    except json.JSONDecodeError:
+                        pass
+                    self._item_start = None
+                elif ch == "]" and self._array_depth is not None and self._depth == self._array_depth - 1:
+                    self._array_depth = None
+                    self._pending_key = None
+        self._pos = len(buffer)
+        return completed
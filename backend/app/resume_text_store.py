@@ -0,0 +1,112 @@
+"""
+Resume Text Store
+Normalises extracted resume text and persists it zlib-compressed, keyed by content hash
+"""
+
+import hashlib
+import re
+import unicodedata
+import zlib
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models import ResumeText
+
+# zlib level 6 is the usual speed/ratio sweet spot; resume text compresses ~3-4x
+COMPRESSION_LEVEL = 6
+
+_TRAILING_SPACE = re.compile(r"[ \t]+\n")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonical form of extracted text.
+    NFC unicode, Unix newlines, no trailing spaces and at most one blank line in a row,
+    so the same resume uploaded twice hashes the same.
+    """
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFC", text)
+    text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\x00", "")
+    text = _TRAILING_SPACE.sub("\n", text)
+    text = _BLANK_LINES.sub("\n\n", text)
+    return text.strip()
+
+
+def text_hash(text: str) -> str:
+    """SHA-256 of normalised text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def compress_text(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), COMPRESSION_LEVEL)
+
+
+def decompress_text(data: bytes, compression: str = "zlib") -> str:
+    if compression != "zlib":
+        raise ValueError(f"Unsupported resume text compression: {compression}")
+    return zlib.decompress(data).decode("utf-8")
+
+
+def _insert_ignore(db: Session, table):
+    """INSERT that skips rows already present - two uploads of the same resume may race"""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing()
+
+
+def store_resume_text(db: Session, text: str, filename: Optional[str] = None) -> str:
+    """
+    Persist normalised text if not already stored and return its hash.
+    Does not commit - the caller commits together with the ResumeData row.
+    """
+    normalized = normalize_text(text)
+    content_hash = text_hash(normalized)
+    exists = db.query(ResumeText.content_hash).filter(ResumeText.content_hash == content_hash).first()
+    if not exists:
+        compressed = compress_text(normalized)
+        db.execute(_insert_ignore(db, ResumeText.__table__).values(
+            content_hash=content_hash,
+            compression="zlib",
+            compressed_text=compressed,
+            original_length=len(normalized),
+            compressed_length=len(compressed),
+            filename=filename,
+        ))
+    return content_hash
+
+
+def save_resume_text(session_factory, text: str, filename: Optional[str] = None) -> Optional[str]:
+    """
+    Store text in its own transaction, for parse paths that keep no ResumeData row.
+    Blocking; returns the hash, or None if the text could not be stored.
+    """
+    if not session_factory or not text:
+        return None
+    db = session_factory()
+    try:
+        content_hash = store_resume_text(db, text, filename)
+        db.commit()
+        return content_hash
+    except Exception as e:
+        db.rollback()
+        print(f"[RESUME_TEXT] Could not store text for {filename}: {e}")
+        return None
+    finally:
+        db.close()
+
+
+def load_resume_text(db: Session, content_hash: str) -> Optional[str]:
+    """Return the stored text for a hash, or None if it was never stored"""
+    row = db.query(ResumeText).filter(ResumeText.content_hash == content_hash).first()
+    if not row:
+        return None
+    return decompress_text(row.compressed_text, row.compression)
@@ -0,0 +1,147 @@
+"""
+Full-Text Search
+PostgreSQL tsvector columns with GIN indexes (kept in sync by triggers) or
+SQLite FTS5 shadow tables, with relevance-ranked query helpers
+"""
+
+import os
+import re
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, literal_column, table, column
+
+from app.models import BusinessProfile, Job, TalentProfile
+
+# Text search configuration used by both the index and the queries (PostgreSQL)
+SEARCH_TEXT_CONFIG = os.getenv("SEARCH_TEXT_CONFIG", "english")
+# Set to false to fall back to ILIKE matching
+SEARCH_FULLTEXT = os.getenv("SEARCH_FULLTEXT", "true").lower() == "true"
+
+# Indexed columns per table, in weight order: the first column is weight A
+# (title/name), the rest weight B
+SEARCH_FIELDS: Dict[str, List[str]] = {
+    "jobs": ["title", "description", "requirements"],
+    "business_profiles": ["name", "description", "industry"],
+    "talent_profiles": ["name", "title", "bio"],
+}
+
+SEARCH_MODELS = {"jobs": Job, "business_profiles": BusinessProfile, "talent_profiles": TalentProfile}
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+# PostgreSQL's english configuration removes these from a tsquery, so a term made
+# only of them would compile to an empty query that matches nothing. They are
+# dropped up front (on SQLite too, so both databases return the same rows) and a
+# term left with no words is searched with ILIKE instead.
+ENGLISH_STOPWORDS = frozenset("""
+    i me my myself we our ours ourselves you your yours yourself yourselves he him his
+    himself she her hers herself it its itself they them their theirs themselves what
+    which who whom this that these those am is are was were be been being have has had
+    having do does did doing a an the and but if or because as until while of at by for
+    with about against between into through during before after above below to from up
+    down in out on off over under again further then once here there when where why how
+    all any both each few more most other some such no nor not only own same so than too
+    very s t can will just don should now
+""".split())
+
+
+def search_tokens(term: Optional[str]) -> List[str]:
+    """Words of a user search term - punctuation, query operators and stopwords are dropped"""
+    stopwords = ENGLISH_STOPWORDS if SEARCH_TEXT_CONFIG == "english" else frozenset()
+    return [token for token in _TOKEN.findall(term or "") if token.lower() not in stopwords][:16]
+
+
+# ==================== Schema (applied by app/migrations.py) ====================
+
+def _pg_vector_expression(table_name: str, prefix: str) -> str:
+    parts = []
+    for i, field in enumerate(SEARCH_FIELDS[table_name]):
+        weight = "A" if i == 0 else "B"
+        parts.append(f"setweight(to_tsvector('{SEARCH_TEXT_CONFIG}', coalesce({prefix}{field}, '')), '{weight}')")
+    return " || ".join(parts)
+
+
+def _install_postgres(connection, table_name: str):
+    fields = SEARCH_FIELDS[table_name]
+    statements = [
+        f"ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS search_vector tsvector",
+        f"""CREATE OR REPLACE FUNCTION {table_name}_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector := {_pg_vector_expression(table_name, "NEW.")};
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql""",
+        f"DROP TRIGGER IF EXISTS {table_name}_search_vector_trigger ON {table_name}",
+        f"""CREATE TRIGGER {table_name}_search_vector_trigger
+BEFORE INSERT OR UPDATE OF {", ".join(fields)} ON {table_name}
+FOR EACH ROW EXECUTE FUNCTION {table_name}_search_vector_update()""",
+        f"UPDATE {table_name} SET search_vector = {_pg_vector_expression(table_name, '')} WHERE search_vector IS NULL",
+        f"CREATE INDEX IF NOT EXISTS ix_{table_name}_search_vector ON {table_name} USING GIN (search_vector)",
+    ]
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def _install_sqlite(connection, table_name: str):
+    fields = SEARCH_FIELDS[table_name]
+    fts = f"{table_name}_fts"
+    columns = ", ".join(fields)
+    new_values = ", ".join(f"new.{f}" for f in fields)
+    old_values = ", ".join(f"old.{f}" for f in fields)
+    statements = [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {columns}, content='{table_name}', content_rowid='id', tokenize='porter unicode61'
+        )""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN
+            INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+        END""",
+        f"""CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {columns} ON {table_name} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.id, {old_values});
+            INSERT INTO {fts}(rowid, {columns}) VALUES (new.id, {new_values});
+        END""",
+        f"INSERT INTO {fts}({fts}) VALUES ('rebuild')",
+    ]
+    for statement in statements:
+        connection.exec_driver_sql(statement)
+
+
+def install_fulltext(connection):
+    """Create search columns/tables, sync triggers and indexes, and backfill existing rows"""
+    dialect = connection.dialect.name
+    for table_name in SEARCH_FIELDS:
+        if dialect == "postgresql":
+            _install_postgres(connection, table_name)
+        elif dialect == "sqlite":
+            _install_sqlite(connection, table_name)
+
+
+# ==================== Queries ====================
+
+def fulltext_supported(dialect_name: str) -> bool:
+    return SEARCH_FULLTEXT and dialect_name in ("postgresql", "sqlite")
+
+
+def apply_fulltext(stmt, model, term: str, dialect_name: str) -> Tuple[object, object]:
+    """
+    Restrict stmt to rows matching term and return (stmt, rank), where ordering
+    by rank descending puts the most relevant rows first. Words are prefix-matched
+    and all must appear.
+    """
+    tokens = search_tokens(term)
+    table_name = model.__tablename__
+    if not tokens:
+        return stmt, literal_column("0")
+    if dialect_name == "postgresql":
+        query = func.to_tsquery(SEARCH_TEXT_CONFIG, " & ".join(f"{t}:*" for t in tokens))
+        vector = literal_column(f"{table_name}.search_vector")
+        return stmt.where(vector.op("@@")(query)), func.ts_rank_cd(vector, query)
+    # SQLite FTS5: join the shadow table; bm25 is lower-is-better, so negate it
+    fts_name = f"{table_name}_fts"
+    fts = table(fts_name, column("rowid"))
+    match = " ".join(f'"{t}"*' for t in tokens)
+    weights = ", ".join(["10.0"] + ["1.0"] * (len(SEARCH_FIELDS[table_name]) - 1))
+    stmt = stmt.join(fts, fts.c.rowid == model.id).where(literal_column(fts_name).op("MATCH")(match))
+    return stmt, -literal_column(f"bm25({fts_name}, {weights})")
@@ -0,0 +1,270 @@
+"""
+Normalised Skills Index
+Folds free-text skills to canonical skills (case and aliases) and keeps the
+talent_skills / job_skills association tables in sync with the JSON skill
+lists on every ORM flush, so skill search is an indexed lookup
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import case, delete, event, func, insert, inspect, select
+from sqlalchemy.orm import Session
+
+from app.models import Job, JobSkill, Skill, TalentProfile, TalentSkill
+
+# Alias -> canonical display name. Keys are in folded form (see _fold)
+SKILL_ALIASES: Dict[str, str] = {
+    "js": "JavaScript",
+    "javascript": "JavaScript",
+    "ecmascript": "JavaScript",
+    "ts": "TypeScript",
+    "typescript": "TypeScript",
+    "node": "Node.js",
+    "nodejs": "Node.js",
+    "react": "React",
+    "reactjs": "React",
+    "vue": "Vue",
+    "vuejs": "Vue",
+    "angularjs": "Angular",
+    "nextjs": "Next.js",
+    "py": "Python",
+    "python": "Python",
+    "python3": "Python",
+    "golang": "Go",
+    "csharp": "C#",
+    "cpp": "C++",
+    "dotnet": ".NET",
+    "net": ".NET",
+    "postgres": "PostgreSQL",
+    "postgresql": "PostgreSQL",
+    "psql": "PostgreSQL",
+    "mysql": "MySQL",
+    "mongo": "MongoDB",
+    "mongodb": "MongoDB",
+    "k8s": "Kubernetes",
+    "kubernetes": "Kubernetes",
+    "aws": "AWS",
+    "amazonwebservices": "AWS",
+    "gcp": "Google Cloud",
+    "googlecloud": "Google Cloud",
+    "googlecloudplatform": "Google Cloud",
+    "azure": "Azure",
+    "microsoftazure": "Azure",
+    "ml": "Machine Learning",
+    "machinelearning": "Machine Learning",
+    "ui": "UI Design",
+    "uidesign": "UI Design",
+    "ux": "UX Design",
+    "uxdesign": "UX Design",
+    "excel": "Excel",
+    "msexcel": "Excel",
+    "microsoftexcel": "Excel",
+}
+
+_FOLD_PATTERN = re.compile(r"[\s._\-/]+")
+_KEY_LENGTH = 100
+
+
+def _fold(name: str) -> str:
+    return _FOLD_PATTERN.sub("", name.lower())
+
+
+@lru_cache(maxsize=4096)
+def canonical_skill(name) -> Optional[Tuple[str, str]]:
+    """(key, display name) for a free-text skill, or None if it is blank"""
+    if not isinstance(name, str):
+        return None
+    cleaned = " ".join(name.split()).strip(" ,;")
+    folded = _fold(cleaned)
+    if not folded:
+        return None
+    display = SKILL_ALIASES.get(folded, cleaned)
+    return _fold(display)[:_KEY_LENGTH], display[:255]
+
+
+def _skill_names(value) -> List[str]:
+    """Skill names from a JSON skills value: a list of strings or {"name": ...} dicts, or a dict of such lists"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        names = []
+        for entries in value.values():
+            names.extend(_skill_names(entries))
+        return names
+    names = []
+    for entry in value:
+        if isinstance(entry, dict):
+            entry = entry.get("name") or entry.get("skill")
+        if isinstance(entry, str):
+            names.append(entry)
+    return names
+
+
+def canonical_skills(value) -> Dict[str, str]:
+    """Deduplicated {key: display name} for a JSON skills value, in input order"""
+    skills: Dict[str, str] = {}
+    for name in _skill_names(value):
+        canonical = canonical_skill(name)
+        if canonical and canonical[0] not in skills:
+            skills[canonical[0]] = canonical[1]
+    return skills
+
+
+def parse_skill_query(skills: str) -> List[str]:
+    """Skill keys for a comma-separated ?skills= parameter"""
+    return list(canonical_skills(skills.split(",")))
+
+
+# ==================== Index maintenance ====================
+
+def _insert_ignore(connection, table):
+    """INSERT that skips rows already present - another writer may add the same skill"""
+    dialect = connection.dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return insert(table)
+    return dialect_insert(table).on_conflict_do_nothing()
+
+
+def ensure_skill_ids(connection, skills: Dict[str, str]) -> Dict[str, int]:
+    """Skill ids for {key: display name}, creating missing skills"""
+    if not skills:
+        return {}
+    lookup = select(Skill.key, Skill.id).where(Skill.key.in_(list(skills)))
+    ids = dict(connection.execute(lookup).all())
+    missing = [{"key": key, "name": name} for key, name in skills.items() if key not in ids]
+    if missing:
+        connection.execute(_insert_ignore(connection, Skill.__table__), missing)
+        ids = dict(connection.execute(lookup).all())
+    return ids
+
+
+def index_talent_skills(connection, talents: List[Tuple[int, object]]):
+    """Add talent_skills rows for (talent id, skills value) pairs that have none yet"""
+    canonical = [(talent_id, canonical_skills(value)) for talent_id, value in talents]
+    skill_ids = ensure_skill_ids(connection, {k: v for _, skills in canonical for k, v in skills.items()})
+    rows = [
+        {"talent_profile_id": talent_id, "skill_id": skill_ids[key]}
+        for talent_id, skills in canonical for key in skills if key in skill_ids
+    ]
+    if rows:
+        connection.execute(insert(TalentSkill), rows)
+
+
+def index_job_skills(connection, jobs: List[Tuple[int, object, object]]):
+    """
+    Add job_skills rows for (job id, required, preferred) triples that have none yet.
+    A skill listed as both counts as required.
+    """
+    canonical = []
+    for job_id, required_value, preferred_value in jobs:
+        required = canonical_skills(required_value)
+        preferred = {k: v for k, v in canonical_skills(preferred_value).items() if k not in required}
+        canonical.append((job_id, required, preferred))
+    names = {}
+    for _, required, preferred in canonical:
+        names.update(preferred)
+        names.update(required)
+    skill_ids = ensure_skill_ids(connection, names)
+    rows = [
+        {"job_id": job_id, "skill_id": skill_ids[key], "required": key in required}
+        for job_id, required, preferred in canonical for key in {**required, **preferred} if key in skill_ids
+    ]
+    if rows:
+        connection.execute(insert(JobSkill), rows)
+
+
+def sync_talent_skills(connection, talent_id: int, skills_value):
+    """Rebuild the talent_skills rows of one talent"""
+    connection.execute(delete(TalentSkill).where(TalentSkill.talent_profile_id == talent_id))
+    index_talent_skills(connection, [(talent_id, skills_value)])
+
+
+def sync_job_skills(connection, job_id: int, required_value, preferred_value):
+    """Rebuild the job_skills rows of one job"""
+    connection.execute(delete(JobSkill).where(JobSkill.job_id == job_id))
+    index_job_skills(connection, [(job_id, required_value, preferred_value)])
+
+
+def _changed(obj, *attributes: str) -> bool:
+    state = inspect(obj)
+    return any(state.attrs[name].history.has_changes() for name in attributes)
+
+
+@event.listens_for(Session, "before_flush")
+def _unindex_deleted(session, flush_context, instances):
+    # Before the parent rows go, so the foreign keys hold on every backend
+    for obj in session.deleted:
+        if isinstance(obj, TalentProfile) and obj.id is not None:
+            session.connection().execute(delete(TalentSkill).where(TalentSkill.talent_profile_id == obj.id))
+        elif isinstance(obj, Job) and obj.id is not None:
+            session.connection().execute(delete(JobSkill).where(JobSkill.job_id == obj.id))
+
+
+@event.listens_for(Session, "after_flush")
+def _index_written(session, flush_context):
+    # new/dirty and attribute history still describe the flush that just ran
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, TalentProfile):
+            if obj in session.new or _changed(obj, "skills"):
+                sync_talent_skills(session.connection(), obj.id, obj.skills)
+        elif isinstance(obj, Job):
+            if obj in session.new or _changed(obj, "required_skills", "preferred_skills"):
+                sync_job_skills(session.connection(), obj.id, obj.required_skills, obj.preferred_skills)
+
+
+def backfill_skill_index(connection, batch_size: int = 1000):
+    """Index every existing talent profile and job (migration 4)"""
+    talents = connection.execute(select(TalentProfile.id, TalentProfile.skills)).all()
+    for start in range(0, len(talents), batch_size):
+        index_talent_skills(connection, [tuple(row) for row in talents[start:start + batch_size]])
+    jobs = connection.execute(select(Job.id, Job.required_skills, Job.preferred_skills)).all()
+    for start in range(0, len(jobs), batch_size):
+        index_job_skills(connection, [tuple(row) for row in jobs[start:start + batch_size]])
+
+
+def install_skill_index(connection):
+    """Create the skills tables and index existing rows"""
+    for model in (Skill, TalentSkill, JobSkill):
+        model.__table__.create(bind=connection, checkfirst=True)
+    backfill_skill_index(connection)
+
+
+# ==================== Queries ====================
+
+def talent_skill_matches(keys: List[str], match_all: bool = True):
+    """
+    Subquery of (talent_profile_id, matched) for talents having the skills:
+    all of them (set intersection) or any (union), with how many matched
+    """
+    matched = func.count().label("matched")
+    return (
+        select(TalentSkill.talent_profile_id, matched)
+        .join(Skill, Skill.id == TalentSkill.skill_id)
+        .where(Skill.key.in_(keys))
+        .group_by(TalentSkill.talent_profile_id)
+        .having(func.count() >= (len(keys) if match_all else 1))
+        .subquery()
+    )
+
+
+def job_skill_matches(job_id: int):
+    """Subquery of (talent_profile_id, matched_required, matched_preferred) against one job's skills"""
+    return (
+        select(
+            TalentSkill.talent_profile_id,
+            func.sum(case((JobSkill.required == True, 1), else_=0)).label("matched_required"),
+            func.sum(case((JobSkill.required == True, 0), else_=1)).label("matched_preferred"),
+        )
+        .join(JobSkill, JobSkill.skill_id == TalentSkill.skill_id)
+        .where(JobSkill.job_id == job_id)
+        .group_by(TalentSkill.talent_profile_id)
+        .subquery()
+    )
@@ -0,0 +1,283 @@
+"""
+Token Estimation and Pre-flight Budgeting
+Estimates prompt size locally and decides, before any OpenAI call, whether a
+request fits in one shot or must be trimmed or processed in chunks
+"""
+
+import json
+import math
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from app.metrics import metrics
+
+# Optional tiktoken for exact counts - the heuristic below is used when it is missing
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    tiktoken = None
+    TIKTOKEN_AVAILABLE = False
+
+# Optional LangChain splitter (same optional dependency AIService uses)
+try:
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+except ImportError:
+    try:
+        from langchain.text_splitter import RecursiveCharacterTextSplitter
+    except ImportError:
+        RecursiveCharacterTextSplitter = None
+
+# Context windows (input + output tokens) for the models we route to
+MODEL_CONTEXT_WINDOWS: Dict[str, int] = {
+    "gpt-4-turbo-preview": 128000,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "gpt-4o-mini": 128000,
+    "gpt-4.1": 1047576,
+    "gpt-4.1-mini": 1047576,
+    "gpt-4": 8192,
+    "gpt-4-32k": 32768,
+    "gpt-3.5-turbo": 16385,
+}
+DEFAULT_CONTEXT_WINDOW = int(os.getenv("AI_DEFAULT_CONTEXT_TOKENS", "8192"))
+
+# Tokens reserved for the model's answer, per task
+OUTPUT_TOKEN_RESERVE: Dict[str, int] = {
+    "polish": 4000,
+    "resume_parse": 4096,
+    "summary": 1500,
+    "enhance": 1000,
+}
+
+# What to do when the input does not fit: "chunk" (text), or "trim" (JSON input -
+# the caller drops whole entries with trim_fields). Output is capped at the
+# task's OUTPUT_TOKEN_RESERVE through max_tokens, so the reserve holds.
+OVERFLOW_STRATEGY: Dict[str, str] = {
+    "polish": "chunk",
+    "resume_parse": "chunk",
+    "summary": "chunk",
+    "enhance": "trim",
+}
+
+# Polished text is about as long as its input, so polish input is capped by its output reserve
+TASK_MAX_INPUT_TOKENS: Dict[str, int] = {
+    "polish": OUTPUT_TOKEN_RESERVE["polish"] - 200,
+}
+
+# Overlap between chunks - zero where chunk outputs are concatenated verbatim,
+# and those chunks are split so that joining them restores the exact input
+CHUNK_OVERLAP_TOKENS: Dict[str, int] = {
+    "polish": 0,
+    "resume_parse": 100,
+    "summary": 100,
+}
+
+# Per-message overhead plus a margin for estimation error
+SAFETY_MARGIN_TOKENS = 256
+
+# Chat prompts are capped well below huge context windows so chunks stay fast
+MAX_INPUT_TOKENS = int(os.getenv("AI_MAX_INPUT_TOKENS", "24000"))
+
+_ENCODINGS: Dict[str, object] = {}
+
+
+def _load_context_overrides() -> None:
+    """AI_CONTEXT_WINDOWS="model=tokens,model2=tokens" overrides the table above"""
+    raw = os.getenv("AI_CONTEXT_WINDOWS", "")
+    for entry in raw.split(","):
+        if "=" not in entry:
+            continue
+        name, value = entry.split("=", 1)
+        try:
+            MODEL_CONTEXT_WINDOWS[name.strip()] = int(value.strip())
+        except ValueError:
+            print(f"Warning: Invalid AI_CONTEXT_WINDOWS entry: {entry}")
+
+
+_load_context_overrides()
+
+
+def context_window(model: str) -> int:
+    """Context window for a model, matching dated snapshots by prefix"""
+    if model in MODEL_CONTEXT_WINDOWS:
+        return MODEL_CONTEXT_WINDOWS[model]
+    for name in sorted(MODEL_CONTEXT_WINDOWS, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_CONTEXT_WINDOWS[name]
+    return DEFAULT_CONTEXT_WINDOW
+
+
+def estimate_tokens(text: Optional[str], model: Optional[str] = None) -> int:
+    """
+    Estimate the token count of text.
+
+    Uses tiktoken when installed. Otherwise ~3.5 ASCII characters per token plus
+    one token per non-ASCII character, which slightly overestimates English
+    text so the budget errs on the safe side.
+    """
+    if not text:
+        return 0
+    if TIKTOKEN_AVAILABLE:
+        encoding = _ENCODINGS.get(model or "")
+        if encoding is None:
+            try:
+                encoding = tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("cl100k_base")
+            except KeyError:
+                encoding = tiktoken.get_encoding("cl100k_base")
+            _ENCODINGS[model or ""] = encoding
+        return len(encoding.encode(text, disallowed_special=()))
+    ascii_chars = len(text.encode("ascii", errors="ignore"))
+    non_ascii = len(text) - ascii_chars
+    return math.ceil(ascii_chars / 3.5) + non_ascii
+
+
+def split_text(text: str, max_tokens: int, overlap_tokens: int = 100, model: Optional[str] = None) -> List[str]:
+    """Split text into chunks of at most max_tokens, on paragraph/line boundaries where possible"""
+    # Character size derived from the conservative 3.5 chars/token ratio
+    chunk_chars = max(200, int(max_tokens * 3.5))
+    overlap_chars = int(overlap_tokens * 3.5)
+    if RecursiveCharacterTextSplitter:
+        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_chars, chunk_overlap=overlap_chars)
+        chunks = splitter.split_text(text)
+    else:
+        chunks = []
+        current = ""
+        for paragraph in text.split("\n"):
+            while len(paragraph) > chunk_chars:
+                if current:
+                    chunks.append(current)
+                    current = ""
+                chunks.append(paragraph[:chunk_chars])
+                paragraph = paragraph[chunk_chars:]
+            if current and len(current) + len(paragraph) + 1 > chunk_chars:
+                chunks.append(current)
+                current = current[-overlap_chars:] if overlap_chars else ""
+            current = f"{current}\n{paragraph}" if current else paragraph
+        if current:
+            chunks.append(current)
+    # tiktoken counts can exceed the character estimate - re-split anything still too big
+    result = []
+    for chunk in chunks:
+        if estimate_tokens(chunk, model) > max_tokens and len(chunk) > 200:
+            half = len(chunk) // 2
+            result.extend(split_text(chunk[:half], max_tokens, 0, model))
+            result.extend(split_text(chunk[half:], max_tokens, 0, model))
+        elif chunk.strip():
+            result.append(chunk)
+    return result
+
+
+def _longest_prefix(text: str, start: int, max_tokens: int, model: Optional[str]) -> int:
+    """End of the longest slice text[start:end] within max_tokens (at least one character)"""
+    low, high = start + 1, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[start:mid], model) <= max_tokens:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def split_exact(text: str, max_tokens: int, model: Optional[str] = None) -> List[str]:
+    """
+    Split text into consecutive pieces of at most max_tokens that "".join back
+    to exactly the original - breaks go after a blank line, else a line end,
+    a sentence end or a space, so paragraph structure survives the round trip
+    """
+    chunks = []
+    start = 0
+    while start < len(text):
+        if estimate_tokens(text[start:], model) <= max_tokens:
+            chunks.append(text[start:])
+            break
+        end = _longest_prefix(text, start, max_tokens, model)
+        for separator in ("\n\n", "\n", ". ", " "):
+            index = text.rfind(separator, start, end)
+            if index > start:
+                end = index + len(separator)
+                break
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+def to_json(data) -> str:
+    """Compact JSON as sent in prompts"""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def trim_fields(data: Dict, max_tokens: int, model: Optional[str] = None) -> Dict:
+    """
+    Shrink a dict until its JSON fits max_tokens by dropping whole entries:
+    the last item of the largest list first, then whole fields from the end.
+    Strings are never cut, so the result is still well-formed data.
+    """
+    data = {key: list(value) if isinstance(value, list) else value for key, value in data.items()}
+    while data and estimate_tokens(to_json(data), model) > max_tokens:
+        lists = [key for key, value in data.items() if isinstance(value, list) and len(value) > 1]
+        if lists:
+            data[max(lists, key=lambda key: estimate_tokens(to_json(data[key]), model))].pop()
+        else:
+            data.pop(next(reversed(data)))
+    return data
+
+
+@dataclass
+class PromptPlan:
+    """Outcome of pre-flight budgeting for one request"""
+    task: str
+    model: str
+    strategy: str  # "one_shot", "trim" or "chunk"
+    input_tokens: int
+    fixed_tokens: int
+    max_input_tokens: int
+    output_tokens: int
+    chunks: List[str] = field(default_factory=list)
+
+
+def input_budget(task: str, model: str, fixed_prompt: str) -> int:
+    """Tokens left for the variable input after prompt template and output reserve"""
+    output_tokens = OUTPUT_TOKEN_RESERVE.get(task, 1000)
+    fixed_tokens = estimate_tokens(fixed_prompt, model)
+    available = context_window(model) - output_tokens - fixed_tokens - SAFETY_MARGIN_TOKENS
+    return max(0, min(available, MAX_INPUT_TOKENS, TASK_MAX_INPUT_TOKENS.get(task, MAX_INPUT_TOKENS)))
+
+
+def plan_prompt(task: str, model: str, fixed_prompt: str, text: str) -> PromptPlan:
+    """
+    Decide how to send text to a model.
+
+    fixed_prompt is everything except the variable input (system prompt and
+    user template). A "trim" plan leaves text as it is; the caller rebuilds it
+    from trim_fields(data, plan.max_input_tokens). The result is recorded as
+    ai_preflight_plans_total.
+    """
+    output_tokens = OUTPUT_TOKEN_RESERVE.get(task, 1000)
+    fixed_tokens = estimate_tokens(fixed_prompt, model)
+    max_input = input_budget(task, model, fixed_prompt)
+    input_tokens = estimate_tokens(text, model)
+
+    plan = PromptPlan(
+        task=task,
+        model=model,
+        strategy="one_shot",
+        input_tokens=input_tokens,
+        fixed_tokens=fixed_tokens,
+        max_input_tokens=max_input,
+        output_tokens=output_tokens,
+    )
+    if input_tokens > max_input:
+        plan.strategy = OVERFLOW_STRATEGY.get(task, "chunk")
+        if plan.strategy == "chunk":
+            overlap = CHUNK_OVERLAP_TOKENS.get(task, 0)
+            plan.chunks = (split_text(text, max_input, overlap, model) if overlap
+                           else split_exact(text, max_input, model))
+
+    metrics.incr("ai_preflight_plans_total", task=task, strategy=plan.strategy)
+    if plan.strategy != "one_shot":
+        print(f"[TOKEN_BUDGET] {task} on {model}: {input_tokens} input tokens > {max_input} budget, using {plan.strategy}"
+              + (f" ({len(plan.chunks)} chunks)" if plan.chunks else ""))
+    return plan
@@ -0,0 +1,307 @@
+"""
+Per-endpoint query and latency budgets
+Runs every main.py route against a freshly seeded SQLite database and checks
+each one against its baseline in endpoint_budgets.json: the most SQL
+statements one request may execute and the median latency it may take.
+Extra queries (an N+1 loop, a lazy load) or a slowdown (an unbounded scan)
+fail the run, and so does a route with neither a budget nor a skip reason.
+
+The checks run under pytest (tests/test_endpoint_budgets.py, one test per
+endpoint). Running this file prints the same checks as a table, and --update
+rewrites the baselines from that run: the observed query count, and
+LATENCY_HEADROOM times the observed median (at least MIN_LATENCY_MS).
+
+Usage: python bench_endpoints.py [--runs 5] [--only NAME] [--update]
+Endpoints with "requires" are skipped when they answer 503 because that
+optional service is not installed. Exits non-zero when any budget is exceeded.
+"""
+import argparse
+import json
+import math
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+BUDGETS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "endpoint_budgets.json")
+
+# Baseline latency written by --update, relative to the observed median
+LATENCY_HEADROOM = 3.0
+MIN_LATENCY_MS = 25
+
+# Bearer token the operational endpoints' budgets authenticate with
+METRICS_TOKEN = "bench-metrics-token"
+
+BUSINESS_EMAIL = "owner@example.com"
+TALENT_EMAIL = "talent@example.com"
+SKILL_SETS = [
+    ["Python", "SQL", "AWS"],
+    ["JavaScript", "React", "Node.js"],
+    ["Go", "Kubernetes", "PostgreSQL"],
+    ["Python", "Machine Learning", "SQL"],
+    ["TypeScript", "React", "UI Design"],
+]
+CITIES = ["Sydney", "Melbourne", "Brisbane", "Perth"]
+
+
+def load_budgets(path: str = BUDGETS_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_budgets(budgets: dict, path: str = BUDGETS_PATH):
+    with open(path, "w") as f:
+        json.dump(budgets, f, indent=2)
+        f.write("\n")
+
+
+# ==================== Seed data ====================
+
+def _seed(session_factory):
+    """
+    Fixed data set the budgets are measured against:
+    10 businesses (1 owned by BUSINESS_EMAIL), 60 talent profiles (1 owned by
+    TALENT_EMAIL), 50 published jobs, 40 applications to job 1 plus talent 1's
+    applications to jobs 2-11, 20 full resumes and 15 talent bank items
+    """
+    from app.models import (
+        Application, BusinessProfile, Job, ResumeData, ResumeInsights, TalentBankItem, TalentProfile, User,
+    )
+    from app.resume_insights import compute_content_hash, resume_payload
+
+    db = session_factory()
+    try:
+        db.add_all([
+            BusinessProfile(
+                name=f"Bench Business {i}",
+                description=f"Engineering and consulting firm number {i}",
+                industry="Technology",
+                email=f"business{i}@example.com",
+                city=CITIES[i % len(CITIES)],
+                country="Australia",
+                location=f"{CITIES[i % len(CITIES)]}, Australia",
+                latitude=-33.86 + i * 0.01,
+                longitude=151.2 + i * 0.01,
+                tags=["software", "consulting"],
+            )
+            for i in range(1, 11)
+        ])
+        db.flush()
+        db.add_all([
+            TalentProfile(
+                name=f"Bench Talent {i}",
+                email=f"talent{i}@example.com",
+                title="Software Engineer",
+                bio="Engineer with experience across web and data platforms. " * 5,
+                skills=SKILL_SETS[i % len(SKILL_SETS)],
+                experience_years=i % 15,
+                city=CITIES[i % len(CITIES)],
+                country="Australia",
+                location=f"{CITIES[i % len(CITIES)]}, Australia",
+            )
+            for i in range(1, 61)
+        ])
+        db.flush()
+        db.add_all([
+            User(
+                email=BUSINESS_EMAIL, username="bench_owner", hashed_password="",
+                user_type="business", business_profile_id=1,
+            ),
+            User(
+                email=TALENT_EMAIL, username="bench_talent", hashed_password="",
+                user_type="talent", talent_profile_id=1,
+            ),
+        ])
+        db.add_all([
+            Job(
+                business_profile_id=1 if i <= 10 else (i % 10) + 1,
+                title=f"Software Engineer {i}",
+                description="Build and run services in Python and SQL for an engineering team. " * 10,
+                employment_type="full-time",
+                city=CITIES[i % len(CITIES)],
+                country="Australia",
+                location=f"{CITIES[i % len(CITIES)]}, Australia",
+                required_skills=SKILL_SETS[i % len(SKILL_SETS)][:2],
+                preferred_skills=SKILL_SETS[i % len(SKILL_SETS)][2:],
+                status="published",
+                is_active=True,
+            )
+            for i in range(1, 51)
+        ])
+        db.flush()
+        # Applications 1-40 are on job 1, so application 1 belongs to BUSINESS_EMAIL
+        db.add_all([Application(job_id=1, talent_profile_id=talent_id, status="applied") for talent_id in range(2, 42)])
+        db.add_all([Application(job_id=job_id, talent_profile_id=1, status="applied") for job_id in range(2, 12)])
+        resumes = [
+            ResumeData(
+                name=f"Resume {i}",
+                email=f"resume{i}@example.com",
+                summary="Experienced engineer. " * 50,
+                experience=[{"company": f"Company {j}", "title": "Engineer", "description": "Work. " * 40} for j in range(8)],
+                education=[{"institution": "University", "degree": "BSc"}],
+                skills=SKILL_SETS[i % len(SKILL_SETS)],
+                raw_data={"text": "Resume text. " * 2000},
+                original_filename=f"resume{i}.pdf",
+                file_type="pdf",
+                file_size=100000,
+            )
+            for i in range(1, 21)
+        ]
+        db.add_all(resumes)
+        db.flush()
+        db.add(ResumeInsights(
+            resume_id=resumes[0].id,
+            content_hash=compute_content_hash(resume_payload(resumes[0])),
+            status="completed",
+            insights={"summary": "Strong backend engineer"},
+            model="bench",
+        ))
+        talent_user = db.query(User).filter(User.email == TALENT_EMAIL).one()
+        db.add_all([
+            TalentBankItem(user_id=talent_user.id, item_type="experience", title=f"Role {i}", description="Did things")
+            for i in range(15)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+# ==================== Requests ====================
+
+def _render(value, n: int, i: int = 0):
+    """Fill {n} (request counter, from the endpoint's n_start) and {i} (bulk row index); a bare "{n}" becomes an int"""
+    if isinstance(value, str):
+        if value == "{n}":
+            return n
+        return value.replace("{n}", str(n)).replace("{i}", str(i))
+    if isinstance(value, dict):
+        return {k: _render(v, n, i) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_render(v, n, i) for v in value]
+    return value
+
+
+def _request(client, endpoint: dict, n: int):
+    body = endpoint.get("json")
+    if body is not None:
+        if endpoint.get("bulk_rows"):
+            body = [_render(body, n, i) for i in range(endpoint["bulk_rows"])]
+        else:
+            body = _render(body, n)
+    return client.request(
+        endpoint["method"], _render(endpoint["path"], n), params=_render(endpoint.get("params"), n), json=body,
+        headers=endpoint.get("headers"),
+    )
+
+
+def measure(client, endpoint: dict, runs: int) -> dict:
+    """One warm-up request, then runs measured ones: worst query count, median latency, statuses seen"""
+    counter = iter(range(endpoint.get("n_start", 1), 1_000_000))
+    _request(client, endpoint, next(counter))
+    queries, timings, statuses = [], [], set()
+    for _ in range(runs):
+        n = next(counter)
+        started = time.perf_counter()
+        response = _request(client, endpoint, n)
+        timings.append((time.perf_counter() - started) * 1000)
+        statuses.add(response.status_code)
+        queries.append(int(response.headers.get("X-DB-Query-Count", 0)))
+    return {
+        "queries": max(queries),
+        "median_ms": statistics.median(timings),
+        "statuses": sorted(statuses),
+    }
+
+
+def check(endpoint: dict, result: dict) -> list:
+    """Budget violations for one endpoint's measurements"""
+    failures = []
+    expected = endpoint.get("status", 200)
+    if result["statuses"] != [expected]:
+        failures.append(f"status {result['statuses']} (expected {expected})")
+    if result["queries"] > endpoint["max_queries"]:
+        failures.append(f"{result['queries']} queries (budget {endpoint['max_queries']})")
+    if result["median_ms"] > endpoint["max_ms"]:
+        failures.append(f"median {result['median_ms']:.1f} ms (budget {endpoint['max_ms']} ms)")
+    return failures
+
+
+def route_keys(app) -> set:
+    from fastapi.routing import APIRoute
+    return {f"{method} {route.path}" for route in app.routes if isinstance(route, APIRoute) for method in route.methods}
+
+
+def uncovered_routes(app, budgets: dict) -> list:
+    """Routes with neither a budget nor a skip reason"""
+    covered = {f"{e['method']} {e['route']}" for e in budgets["endpoints"]} | set(budgets["skipped"])
+    return sorted(route_keys(app) - covered)
+
+
+@contextmanager
+def seeded_client():
+    """TestClient for main.app on a throwaway seeded SQLite database, with X-DB-* headers on"""
+    workdir = tempfile.mkdtemp(prefix="creerlio-endpoints-")
+    os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    os.environ.pop("DATABASE_READ_URL", None)
+    try:
+        from fastapi.testclient import TestClient
+        import main
+        from app import admin_access
+
+        main.SQL_DEBUG_HEADERS = True
+        admin_access.METRICS_TOKEN = METRICS_TOKEN
+        with TestClient(main.app) as client:
+            _seed(main.SessionLocal)
+            yield client, main.app
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def bench_endpoints():
+    """Check every endpoint against its budget"""
+    parser = argparse.ArgumentParser(description="Check per-endpoint query and latency budgets")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--only", action="append", help="Endpoint name to run (repeatable)")
+    parser.add_argument("--update", action="store_true", help="Rewrite the baselines from this run")
+    args = parser.parse_args()
+
+    budgets = load_budgets()
+    failed = []
+    with seeded_client() as (client, app):
+        print(f"{'endpoint':<34} {'queries':>7} {'budget':>6} {'median ms':>10} {'budget':>7}  result")
+        for endpoint in budgets["endpoints"]:
+            if args.only and endpoint["name"] not in args.only:
+                continue
+            result = measure(client, endpoint, args.runs)
+            if endpoint.get("requires") and result["statuses"] == [503]:
+                print(f"{endpoint['name']:<34} skipped: {endpoint['requires']} not available")
+                continue
+            if args.update:
+                endpoint["max_queries"] = result["queries"]
+                endpoint["max_ms"] = max(MIN_LATENCY_MS, math.ceil(result["median_ms"] * LATENCY_HEADROOM))
+            failures = check(endpoint, result)
+            if failures:
+                failed.append(endpoint["name"])
+            print(
+                f"{endpoint['name']:<34} {result['queries']:>7} {endpoint['max_queries']:>6} "
+                f"{result['median_ms']:>10.1f} {endpoint['max_ms']:>7}  "
+                f"{'FAIL: ' + '; '.join(failures) if failures else 'ok'}"
+            )
+        uncovered = uncovered_routes(app, budgets)
+
+    for route in uncovered:
+        print(f"No budget or skip reason for {route}")
+    if args.update:
+        save_budgets(budgets)
+        print(f"Baselines written to {BUDGETS_PATH}")
+    if failed or uncovered:
+        print(f"{len(failed)} endpoint(s) over budget, {len(uncovered)} route(s) uncovered")
+        sys.exit(1)
+    print("All endpoints within budget")
+
+if __name__ == "__main__":
+    bench_endpoints()
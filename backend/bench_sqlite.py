@@ -0,0 +1,139 @@
+"""
+Benchmark the SQLite profile against the legacy NullPool setup
+Runs read-heavy and mixed workloads from several threads against throwaway
+database files and prints throughput and latency for each configuration.
+
+Usage: python bench_sqlite.py [--threads 8] [--seconds 5] [--rows 2000]
+"""
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_sqlite_engine
+from app.models import Base, BusinessProfile, Job
+
+WORKLOADS = {
+    "read-heavy": 0.05,  # share of operations that write
+    "mixed": 0.5,
+}
+
+
+def _seed(session_factory, rows: int):
+    db = session_factory()
+    try:
+        business = BusinessProfile(name="Bench Co", description="Benchmark business")
+        db.add(business)
+        db.flush()
+        db.add_all([
+            Job(
+                business_profile_id=business.id,
+                title=f"Engineer {i}",
+                description=f"Role {i} working with python and sql",
+                city=random.choice(["Sydney", "Melbourne", "Brisbane"]),
+                status="published",
+                is_active=True,
+            )
+            for i in range(rows)
+        ])
+        db.commit()
+    finally:
+        db.close()
+
+
+def _read(db, rows: int):
+    job_id = random.randint(1, rows)
+    db.query(Job).filter(Job.id == job_id).first()
+    db.query(Job).filter(
+        Job.status == "published",
+        Job.is_active == True,
+        Job.city == "Sydney"
+    ).offset(random.randint(0, 100)).limit(20).all()
+
+
+def _write(db, rows: int):
+    job = db.query(Job).filter(Job.id == random.randint(1, rows)).first()
+    job.description = f"Updated {time.time()}"
+    db.commit()
+
+
+def _run(session_factory, rows: int, write_ratio: float, threads: int, seconds: float) -> dict:
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.perf_counter() + seconds
+
+    def worker():
+        local = []
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            db = session_factory()
+            try:
+                if random.random() < write_ratio:
+                    _write(db, rows)
+                else:
+                    _read(db, rows)
+                local.append(time.perf_counter() - started)
+            except OperationalError:
+                db.rollback()
+                with lock:
+                    errors[0] += 1
+            finally:
+                db.close()
+        with lock:
+            latencies.extend(local)
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "ops": count,
+        "ops_per_sec": count / seconds,
+        "p50_ms": latencies[count // 2] * 1000 if count else 0.0,
+        "p95_ms": latencies[int(count * 0.95)] * 1000 if count else 0.0,
+        "errors": errors[0],
+    }
+
+
+def bench_sqlite():
+    """Compare legacy and tuned SQLite engines"""
+    parser = argparse.ArgumentParser(description="Benchmark SQLite engine profiles")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--rows", type=int, default=2000)
+    args = parser.parse_args()
+
+    workdir = tempfile.mkdtemp(prefix="creerlio-bench-")
+    try:
+        print(f"{'profile':<8} {'workload':<11} {'ops/s':>9} {'p50 ms':>8} {'p95 ms':>8} {'errors':>7}")
+        for workload, write_ratio in WORKLOADS.items():
+            for profile, tuned in (("legacy", False), ("tuned", True)):
+                path = os.path.join(workdir, f"{profile}-{workload}.db")
+                engine = create_sqlite_engine(f"sqlite:///{path}", tuned=tuned)
+                Base.metadata.create_all(bind=engine)
+                session_factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+                _seed(session_factory, args.rows)
+                result = _run(session_factory, args.rows, write_ratio, args.threads, args.seconds)
+                engine.dispose()
+                print(
+                    f"{profile:<8} {workload:<11} {result['ops_per_sec']:>9.0f} "
+                    f"{result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} {result['errors']:>7}"
+                )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    bench_sqlite()
@@ -3,13 +3,14 @@ Creerlio Platform - Main Backend Entry Point
 FastAPI application with AI resume parsing, business profiles, and mapping features
 """
 
+import asyncio
 import json
 import time
 import os
-from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Request, Body, Query
+from fastapi import FastAPI, HTTPException, Depends, UploadFile, File, Request, Body, Query, BackgroundTasks
 from pydantic import ValidationError  # pyright: ignore[reportMissingImports]
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from contextlib import asynccontextmanager
 import uvicorn
 from typing import List, Optional
@@ -36,13 +37,37 @@ except ImportError:
     PDF_GENERATOR_AVAILABLE = False
     PDFGenerator = None
 from app.mapping_service import MappingService
-from app.database import get_db, init_db
+from app.database import (
+    get_db, get_async_db, get_read_db, get_async_read_db, init_db, SessionLocal, async_engine,
+    mark_client_write, pool_status, run_pool_validator, run_replica_monitor, ReplicaFallbackMiddleware
+)
+from app.resume_insights import (
+    compute_content_hash, generate_resume_insights, get_cached_insights, needs_generation, resume_payload,
+)
+from app.resume_text_store import save_resume_text, store_resume_text
+from app.resume_stream import sse_event
+from app.pagination import (
+    LIMIT_DESCRIPTION, aestimate_total, clamp_limit, estimate_total, page_result, page_statement, paginate,
+)
+from app.search import apply_fulltext, fulltext_supported, search_tokens
+from app.skills import job_skill_matches, parse_skill_query, talent_skill_matches
+from app.projection import FIELDS_DESCRIPTION, list_fields, row_dicts, select_fields
+from app.bulk_import import business_importer, job_importer, read_bulk_rows, talent_importer
+from app.application_stats import APPLICATION_STATUSES, load_job_stats
+from app.metrics import metrics
+from app.admin_access import check_admin_access, require_operator_access, revoke_admin_access
+from app.admin_stats import admin_stats, run_admin_stats_refresher
+from app.cache import invalidation_bus
+from app.response_cache import public_jobs_cache, public_jobs_key
+from app.query_tracker import SQL_DEBUG_HEADERS, end_request, finish_request, start_request
 from app.supabase_client import get_supabase, get_supabase_client
 from app.auth import (
     UserRegister, UserLogin, UserResponse, Token,
     create_user, authenticate_user, create_access_token,
-    get_user_by_email, ACCESS_TOKEN_EXPIRE_MINUTES
+    get_user_by_email, ACCESS_TOKEN_EXPIRE_MINUTES,
+    get_user_identity, aget_user_identity, get_user_identity_by_id, invalidate_user
 )
+from sqlalchemy import select
 from datetime import timedelta, datetime
 import uuid
 
@@ -118,11 +143,24 @@ async def lifespan(app: FastAPI):
         import traceback
         traceback.print_exc()
     
+    # Periodic pool validation replaces the old per-request SELECT 1
+    pool_validator = asyncio.create_task(run_pool_validator())
+    replica_monitor = asyncio.create_task(run_replica_monitor())
+    # Cache evictions published by the other workers
+    invalidation_bus.start()
+    admin_stats_refresher = asyncio.create_task(run_admin_stats_refresher())
+    
     print("=" * 50)
     print("Application startup complete - ready to accept requests")
     print("=" * 50)
     yield
     
+    pool_validator.cancel()
+    replica_monitor.cancel()
+    admin_stats_refresher.cancel()
+    invalidation_bus.stop()
+    if async_engine:
+        await async_engine.dispose()
     print("Application shutdown")
 
 
@@ -134,6 +172,11 @@ app = FastAPI(
 )
 
 
+# Innermost middleware (registered first): a GET whose replica failed mid-request is
+# replayed on the primary before the other middlewares see a response
+app.add_middleware(ReplicaFallbackMiddleware)
+
+
 # CORS middleware - MUST be registered BEFORE routes
 @app.middleware("http")
 async def add_cors_header(request: Request, call_next):
@@ -179,6 +222,31 @@ async def add_cors_header(request: Request, call_next):
             }
         )
 
+
+@app.middleware("http")
+async def track_primary_writes(request: Request, call_next):
+    """After a successful write, keep that client's reads on the primary (read-your-writes)"""
+    response = await call_next(request)
+    if request.method in ("POST", "PUT", "PATCH", "DELETE") and response.status_code < 400:
+        mark_client_write(request, response)
+    return response
+
+
+@app.middleware("http")
+async def track_queries(request: Request, call_next):
+    """Count and time the SQL each request runs; flags likely N+1 patterns (see app/query_tracker.py)"""
+    tracker, token = start_request()
+    try:
+        response = await call_next(request)
+    finally:
+        end_request(token)
+    route = getattr(request.scope.get("route"), "path", "unmatched")
+    finish_request(tracker, route)
+    if SQL_DEBUG_HEADERS:
+        for name, value in tracker.headers().items():
+            response.headers[name] = value
+    return response
+
 # Health Check - MUST work without any dependencies
 @app.get("/")
 async def root():
@@ -196,6 +264,24 @@ async def health_check():
     }
 
 
+@app.get("/metrics", response_class=PlainTextResponse, dependencies=[Depends(require_operator_access)])
+async def prometheus_metrics():
+    """Process metrics in Prometheus text format (METRICS_TOKEN bearer token or admin)"""
+    return metrics.render_prometheus()
+
+
+@app.get("/api/metrics", dependencies=[Depends(require_operator_access)])
+async def json_metrics():
+    """Process metrics as JSON (METRICS_TOKEN bearer token or admin)"""
+    return metrics.snapshot()
+
+
+@app.get("/api/db/pool", dependencies=[Depends(require_operator_access)])
+async def db_pool_stats():
+    """Connection pool occupancy and checkout wait times for this worker"""
+    return pool_status()
+
+
 @app.post("/api/auth/register")
 async def register(request: Request, db=Depends(get_db) if get_db else None):
     """Register a new user - Password completely removed during construction"""
@@ -331,12 +417,12 @@ async def login(request: Request, db=Depends(get_db)):
 
 
 @app.get("/api/auth/me")
-async def get_current_user(email: Optional[str] = None, db=Depends(get_db)):
+async def get_current_user(email: Optional[str] = None, db=Depends(get_async_db)):
     """Get current user information - Authentication removed for manual profile building"""
     if not email:
         raise HTTPException(status_code=400, detail="Email required")
     
-    user = get_user_by_email(db, email)
+    user = await aget_user_identity(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -355,7 +441,11 @@ async def get_current_user(email: Optional[str] = None, db=Depends(get_db)):
 # ==================== AI Resume Parsing ====================
 
 @app.post("/api/resume/upload")
-async def upload_resume(file: UploadFile = File(...), db=Depends(get_db)):
+async def upload_resume(
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db=Depends(get_db)
+):
     """Upload and parse resume using AI"""
     if not ai_service:
         raise HTTPException(status_code=503, detail="AI service is not available")
@@ -365,13 +455,19 @@ async def upload_resume(file: UploadFile = File(...), db=Depends(get_db)):
         
         # Parse resume with AI
         parsed_data = await ai_service.parse_resume(file_content, file.filename)
+        extracted_text = parsed_data.pop("extracted_text", None)
         
-        # Store in database
+        # Store in database (full text goes to the compressed side table for later re-parsing)
+        if extracted_text:
+            store_resume_text(db, extracted_text, file.filename)
         resume_data = ResumeData(**parsed_data)
         db.add(resume_data)
         db.commit()
         db.refresh(resume_data)
         
+        # Precompute insights after the response is sent so the next page view is instant
+        background_tasks.add_task(generate_resume_insights, resume_data.id, ai_service, SessionLocal)
+        
         return {
             "success": True,
             "resume_id": resume_data.id,
@@ -381,6 +477,18 @@ async def upload_resume(file: UploadFile = File(...), db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def format_experience(exp: dict) -> dict:
+    """Experience entry as shown in the frontend selection list"""
+    return {
+        "company": exp.get("company", ""),
+        "title": exp.get("title", ""),
+        "start_date": exp.get("start_date", ""),
+        "end_date": exp.get("end_date", ""),
+        "description": exp.get("description", ""),
+        "achievements": exp.get("achievements", [])
+    }
+
+
 @app.post("/api/resume/parse")
 async def parse_resume_file(
     file: UploadFile = File(...),
@@ -417,6 +525,10 @@ async def parse_resume_file(
         # Parse resume with AI
         print(f"[RESUME PARSE] Calling AI service to parse resume...")
         parsed_data = await ai_service.parse_resume(file_content, filename)
+        # Keep the full text so full_data's raw_data.text_hash can be re-parsed later
+        extracted_text = parsed_data.pop("extracted_text", None)
+        if extracted_text:
+            await asyncio.to_thread(save_resume_text, SessionLocal, extracted_text, filename)
         
         print(f"[RESUME PARSE] AI parsing completed. Keys in response: {list(parsed_data.keys())}")
         
@@ -441,14 +553,7 @@ async def parse_resume_file(
         # Format experiences for frontend selection
         formatted_experiences = []
         for i, exp in enumerate(experiences):
-            formatted_exp = {
-                "company": exp.get("company", ""),
-                "title": exp.get("title", ""),
-                "start_date": exp.get("start_date", ""),
-                "end_date": exp.get("end_date", ""),
-                "description": exp.get("description", ""),
-                "achievements": exp.get("achievements", [])
-            }
+            formatted_exp = format_experience(exp)
             formatted_experiences.append(formatted_exp)
             print(f"[RESUME PARSE] Experience {i+1}: {formatted_exp.get('title')} at {formatted_exp.get('company')}")
         
@@ -468,6 +573,52 @@ async def parse_resume_file(
         raise HTTPException(status_code=500, detail=f"Error parsing resume: {str(e)}")
 
 
+@app.post("/api/resume/parse/stream")
+async def parse_resume_file_stream(file: UploadFile = File(...)):
+    """
+    Streaming variant of /api/resume/parse using server-sent events.
+    Emits "page" for each extracted page, "contact" as contact fields are found,
+    "experience" for each experience entry as soon as the model produces it,
+    "reset" if the request escalates to the larger model (drop the experiences
+    received so far - confirmed ones are sent again), and "complete" with the
+    same payload /api/resume/parse returns (or "error").
+    """
+    if not ai_service:
+        raise HTTPException(status_code=503, detail="AI service is not available. Please check server configuration.")
+    
+    filename = file.filename or "file"
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in [".pdf", ".doc", ".docx", ".txt", ".rtf"]:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported file format: {extension}. Please upload a PDF, DOC, DOCX, TXT, or RTF file."
+        )
+    file_content = await file.read()
+    if not file_content:
+        raise HTTPException(status_code=400, detail="File is empty")
+    
+    def events():
+        # Sync generator - Starlette iterates it in a worker thread, so the blocking OpenAI stream is fine here
+        for event, data in ai_service.stream_parse_resume(file_content, filename):
+            if event == "experience":
+                data = format_experience(data)
+            elif event == "complete":
+                save_resume_text(SessionLocal, data.pop("extracted_text", None), filename)
+                data = {
+                    "success": True,
+                    "filename": filename,
+                    "experiences": [format_experience(exp) for exp in data.get("experience", [])],
+                    "full_data": data
+                }
+            yield sse_event(event, data)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @app.get("/api/resume/{resume_id}")
 async def get_resume(resume_id: int, db=Depends(get_db)):
     """Get parsed resume data"""
@@ -477,11 +628,68 @@ async def get_resume(resume_id: int, db=Depends(get_db)):
     return resume
 
 
+@app.get("/api/resume/{resume_id}/insights")
+async def get_resume_insights(resume_id: int, background_tasks: BackgroundTasks, db=Depends(get_db)):
+    """
+    Get precomputed AI insights for a resume.
+    Returns cached insights when they match the current resume content. A failed
+    generation is reported as failed and retried only once its backoff has passed;
+    otherwise generation is scheduled (unless already running) and reported as pending.
+    """
+    resume = db.query(ResumeData).filter(ResumeData.id == resume_id).first()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    
+    cached = get_cached_insights(db, resume)
+    if cached and cached.status == "completed":
+        return {
+            "resume_id": resume_id,
+            "status": "completed",
+            "insights": cached.insights,
+            "model": cached.model,
+            "generated_at": cached.completed_at.isoformat() if cached.completed_at else None
+        }
+    
+    content_hash = compute_content_hash(resume_payload(resume))
+    if cached and cached.status == "failed" and not needs_generation(cached, content_hash):
+        return {
+            "resume_id": resume_id,
+            "status": "failed",
+            "error": cached.error,
+            "attempts": cached.attempts,
+            "retry_after": cached.retry_after.isoformat() if cached.retry_after else None
+        }
+    
+    if not ai_service:
+        raise HTTPException(status_code=503, detail="AI service is not available")
+    
+    if needs_generation(cached, content_hash):
+        background_tasks.add_task(generate_resume_insights, resume_id, ai_service, SessionLocal)
+    return JSONResponse(
+        status_code=202,
+        content={"resume_id": resume_id, "status": "pending"}
+    )
+
+
 @app.get("/api/resume")
-async def list_resumes(skip: int = 0, limit: int = 100, db=Depends(get_db)):
-    """List all parsed resumes"""
-    resumes = db.query(ResumeData).offset(skip).limit(limit).all()
-    return {"resumes": resumes, "count": len(resumes)}
+async def list_resumes(
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    skip: int = Query(0, ge=0, description="Deprecated offset, ignored when cursor is given"),
+    limit: int = Query(100, description=LIMIT_DESCRIPTION),
+    include_total: bool = Query(False, description="Add an estimated_total to the response"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db=Depends(get_read_db)
+):
+    """List all parsed resumes, newest first (cursor paginated); summary fields unless ?fields= asks for more"""
+    limit = clamp_limit(limit)
+    names = list_fields(ResumeData, fields)
+    query = select_fields(ResumeData, names)
+    rows, next_cursor = page_result(db.execute(paginate(query, ResumeData, cursor, limit, skip)).all(), limit)
+    resumes = row_dicts(rows, names)
+    result = {"resumes": resumes, "count": len(resumes), "next_cursor": next_cursor}
+    if include_total:
+        result["estimated_total"] = estimate_total(db, query)
+    return result
 
 
 # ==================== AI Text Polishing ====================
@@ -511,6 +719,14 @@ async def polish_text(request: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.get("/api/ai/routing", dependencies=[Depends(require_operator_access)])
+async def get_ai_routing():
+    """Model routing configuration, recent decisions and per-model latency"""
+    if not ai_service:
+        raise HTTPException(status_code=503, detail="AI service is not available")
+    return ai_service.router.stats()
+
+
 # ==================== Business Profiles ====================
 
 @app.post("/api/business")
@@ -527,6 +743,15 @@ async def create_business(business_data: dict, db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/api/business/bulk")
+async def bulk_create_businesses(request: Request, db=Depends(get_db)):
+    """
+    Import business profiles from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson). Returns a result per row.
+    """
+    return await business_importer.run(db, read_bulk_rows(request))
+
+
 # IMPORTANT: /api/business/me routes must come BEFORE /api/business/{business_id} routes
 # to prevent FastAPI from matching "me" as a business_id parameter
 # Route order verification: This route MUST be registered before any /api/business/{business_id} routes
@@ -539,7 +764,7 @@ async def get_my_business_profile(
     """Get current user's business profile"""
     
     # Get user by email
-    user = get_user_by_email(db, email)
+    user = get_user_identity(db, email)
     if not user:
         
         raise HTTPException(status_code=404, detail="User not found")
@@ -576,7 +801,7 @@ async def update_my_business_profile(
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {str(e)}")
     
     # Get user by email
-    user = get_user_by_email(db, email)
+    user = get_user_identity(db, email)
     if not user:
         
         raise HTTPException(status_code=404, detail="User not found")
@@ -590,6 +815,11 @@ async def update_my_business_profile(
         if not business:
             raise HTTPException(status_code=404, detail="Business profile not found")
     else:
+        owner = db.get(User, user.id)
+        if owner is None:
+            # The cached identity outlived the user row
+            invalidate_user(user.id, user.email)
+            raise HTTPException(status_code=404, detail="User not found")
         # Create new business profile
         business = BusinessProfile(
             name=profile_data.get("name", ""),
@@ -597,7 +827,7 @@ async def update_my_business_profile(
         )
         db.add(business)
         db.flush()
-        user.business_profile_id = business.id
+        owner.business_profile_id = business.id
     
     # Update allowed fields only
     allowed_fields = ["name", "description", "industry", "website", "address", "city", "state", "country", "location", "phone"]
@@ -615,24 +845,43 @@ async def update_my_business_profile(
 async def search_businesses(
     query: Optional[str] = None,
     location: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db=Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    skip: int = Query(0, ge=0, description="Deprecated offset, ignored when cursor is given"),
+    limit: int = Query(100, description=LIMIT_DESCRIPTION),
+    include_total: bool = Query(False, description="Add an estimated_total to the response"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db=Depends(get_async_read_db)
 ):
-    """Search businesses by name, description, or location"""
-    businesses = db.query(BusinessProfile)
+    """
+    Search businesses by name, description, or location.
+    With a query, results are ranked by full-text relevance; otherwise newest first.
+    Returns summary fields unless ?fields= asks for more.
+    """
+    limit = clamp_limit(limit)
+    names = list_fields(BusinessProfile, fields)
+    businesses = select_fields(BusinessProfile, names)
+    rank = None
     
     if query:
-        businesses = businesses.filter(
-            (BusinessProfile.name.ilike(f"%{query}%")) |
-            (BusinessProfile.description.ilike(f"%{query}%"))
-        )
+        dialect = db.get_bind().dialect.name
+        if fulltext_supported(dialect) and search_tokens(query):
+            businesses, rank = apply_fulltext(businesses, BusinessProfile, query, dialect)
+        else:
+            businesses = businesses.where(
+                (BusinessProfile.name.ilike(f"%{query}%")) |
+                (BusinessProfile.description.ilike(f"%{query}%"))
+            )
     
     if location:
-        businesses = businesses.filter(BusinessProfile.location.ilike(f"%{location}%"))
+        businesses = businesses.where(BusinessProfile.location.ilike(f"%{location}%"))
     
-    results = businesses.offset(skip).limit(limit).all()
-    return {"businesses": results, "count": len(results)}
+    page, rank_count = page_statement(businesses, BusinessProfile, cursor, limit, skip, rank)
+    rows, next_cursor = page_result((await db.execute(page)).all(), limit, rank_count)
+    results = row_dicts(rows, names)
+    response = {"businesses": results, "count": len(results), "next_cursor": next_cursor}
+    if include_total:
+        response["estimated_total"] = await aestimate_total(db, businesses)
+    return response
 
 
 # NOTE: /api/business/{business_id} routes removed to prevent conflict with /api/business/me
@@ -695,70 +944,126 @@ async def create_job(job_data: dict, db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to create job: {str(e)}")
 
 
+@app.post("/api/jobs/bulk")
+async def bulk_create_jobs(request: Request, db=Depends(get_db)):
+    """
+    Import job postings from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson). Returns a result per row.
+    """
+    result = await job_importer.run(db, read_bulk_rows(request))
+    if result["created"]:
+        # Multi-row INSERTs bypass the ORM flush that normally invalidates listings
+        public_jobs_cache.invalidate()
+    return result
+
+
 @app.get("/api/jobs")
 async def get_jobs(
     business_user_id: Optional[int] = None,
     business_profile_id: Optional[int] = None,
     status: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    skip: int = Query(0, ge=0, description="Deprecated offset, ignored when cursor is given"),
+    limit: int = Query(100, description=LIMIT_DESCRIPTION),
+    include_total: bool = Query(False, description="Add an estimated_total to the response"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     db=Depends(get_db)
 ):
-    """Get jobs with optional filtering"""
-    query = db.query(Job)
+    """
+    Get jobs with optional filtering (newest first, cursor paginated); summary fields
+    unless ?fields= asks for more. Each job carries its application_stats counts.
+    """
+    limit = clamp_limit(limit)
+    names = list_fields(Job, fields)
+    query = select_fields(Job, names)
     
     # Filter by business user (get business_profile_id from user)
     if business_user_id:
-        user = db.query(User).filter(User.id == business_user_id).first()
+        user = get_user_identity_by_id(db, business_user_id)
         if user and user.business_profile_id:
-            query = query.filter(Job.business_profile_id == user.business_profile_id)
+            query = query.where(Job.business_profile_id == user.business_profile_id)
     
     # Filter by business profile
     if business_profile_id:
-        query = query.filter(Job.business_profile_id == business_profile_id)
+        query = query.where(Job.business_profile_id == business_profile_id)
     
     # Filter by status
     if status:
-        query = query.filter(Job.status == status)
+        query = query.where(Job.status == status)
     
     # Only show active jobs
-    query = query.filter(Job.is_active == True)
+    query = query.where(Job.is_active == True)
     
-    jobs = query.offset(skip).limit(limit).all()
-    return {"jobs": jobs, "count": len(jobs)}
+    rows, next_cursor = page_result(db.execute(paginate(query, Job, cursor, limit, skip)).all(), limit)
+    jobs = row_dicts(rows, names)
+    stats = load_job_stats(db, [job["id"] for job in jobs])
+    for job in jobs:
+        job["application_stats"] = stats[job["id"]]
+    result = {"jobs": jobs, "count": len(jobs), "next_cursor": next_cursor}
+    if include_total:
+        result["estimated_total"] = estimate_total(db, query)
+    return result
 
 
 @app.get("/api/jobs/public")
 async def get_public_jobs(
+    request: Request,
     location: Optional[str] = None,
     keyword: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db=Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    skip: int = Query(0, ge=0, description="Deprecated offset, ignored when cursor is given"),
+    limit: int = Query(100, description=LIMIT_DESCRIPTION),
+    include_total: bool = Query(False, description="Add an estimated_total to the response"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db=Depends(get_async_read_db)
 ):
-    """Get published jobs (public endpoint)"""
-    
-    query = db.query(Job).filter(
+    """
+    Get published jobs (public endpoint).
+    With a keyword, results are ranked by full-text relevance; otherwise newest first.
+    Returns summary fields unless ?fields= asks for more.
+    Pages are served from an in-process cache with ETag / Last-Modified, and a
+    matching If-None-Match or If-Modified-Since gets 304 Not Modified.
+    """
+    limit = clamp_limit(limit)
+    names = list_fields(Job, fields)
+    key = public_jobs_key(location, keyword, cursor, skip, limit, include_total, names)
+    cached = public_jobs_cache.get(key)
+    if cached:
+        return public_jobs_cache.respond(request, cached)
+    generation = public_jobs_cache.generation
+    
+    query = select_fields(Job, names).where(
         Job.status == "published",
         Job.is_active == True
     )
+    rank = None
     
     if keyword:
-        query = query.filter(
-            (Job.title.ilike(f"%{keyword}%")) |
-            (Job.description.ilike(f"%{keyword}%"))
-        )
+        dialect = db.get_bind().dialect.name
+        if fulltext_supported(dialect) and search_tokens(keyword):
+            query, rank = apply_fulltext(query, Job, keyword, dialect)
+        else:
+            query = query.where(
+                (Job.title.ilike(f"%{keyword}%")) |
+                (Job.description.ilike(f"%{keyword}%"))
+            )
     
     if location:
-        query = query.filter(
+        query = query.where(
             (Job.location.ilike(f"%{location}%")) |
             (Job.city.ilike(f"%{location}%")) |
             (Job.country.ilike(f"%{location}%"))
         )
     
-    jobs = query.offset(skip).limit(limit).all()
+    page, rank_count = page_statement(query, Job, cursor, limit, skip, rank)
+    rows, next_cursor = page_result((await db.execute(page)).all(), limit, rank_count)
+    jobs = row_dicts(rows, names)
     
-    return {"jobs": jobs, "count": len(jobs)}
+    result = {"jobs": jobs, "count": len(jobs), "next_cursor": next_cursor}
+    if include_total:
+        result["estimated_total"] = await aestimate_total(db, query)
+    entry = public_jobs_cache.store(key, result, generation)
+    return public_jobs_cache.respond(request, entry)
 
 
 @app.post("/api/init-profiles")
@@ -864,11 +1169,53 @@ async def init_profiles_endpoint(db=Depends(get_db)):
 
 @app.get("/api/jobs/{job_id}")
 async def get_job(job_id: int, db=Depends(get_db)):
-    """Get job by ID"""
+    """Get job by ID, with its application_stats counts"""
     job = db.query(Job).filter(Job.id == job_id).first()
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
-    return job
+    result = {name: getattr(job, name) for name in list_fields(Job, "all")}
+    result["application_stats"] = load_job_stats(db, [job_id])[job_id]
+    return result
+
+
+@app.get("/api/jobs/{job_id}/matches")
+async def get_job_matches(
+    job_id: int,
+    min_required: int = Query(0, ge=0, description="Minimum number of required skills matched"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(50, description=LIMIT_DESCRIPTION),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db=Depends(get_async_read_db)
+):
+    """Active talent sharing skills with a job, most required skills matched first, then preferred"""
+    limit = clamp_limit(limit)
+    job = (await db.execute(select(Job.id).where(Job.id == job_id))).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    names = list_fields(TalentProfile, fields)
+    matches = job_skill_matches(job_id)
+    query = (
+        select_fields(TalentProfile, names)
+        .add_columns(matches.c.matched_required, matches.c.matched_preferred)
+        .join(matches, matches.c.talent_profile_id == TalentProfile.id)
+        .where(TalentProfile.is_active == True)
+    )
+    if min_required:
+        query = query.where(matches.c.matched_required >= min_required)
+    
+    rank = [matches.c.matched_required, matches.c.matched_preferred]
+    page, rank_count = page_statement(query, TalentProfile, cursor, limit, rank=rank)
+    rows, next_cursor = page_result((await db.execute(page)).all(), limit, rank_count)
+    return {
+        "job_id": job_id,
+        "matches": [
+            {"talent": talent, "matched_required": row.matched_required, "matched_preferred": row.matched_preferred}
+            for talent, row in zip(row_dicts(rows, names), rows)
+        ],
+        "count": len(rows),
+        "next_cursor": next_cursor,
+    }
 
 
 # ==================== Applications ====================
@@ -877,12 +1224,12 @@ async def get_job(job_id: int, db=Depends(get_db)):
 async def create_application(
     application_data: dict,
     email: str = Query(..., description="User email address"),
-    db=Depends(get_db)
+    db=Depends(get_async_db)
 ):
     """Create a new job application (talent only)"""
     try:
         # Get user by email
-        user = get_user_by_email(db, email)
+        user = await aget_user_identity(db, email)
         if not user:
             raise HTTPException(status_code=404, detail="User not found")
         
@@ -893,12 +1240,9 @@ async def create_application(
         if not user.talent_profile_id:
             raise HTTPException(status_code=400, detail="Talent profile not found. Please complete your profile first.")
         
-        talent_profile = db.query(TalentProfile).filter(TalentProfile.id == user.talent_profile_id).first()
-        if not talent_profile:
-            raise HTTPException(status_code=404, detail="Talent profile not found")
-        
         # Get job
-        job = db.query(Job).filter(Job.id == application_data.get("job_id")).first()
+        job_id = application_data.get("job_id")
+        job = await db.get(Job, job_id) if job_id is not None else None
         if not job:
             raise HTTPException(status_code=404, detail="Job not found")
         
@@ -910,10 +1254,10 @@ async def create_application(
             raise HTTPException(status_code=400, detail="Job is not active")
         
         # Check if application already exists
-        existing = db.query(Application).filter(
+        existing = (await db.execute(select(Application.id).where(
             Application.job_id == job.id,
-            Application.talent_profile_id == talent_profile.id
-        ).first()
+            Application.talent_profile_id == user.talent_profile_id
+        ).limit(1))).first()
         
         if existing:
             raise HTTPException(status_code=400, detail="You have already applied to this job")
@@ -921,7 +1265,7 @@ async def create_application(
         # Create application
         application = Application(
             job_id=job.id,
-            talent_profile_id=talent_profile.id,
+            talent_profile_id=user.talent_profile_id,
             status="applied",
             cover_letter=application_data.get("cover_letter"),
             notes=application_data.get("notes"),
@@ -929,8 +1273,8 @@ async def create_application(
         )
         
         db.add(application)
-        db.commit()
-        db.refresh(application)
+        await db.commit()
+        await db.refresh(application)
         
         return {
             "success": True,
@@ -945,18 +1289,22 @@ async def create_application(
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to create application: {str(e)}")
 
 
 @app.get("/api/applications/me")
 async def get_my_applications(
     email: str = Query(..., description="User email address"),
-    db=Depends(get_db)
+    status: Optional[str] = Query(None, description="Only applications with this status"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, description=LIMIT_DESCRIPTION),
+    db=Depends(get_async_read_db)
 ):
-    """Get current user's applications (talent only)"""
+    """Get current user's applications (talent only), newest first with cursor pagination"""
+    limit = clamp_limit(limit)
     # Get user by email
-    user = get_user_by_email(db, email)
+    user = await aget_user_identity(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -965,76 +1313,149 @@ async def get_my_applications(
     
     # Get talent profile
     if not user.talent_profile_id:
-        return {"applications": [], "count": 0}
-    
-    # Get applications
-    applications = db.query(Application).filter(
+        return {"applications": [], "count": 0, "next_cursor": None}
+    
+    # Applications with their job's columns in one query
+    query = select(
+        Application.id,
+        Application.job_id,
+        Application.status,
+        Application.created_at,
+        Application.updated_at,
+        Job.title.label("job_title"),
+        Job.location.label("job_location"),
+        Job.city.label("job_city"),
+    ).outerjoin(Job, Job.id == Application.job_id).where(
         Application.talent_profile_id == user.talent_profile_id
-    ).order_by(Application.created_at.desc()).all()
-    
-    # Include job details
-    result = []
-    for app in applications:
-        job = db.query(Job).filter(Job.id == app.job_id).first()
-        result.append({
-            "id": app.id,
-            "job_id": app.job_id,
-            "job_title": job.title if job else None,
-            "job_location": job.location or job.city if job else None,
-            "status": app.status,
-            "created_at": app.created_at,
-            "updated_at": app.updated_at
-        })
+    )
+    if status:
+        query = query.where(Application.status == status)
+    
+    rows, next_cursor = page_result((await db.execute(paginate(query, Application, cursor, limit))).all(), limit)
+    result = [
+        {
+            "id": row.id,
+            "job_id": row.job_id,
+            "job_title": row.job_title,
+            "job_location": row.job_location or row.job_city,
+            "status": row.status,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at
+        }
+        for row in rows
+    ]
     
-    return {"applications": result, "count": len(result)}
+    return {"applications": result, "count": len(result), "next_cursor": next_cursor}
 
 
 @app.get("/api/applications/job/{job_id}")
 async def get_job_applications(
     job_id: int,
     email: str = Query(..., description="User email address"),
-    db=Depends(get_db)
+    status: Optional[str] = Query(None, description="Only applications with this status"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(100, description=LIMIT_DESCRIPTION),
+    db=Depends(get_async_read_db)
 ):
-    """Get applications for a specific job (business owner only)"""
+    """Get applications for a specific job (business owner only), newest first with cursor pagination"""
+    limit = clamp_limit(limit)
     # Get user by email
-    user = get_user_by_email(db, email)
+    user = await aget_user_identity(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
     if user.user_type != "business":
         raise HTTPException(status_code=403, detail="Only business users can view job applications")
     
-    # Get job
-    job = db.query(Job).filter(Job.id == job_id).first()
-    if not job:
+    # Get job owner
+    owner_id = (await db.execute(select(Job.business_profile_id).where(Job.id == job_id))).first()
+    if not owner_id:
         raise HTTPException(status_code=404, detail="Job not found")
     
     # Verify ownership
-    if not user.business_profile_id or user.business_profile_id != job.business_profile_id:
+    if not user.business_profile_id or user.business_profile_id != owner_id[0]:
         raise HTTPException(status_code=403, detail="You don't have permission to view applications for this job")
     
-    # Get applications
-    applications = db.query(Application).filter(
+    # Applications with their talent's columns in one query
+    query = select(
+        Application.id,
+        Application.talent_profile_id,
+        Application.status,
+        Application.cover_letter,
+        Application.created_at,
+        Application.updated_at,
+        TalentProfile.name.label("talent_name"),
+        TalentProfile.email.label("talent_email"),
+        TalentProfile.title.label("talent_title"),
+    ).outerjoin(TalentProfile, TalentProfile.id == Application.talent_profile_id).where(
         Application.job_id == job_id
-    ).order_by(Application.created_at.desc()).all()
-    
-    # Include talent profile details
-    result = []
-    for app in applications:
-        talent = db.query(TalentProfile).filter(TalentProfile.id == app.talent_profile_id).first()
-        result.append({
-            "id": app.id,
-            "talent_profile_id": app.talent_profile_id,
-            "talent_name": talent.name if talent else None,
-            "talent_email": talent.email if talent else None,
-            "talent_title": talent.title if talent else None,
-            "status": app.status,
-            "cover_letter": app.cover_letter,
-            "created_at": app.created_at,
-            "updated_at": app.updated_at
-        })
-    
-    return {"applications": result, "count": len(result)}
+    )
+    if status:
+        query = query.where(Application.status == status)
+    
+    rows, next_cursor = page_result((await db.execute(paginate(query, Application, cursor, limit))).all(), limit)
+    result = [
+        {
+            "id": row.id,
+            "talent_profile_id": row.talent_profile_id,
+            "talent_name": row.talent_name,
+            "talent_email": row.talent_email,
+            "talent_title": row.talent_title,
+            "status": row.status,
+            "cover_letter": row.cover_letter,
+            "created_at": row.created_at,
+            "updated_at": row.updated_at
+        }
+        for row in rows
+    ]
+    
+    return {"applications": result, "count": len(result), "next_cursor": next_cursor}
+
+
+@app.put("/api/applications/{application_id}/status")
+async def update_application_status(
+    application_id: int,
+    status_data: dict,
+    email: str = Query(..., description="User email address"),
+    db=Depends(get_async_db)
+):
+    """Move an application to another status (business owner of the job only)"""
+    status = status_data.get("status")
+    if status not in APPLICATION_STATUSES:
+        raise HTTPException(status_code=400, detail=f"status must be one of: {', '.join(APPLICATION_STATUSES)}")
+    
+    user = await aget_user_identity(db, email)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    if user.user_type != "business":
+        raise HTTPException(status_code=403, detail="Only business users can update applications")
+    
+    application = await db.get(Application, application_id)
+    if not application:
+        raise HTTPException(status_code=404, detail="Application not found")
+    
+    owner_id = (await db.execute(select(Job.business_profile_id).where(Job.id == application.job_id))).scalar()
+    if not user.business_profile_id or user.business_profile_id != owner_id:
+        raise HTTPException(status_code=403, detail="You don't have permission to update this application")
+    
+    try:
+        # job_application_stats is adjusted in the same transaction (app/application_stats.py)
+        application.status = status
+        await db.commit()
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=500, detail=f"Failed to update application: {str(e)}")
+    
+    return {
+        "success": True,
+        "application": {
+            "id": application.id,
+            "job_id": application.job_id,
+            "status": application.status,
+            "updated_at": application.updated_at
+        }
+    }
 
 
 # ==================== Talent Profiles ====================
@@ -1053,7 +1474,16 @@ async def create_talent(talent_data: dict, db=Depends(get_db)):
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/api/talent/{talent_id}")
+@app.post("/api/talent/bulk")
+async def bulk_create_talent(request: Request, db=Depends(get_db)):
+    """
+    Import talent profiles from a JSON array or an NDJSON stream
+    (Content-Type: application/x-ndjson). Returns a result per row.
+    """
+    return await talent_importer.run(db, read_bulk_rows(request))
+
+
+@app.get("/api/talent/{talent_id:int}")
 async def get_talent(talent_id: int, db=Depends(get_db)):
     """Get talent profile by ID"""
     talent = db.query(TalentProfile).filter(TalentProfile.id == talent_id).first()
@@ -1069,7 +1499,7 @@ async def get_my_talent_profile(
 ):
     """Get current user's talent profile"""
     # Get user by email
-    user = get_user_by_email(db, email)
+    user = get_user_identity(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -1091,7 +1521,7 @@ async def update_my_talent_profile(
 ):
     """Update current user's talent profile"""
     # Get user by email
-    user = get_user_by_email(db, email)
+    user = get_user_identity(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -1104,6 +1534,11 @@ async def update_my_talent_profile(
         if not talent:
             raise HTTPException(status_code=404, detail="Talent profile not found")
     else:
+        owner = db.get(User, user.id)
+        if owner is None:
+            # The cached identity outlived the user row
+            invalidate_user(user.id, user.email)
+            raise HTTPException(status_code=404, detail="User not found")
         # Create new talent profile
         talent = TalentProfile(
             name=profile_data.get("name", user.full_name or user.username),
@@ -1111,7 +1546,7 @@ async def update_my_talent_profile(
         )
         db.add(talent)
         db.flush()
-        user.talent_profile_id = talent.id
+        owner.talent_profile_id = talent.id
     
     # Update allowed fields only
     allowed_fields = ["name", "title", "bio", "skills", "location", "city", "state", "country", "phone"]
@@ -1127,31 +1562,57 @@ async def update_my_talent_profile(
 @app.get("/api/talent/search")
 async def search_talent(
     query: Optional[str] = None,
-    skills: Optional[str] = None,
+    skills: Optional[str] = Query(None, description="Comma-separated skills"),
+    skills_match: str = Query("all", pattern="^(all|any)$", description="Require all skills or any of them"),
     location: Optional[str] = None,
-    skip: int = 0,
-    limit: int = 100,
-    db=Depends(get_db)
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    skip: int = Query(0, ge=0, description="Deprecated offset, ignored when cursor is given"),
+    limit: int = Query(100, description=LIMIT_DESCRIPTION),
+    include_total: bool = Query(False, description="Add an estimated_total to the response"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    db=Depends(get_async_read_db)
 ):
-    """Search talent by skills, location, or keywords"""
-    talents = db.query(TalentProfile)
+    """
+    Search talent by skills, location, or keywords.
+    With skills, results are ranked by how many skills matched (skill_matches maps
+    talent id to that count), then by full-text relevance for a query; otherwise newest first.
+    Returns summary fields unless ?fields= asks for more.
+    """
+    limit = clamp_limit(limit)
+    names = list_fields(TalentProfile, fields)
+    talents = select_fields(TalentProfile, names)
+    rank = None
+    matched = None
     
     if query:
-        talents = talents.filter(
-            (TalentProfile.name.ilike(f"%{query}%")) |
-            (TalentProfile.bio.ilike(f"%{query}%"))
-        )
+        dialect = db.get_bind().dialect.name
+        if fulltext_supported(dialect) and search_tokens(query):
+            talents, rank = apply_fulltext(talents, TalentProfile, query, dialect)
+        else:
+            talents = talents.where(
+                (TalentProfile.name.ilike(f"%{query}%")) |
+                (TalentProfile.bio.ilike(f"%{query}%"))
+            )
     
-    if skills:
-        skill_list = [s.strip() for s in skills.split(",")]
-        for skill in skill_list:
-            talents = talents.filter(TalentProfile.skills.contains([skill]))
+    skill_keys = parse_skill_query(skills) if skills else []
+    if skill_keys:
+        matches = talent_skill_matches(skill_keys, match_all=skills_match == "all")
+        matched = matches.c.matched
+        talents = talents.add_columns(matched).join(matches, matches.c.talent_profile_id == TalentProfile.id)
+        rank = [matched] if rank is None else [matched, rank]
     
     if location:
-        talents = talents.filter(TalentProfile.location.ilike(f"%{location}%"))
+        talents = talents.where(TalentProfile.location.ilike(f"%{location}%"))
     
-    results = talents.offset(skip).limit(limit).all()
-    return {"talents": results, "count": len(results)}
+    page, rank_count = page_statement(talents, TalentProfile, cursor, limit, skip, rank)
+    rows, next_cursor = page_result((await db.execute(page)).all(), limit, rank_count)
+    results = row_dicts(rows, names)
+    response = {"talents": results, "count": len(results), "next_cursor": next_cursor}
+    if matched is not None:
+        response["skill_matches"] = {row.id: row.matched for row in rows}
+    if include_total:
+        response["estimated_total"] = await aestimate_total(db, talents)
+    return response
 
 
 # ==================== Talent Bank ====================
@@ -1170,7 +1631,7 @@ async def list_talent_bank_items(
     NOTE: Authentication is simplified for Phase 1 - user is resolved by email.
     In Supabase, RLS additionally enforces that users only see their own items.
     """
-    user = get_user_by_email(db, email)
+    user = get_user_identity(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1217,7 +1678,7 @@ async def create_talent_bank_item(
 
     Use this for Experience, Education, Credentials, and other metadata-only records.
     """
-    user = get_user_by_email(db, email)
+    user = get_user_identity(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1253,6 +1714,46 @@ async def create_talent_bank_item(
         raise HTTPException(status_code=500, detail=f"Failed to create talent bank item: {str(e)}")
 
 
+# Files uploaded to storage at once per request
+TALENT_BANK_UPLOAD_CONCURRENCY = int(os.getenv("TALENT_BANK_UPLOAD_CONCURRENCY", "10"))
+
+
+def _talent_bank_item_type(content_type: str, filename: str) -> str:
+    """Basic type detection"""
+    extension = os.path.splitext(filename)[1].lower()
+    if content_type.startswith("image/"):
+        return "image"
+    if content_type.startswith("video/"):
+        return "video"
+    if extension in [".pdf", ".doc", ".docx", ".txt", ".rtf"]:
+        return "document"
+    return "file"
+
+
+async def _upload_talent_bank_file(storage, semaphore: asyncio.Semaphore, file: UploadFile, path: str) -> Optional[dict]:
+    """Upload one file to storage; returns the TalentBankItem fields, or None for an empty file"""
+    async with semaphore:
+        # Read inside the semaphore so at most TALENT_BANK_UPLOAD_CONCURRENCY files are in memory
+        content = await file.read()
+        if not content:
+            return None
+        upload_res = await asyncio.to_thread(storage.upload, path, content)
+        if getattr(upload_res, "error", None):
+            raise Exception(str(upload_res.error))
+    filename = file.filename or "file"
+    content_type = file.content_type or "application/octet-stream"
+    return {
+        "item_type": _talent_bank_item_type(content_type, filename),
+        "title": filename,
+        # Public URL (if bucket is public) – adjust as needed
+        "file_url": storage.get_public_url(path),
+        "file_path": path,
+        "file_type": content_type,
+        "file_size": len(content),
+        "extra_metadata": {"originalName": filename},
+    }
+
+
 @app.post("/api/talent-bank/upload")
 async def upload_talent_bank_files(
     email: str = Query(..., description="User email address"),
@@ -1265,9 +1766,11 @@ async def upload_talent_bank_files(
     Files are stored in Supabase Storage bucket:
       talent-bank/{user_id}/<timestamp>_<filename>
 
-    Each uploaded file creates a corresponding TalentBankItem record.
+    Files are uploaded concurrently (TALENT_BANK_UPLOAD_CONCURRENCY at a time) and
+    the TalentBankItem records for every successful upload are written in one
+    transaction. Files that fail are listed in "failed" without aborting the rest.
     """
-    user = get_user_by_email(db, email)
+    user = get_user_identity(db, email)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
 
@@ -1281,58 +1784,35 @@ async def upload_talent_bank_files(
     if not files:
         raise HTTPException(status_code=400, detail="No files provided")
 
-    created_items: List[TalentBankItemResponse] = []
     bucket_name = "talent-bank"
+    storage = supabase.storage.from_(bucket_name)
+    semaphore = asyncio.Semaphore(TALENT_BANK_UPLOAD_CONCURRENCY)
+
+    # Storage path: talent-bank/{user_id}/<ts>_<filename>; offsetting the timestamp
+    # per file keeps paths unique when a batch repeats a filename
+    timestamp = int(time.time() * 1000)
+    paths = [f"{user.id}/{timestamp + i}_{file.filename or 'file'}" for i, file in enumerate(files)]
+    outcomes = await asyncio.gather(
+        *[_upload_talent_bank_file(storage, semaphore, file, path) for file, path in zip(files, paths)],
+        return_exceptions=True,
+    )
 
-    for file in files:
+    items: List[TalentBankItem] = []
+    failed = []
+    for file, outcome in zip(files, outcomes):
+        if isinstance(outcome, BaseException):
+            failed.append({"filename": file.filename, "error": str(outcome)})
+        elif outcome is not None:
+            items.append(TalentBankItem(user_id=user.id, description=None, is_active=True, **outcome))
+
+    created_items: List[TalentBankItemResponse] = []
+    if items:
+        uploaded_paths = [item.file_path for item in items]
         try:
-            content = await file.read()
-            if not content:
-                continue
-
-            # Basic type detection
-            content_type = file.content_type or "application/octet-stream"
-            filename = file.filename or "file"
-            extension = os.path.splitext(filename)[1].lower()
-
-            if content_type.startswith("image/"):
-                item_type = "image"
-            elif content_type.startswith("video/"):
-                item_type = "video"
-            elif extension in [".pdf", ".doc", ".docx", ".txt", ".rtf"]:
-                item_type = "document"
-            else:
-                item_type = "file"
-
-            # Storage path: talent-bank/{user_id}/<ts>_<filename>
-            timestamp = int(time.time() * 1000)
-            path = f"{user.id}/{timestamp}_{filename}"
-
-            # Upload to Supabase Storage
-            storage = supabase.storage.from_(bucket_name)
-            upload_res = storage.upload(path, content)
-            if getattr(upload_res, "error", None):
-                raise Exception(str(upload_res.error))
-
-            # Public URL (if bucket is public) – adjust as needed
-            public_url = storage.get_public_url(path)
-
-            item = TalentBankItem(
-                user_id=user.id,
-                item_type=item_type,
-                title=filename,
-                description=None,
-                file_url=public_url,
-                file_path=path,
-                file_type=content_type,
-                file_size=len(content),
-                extra_metadata={"originalName": filename},
-                is_active=True,
-            )
-            db.add(item)
-            db.commit()
-            db.refresh(item)
-            created_items.append(
+            db.add_all(items)
+            # Flush assigns ids and timestamps, so the response needs no refresh after commit
+            db.flush()
+            created_items = [
                 TalentBankItemResponse(
                     id=item.id,
                     user_id=item.user_id,
@@ -1348,13 +1828,19 @@ async def upload_talent_bank_files(
                     created_at=item.created_at,
                     updated_at=item.updated_at,
                 )
-            )
+                for item in items
+            ]
+            db.commit()
         except Exception as e:
             db.rollback()
-            
-            raise HTTPException(status_code=500, detail=f"Failed to upload file '{file.filename}': {str(e)}")
+            # Don't leave unreferenced objects in the bucket
+            try:
+                await asyncio.to_thread(storage.remove, uploaded_paths)
+            except Exception:
+                pass
+            raise HTTPException(status_code=500, detail=f"Failed to record uploaded files: {str(e)}")
 
-    return {"items": created_items, "count": len(created_items)}
+    return {"items": created_items, "count": len(created_items), "failed": failed}
 
 
 # ==================== Mapping & Routes ====================
@@ -1566,6 +2052,7 @@ async def delete_account(request: Request):
             if hasattr(response, 'error') and response.error:
                 raise Exception(f"Supabase error: {response.error}")
             auth_deleted = True
+            revoke_admin_access(user_id)
             
             # Verify deletion by attempting to get the user (should fail if deleted)
             try:
@@ -1621,55 +2108,13 @@ if __name__ == "__main__":
 
 # ==================== Admin Panel API ====================
 
-def check_admin_access(user_id: str) -> bool:
-    """
-    Check if user has admin access
-    Admin users are identified by email domain or explicit admin flag in metadata
-    """
-    if not user_id:
-        return False
-    
-    supabase = get_supabase_client(use_service_key=True)
-    if not supabase:
-        return False
-    
-    try:
-        # Get user from auth
-        user_res = supabase.auth.admin.get_user_by_id(user_id)
-        if not user_res or not hasattr(user_res, 'user') or not user_res.user:
-            return False
-        
-        user = user_res.user
-        user_metadata = user.user_metadata or {}
-        
-        # Check for admin flag in metadata
-        if user_metadata.get('is_admin') is True or user_metadata.get('admin') is True:
-            return True
-        
-        # Check for admin email domain (configurable via env)
-        admin_domains = os.getenv("ADMIN_EMAIL_DOMAINS", "").split(",")
-        admin_domains = [d.strip().lower() for d in admin_domains if d.strip()]
-        
-        if user.email:
-            email_domain = user.email.split("@")[-1].lower()
-            if email_domain in admin_domains:
-                return True
-        
-        # Check for specific admin emails
-        admin_emails = os.getenv("ADMIN_EMAILS", "").split(",")
-        admin_emails = [e.strip().lower() for e in admin_emails if e.strip()]
-        if user.email and user.email.lower() in admin_emails:
-            return True
-        
-        return False
-    except Exception as e:
-        print(f"Error checking admin access: {e}")
-        return False
-
-
 @app.post("/api/admin/stats")
 async def get_admin_stats(request: Request):
-    """Get platform statistics for admin dashboard"""
+    """
+    Get platform statistics for admin dashboard.
+    Served from the snapshot the background refresher keeps current
+    (ADMIN_STATS_REFRESH_SECONDS); generated_at and age_seconds say how fresh it is.
+    """
     try:
         body = await request.json()
         user_id = body.get("user_id") or request.headers.get("X-User-Id")
@@ -1677,36 +2122,14 @@ async def get_admin_stats(request: Request):
         if not user_id or not check_admin_access(user_id):
             raise HTTPException(status_code=403, detail="Admin access required")
         
-        supabase_admin = get_supabase_client(use_service_key=True)
-        if not supabase_admin:
-            raise HTTPException(status_code=503, detail="Admin service not available")
-        
-        # Get counts
-        talent_count = supabase_admin.table('talent_profiles').select('id', count='exact').execute()
-        business_count = supabase_admin.table('business_profiles').select('id', count='exact').execute()
-        
-        # Get auth users count
-        try:
-            # Note: Supabase Python client doesn't have direct user count, so we'll estimate
-            # by counting profiles
-            total_users = (talent_count.count or 0) + (business_count.count or 0)
-        except:
-            total_users = 0
-        
-        # Get recent registrations (last 7 days)
-        from datetime import datetime, timedelta
-        week_ago = (datetime.utcnow() - timedelta(days=7)).isoformat()
-        
-        recent_talent = supabase_admin.table('talent_profiles').select('id', count='exact').gte('created_at', week_ago).execute()
-        recent_business = supabase_admin.table('business_profiles').select('id', count='exact').gte('created_at', week_ago).execute()
-        
-        return {
-            "total_talent": talent_count.count or 0,
-            "total_business": business_count.count or 0,
-            "total_users": total_users,
-            "recent_talent_7d": recent_talent.count or 0,
-            "recent_business_7d": recent_business.count or 0,
-        }
+        snapshot = admin_stats.latest()
+        if snapshot is None:
+            raise HTTPException(
+                status_code=503,
+                detail="Statistics are not available yet",
+                headers={"Retry-After": "30"},
+            )
+        return snapshot
     except HTTPException:
         raise
     except Exception as e:
@@ -2032,6 +2455,7 @@ async def delete_user_admin(user_id: str, request: Request):
             supabase_admin.auth.admin.delete_user(user_id)
         except Exception as e:
             deletion_errors.append(f"auth user: {str(e)}")
+        revoke_admin_access(user_id)
         
         return {
             "success": True,
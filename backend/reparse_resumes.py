@@ -0,0 +1,51 @@
+"""
+Re-parse stored resumes with the current parsing model
+Run this script after a prompt or model change to refresh parsed resume data.
+Progress is checkpointed - re-running continues where the last run stopped.
+
+Usage: python reparse_resumes.py [--concurrency 4] [--batch-size 50] [--limit N] [--restart] [--job NAME]
+"""
+import argparse
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from app.database import SessionLocal, init_db
+from app.ai_service import AIService
+from app.reparse_job import run_reparse_job
+
+def reparse_resumes():
+    """Run the bulk re-parse job from the command line"""
+    parser = argparse.ArgumentParser(description="Re-parse stored resume text")
+    parser.add_argument("--job", default="resume_reparse", help="Checkpoint name")
+    parser.add_argument("--concurrency", type=int, default=int(os.getenv("REPARSE_CONCURRENCY", "4")))
+    parser.add_argument("--batch-size", type=int, default=int(os.getenv("REPARSE_BATCH_SIZE", "50")))
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many resumes")
+    parser.add_argument("--restart", action="store_true", help="Ignore the saved checkpoint")
+    args = parser.parse_args()
+
+    if SessionLocal is None:
+        print("❌ Database not configured")
+        sys.exit(1)
+
+    try:
+        init_db()
+        ai_service = AIService()
+        result = asyncio.run(run_reparse_job(
+            ai_service,
+            SessionLocal,
+            job_name=args.job,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+            restart=args.restart,
+            max_resumes=args.limit,
+        ))
+        print(f"\n✅ Re-parse {result['status']}: {result['processed']} processed, "
+              f"{result['failed']} failed, {result['skipped']} skipped")
+    except Exception as e:
+        print(f"❌ Error re-parsing resumes: {e}")
+        raise
+
+if __name__ == "__main__":
+    reparse_resumes()
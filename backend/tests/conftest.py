@@ -0,0 +1,40 @@
+"""
+Shared fixtures. main.py builds its engines at import, so every test that
+needs the app shares one seeded throwaway SQLite database (see
+bench_endpoints.seeded_client); tests that write use their own rows.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_endpoints import seeded_client  # noqa: E402
+
+
+@pytest.fixture(scope="session")
+def seeded():
+    """(TestClient, app) on the seeded database"""
+    with seeded_client() as (client, app):
+        yield client, app
+
+
+@pytest.fixture(scope="session")
+def client(seeded):
+    return seeded[0]
+
+
+@pytest.fixture(scope="session")
+def session_factory(seeded):
+    import main
+    return main.SessionLocal
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,73 @@
+"""Admin decisions are cached, and revoking one takes effect at once - in this worker and the others"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import admin_access
+from app.admin_access import admin_access_cache, check_admin_access, revoke_admin_access
+from app.cache import invalidation_bus
+
+
+class FakeSupabase:
+    """Just enough of the service-role client: auth.admin.get_user_by_id"""
+
+    def __init__(self):
+        self.users = {}
+        self.lookups = 0
+        self.down = False
+        self.auth = SimpleNamespace(admin=SimpleNamespace(get_user_by_id=self._get_user_by_id))
+
+    def _get_user_by_id(self, user_id):
+        self.lookups += 1
+        if self.down:
+            raise ConnectionError("auth API down")
+        user = self.users.get(user_id)
+        return SimpleNamespace(user=user)
+
+    def set_user(self, user_id, email, is_admin=False):
+        self.users[user_id] = SimpleNamespace(email=email, user_metadata={"is_admin": is_admin})
+
+
+@pytest.fixture
+def supabase(monkeypatch):
+    fake = FakeSupabase()
+    monkeypatch.setattr(admin_access, "_service_client", fake)
+    revoke_admin_access()
+    yield fake
+    revoke_admin_access()
+
+
+def test_decision_is_cached(supabase):
+    supabase.set_user("u1", "admin@example.com", is_admin=True)
+    assert check_admin_access("u1")
+    assert check_admin_access("u1")
+    assert supabase.lookups == 1
+
+
+def test_revoked_admin_loses_access_immediately(client, supabase):
+    supabase.set_user("u1", "admin@example.com", is_admin=True)
+    assert client.get("/api/metrics", headers={"X-User-Id": "u1"}).status_code == 200
+
+    supabase.set_user("u1", "admin@example.com", is_admin=False)
+    # Still cached until revoked
+    assert client.get("/api/metrics", headers={"X-User-Id": "u1"}).status_code == 200
+    revoke_admin_access("u1")
+    assert client.get("/api/metrics", headers={"X-User-Id": "u1"}).status_code == 403
+
+
+def test_revocation_from_another_worker_is_applied(supabase):
+    supabase.set_user("u2", "admin@example.com", is_admin=True)
+    assert check_admin_access("u2")
+    supabase.set_user("u2", "admin@example.com", is_admin=False)
+
+    invalidation_bus.apply(json.dumps({"origin": "another-worker", "cache": admin_access_cache.name, "keys": ["u2"]}))
+    assert not check_admin_access("u2")
+
+
+def test_lookup_failure_is_not_cached(supabase):
+    supabase.set_user("u3", "admin@example.com", is_admin=True)
+    supabase.down = True
+    assert not check_admin_access("u3")
+    supabase.down = False
+    assert check_admin_access("u3")
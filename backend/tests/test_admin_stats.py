@@ -0,0 +1,130 @@
+"""Admin statistics: rollup window boundaries, snapshot swaps and the single refreshing worker"""
+import time
+from datetime import datetime, time as dt_time, timedelta, timezone
+from types import SimpleNamespace
+
+import fakeredis
+
+from app import cache as cache_module
+from app.admin_stats import AdminStats
+from app.cache import Cache
+
+
+class FakeQuery:
+    def __init__(self, rows, since_calls):
+        self.rows = rows
+        self.since_calls = since_calls
+        self.since = None
+        self.head = False
+        self.bounds = None
+
+    def select(self, *columns, count=None, head=False):
+        self.head = head
+        return self
+
+    def gte(self, column, value):
+        self.since = datetime.fromisoformat(value)
+        self.since_calls.append(self.since)
+        return self
+
+    def order(self, column):
+        return self
+
+    def range(self, start, end):
+        self.bounds = (start, end + 1)
+        return self
+
+    def execute(self):
+        if self.head:
+            return SimpleNamespace(count=len(self.rows), data=None)
+        rows = sorted(r for r in self.rows if self.since is None or r >= self.since)
+        rows = rows[slice(*self.bounds)] if self.bounds else rows
+        return SimpleNamespace(data=[{"created_at": r.isoformat()} for r in rows], count=None)
+
+
+class FakeSupabase:
+    """created_at values per table; records the lower bound of every registrations query"""
+
+    def __init__(self, talent=(), business=()):
+        self.tables = {"talent_profiles": list(talent), "business_profiles": list(business)}
+        self.since_calls = []
+
+    def table(self, name):
+        return FakeQuery(self.tables[name], self.since_calls)
+
+
+def _at(day, hour=12):
+    return datetime.combine(day, dt_time(hour), tzinfo=timezone.utc)
+
+
+def test_rollup_window_boundaries():
+    today = datetime.now(timezone.utc).date()
+    client = FakeSupabase(
+        talent=[
+            _at(today - timedelta(days=7), 23),  # just outside the 7-day count
+            _at(today - timedelta(days=6), 0),   # first day of it
+            _at(today - timedelta(days=9)),      # outside the rollup window
+            _at(today),
+        ],
+        business=[_at(today - timedelta(days=8))],
+    )
+    stats = AdminStats(rollup_days=9)
+    stats.refresh(client)
+    snapshot = stats.latest()
+    days = snapshot["daily_registrations"]
+    assert [d["date"] for d in days] == [(today - timedelta(days=n)).isoformat() for n in range(8, -1, -1)]
+    assert sum(d["talent"] for d in days) == 3 and sum(d["business"] for d in days) == 1
+    assert (snapshot["total_talent"], snapshot["recent_talent_7d"], snapshot["recent_business_7d"]) == (4, 2, 0)
+    assert client.since_calls[0] == _at(today - timedelta(days=8), 0)
+
+    # Later refreshes only reopen yesterday and today; older days keep their counts
+    client.since_calls.clear()
+    client.tables["talent_profiles"].append(_at(today - timedelta(days=4)))  # a late write to a final day
+    stats.refresh(client)
+    assert set(client.since_calls) == {_at(today - timedelta(days=1), 0)}
+    assert stats.latest()["daily_registrations"] == days
+
+
+def test_refresh_swaps_in_a_new_snapshot_for_every_worker():
+    shared = Cache("test_admin_stats", maxsize=8, ttl=60)
+    leader, follower = AdminStats(shared=shared), AdminStats(shared=shared)
+    client = FakeSupabase(talent=[_at(datetime.now(timezone.utc).date())])
+    assert follower.latest() is None
+
+    leader.refresh(client)
+    first = follower.latest()
+    assert first["total_talent"] == 1
+
+    client.tables["talent_profiles"].append(_at(datetime.now(timezone.utc).date()))
+    leader.refresh(client)
+    second = follower.latest()
+    assert second["total_talent"] == 2 and second["generated_at"] >= first["generated_at"]
+    assert first["total_talent"] == 1  # readers holding the old snapshot are unaffected
+
+
+def test_one_worker_holds_the_refresh_lease():
+    shared = Cache("test_admin_lease", maxsize=8, ttl=60)
+    stats = AdminStats(shared=shared)
+    assert stats.holds_lease(ttl=0.2, worker_id="worker-a")
+    assert not stats.holds_lease(ttl=0.2, worker_id="worker-b")
+    assert stats.holds_lease(ttl=0.2, worker_id="worker-a")  # renewed
+    time.sleep(0.25)
+    # worker-a stopped renewing: worker-b takes over
+    assert stats.holds_lease(ttl=0.2, worker_id="worker-b")
+    assert not stats.holds_lease(ttl=0.2, worker_id="worker-a")
+
+
+def test_lease_and_snapshot_on_the_shared_redis_backend(monkeypatch):
+    monkeypatch.setattr(cache_module, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(cache_module, "CACHE_REDIS_URL", "redis://cache")
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(cache_module, "_redis_client", lambda url, timeout: fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(cache_module, "_shared", None)
+    worker_a = AdminStats(shared=Cache("test_admin_redis", ttl=60))
+    cache_module._shared = None  # the second worker opens its own connection
+    worker_b = AdminStats(shared=Cache("test_admin_redis", ttl=60))
+
+    assert worker_a.holds_lease(ttl=60, worker_id="worker-a")
+    assert not worker_b.holds_lease(ttl=60, worker_id="worker-b")
+    worker_a.refresh(FakeSupabase(business=[_at(datetime.now(timezone.utc).date())]))
+    assert worker_b.latest()["total_business"] == 1
@@ -0,0 +1,138 @@
+"""job_application_stats follows every application insert, status change and delete"""
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.orm import sessionmaker
+
+from app.application_stats import APPLICATION_STATUSES, install_application_stats, load_job_stats
+from app.migrations import run_migrations
+from app.models import Application, BusinessProfile, Job, JobApplicationStat, TalentProfile
+
+
+def _job_with_talent(db, talent_count: int):
+    business = BusinessProfile(name="Stats Co")
+    db.add(business)
+    db.flush()
+    job = Job(business_profile_id=business.id, title="Stats job")
+    talents = [TalentProfile(name=f"Stats Talent {i}") for i in range(talent_count)]
+    db.add_all([job, *talents])
+    db.commit()
+    return job.id, [talent.id for talent in talents]
+
+
+def _stats(db, job_id):
+    return load_job_stats(db, [job_id])[job_id]
+
+
+def test_counters_follow_inserts_transitions_and_deletes(db):
+    job_id, talent_ids = _job_with_talent(db, 3)
+    assert _stats(db, job_id) == {"total": 0, **{status: 0 for status in APPLICATION_STATUSES}}
+
+    applications = [Application(job_id=job_id, talent_profile_id=talent_id) for talent_id in talent_ids]
+    db.add_all(applications)
+    db.commit()
+    assert _stats(db, job_id)["applied"] == 3
+
+    applications[0].status = "shortlisted"
+    applications[1].status = "hired"
+    db.commit()
+    applications[0].status = "rejected"
+    db.commit()
+    stats = _stats(db, job_id)
+    assert (stats["applied"], stats["shortlisted"], stats["rejected"], stats["hired"]) == (1, 0, 1, 1)
+
+    db.delete(applications[2])
+    db.commit()
+    stats = _stats(db, job_id)
+    assert (stats["total"], stats["applied"]) == (2, 0)
+
+
+def test_rolled_back_change_leaves_counters_alone(db):
+    job_id, talent_ids = _job_with_talent(db, 1)
+    application = Application(job_id=job_id, talent_profile_id=talent_ids[0])
+    db.add(application)
+    db.commit()
+
+    application.status = "hired"
+    db.flush()
+    db.rollback()
+    stats = _stats(db, job_id)
+    assert (stats["applied"], stats["hired"]) == (1, 0)
+
+
+def test_deleting_a_job_drops_its_counters(db):
+    job_id, talent_ids = _job_with_talent(db, 2)
+    applications = [Application(job_id=job_id, talent_profile_id=talent_id) for talent_id in talent_ids]
+    db.add_all(applications)
+    db.commit()
+    applications[1].status = "hired"
+    db.commit()
+
+    for application in applications:
+        db.delete(application)
+    db.delete(db.get(Job, job_id))
+    db.commit()
+    rows = db.execute(select(JobApplicationStat).where(JobApplicationStat.job_id == job_id)).all()
+    assert rows == []
+
+
+def test_status_endpoint_moves_counters(client, db):
+    job = client.get("/api/jobs/1").json()
+    before = job["application_stats"]
+    application_id = db.execute(
+        select(Application.id).where(Application.job_id == 1, Application.status == "applied").order_by(Application.id.desc())
+    ).scalars().first()
+
+    response = client.put(
+        f"/api/applications/{application_id}/status", params={"email": "owner@example.com"}, json={"status": "hired"}
+    )
+    assert response.status_code == 200
+    after = client.get("/api/jobs/1").json()["application_stats"]
+    assert after["applied"] == before["applied"] - 1
+    assert after["hired"] == before["hired"] + 1
+    assert after["total"] == before["total"]
+
+
+def test_unknown_status_is_rejected(client):
+    response = client.put("/api/applications/1/status", params={"email": "owner@example.com"}, json={"status": "maybe"})
+    assert response.status_code == 400
+
+
+def test_counters_match_a_recount(db):
+    counted = {}
+    for job_id, status in db.execute(select(Application.job_id, Application.status)):
+        counted[(job_id, status)] = counted.get((job_id, status), 0) + 1
+    stored = {
+        (row.job_id, row.status): row.count
+        for row in db.execute(select(JobApplicationStat)).scalars() if row.count
+    }
+    assert stored == counted
+
+
+def test_application_stats_backfill_counts_existing_applications(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'backfill.db'}")
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        business = BusinessProfile(name="Backfill Co")
+        db.add(business)
+        db.flush()
+        job = Job(business_profile_id=business.id, title="Backfill job")
+        talents = [TalentProfile(name=f"Talent {i}", email=f"backfill{i}@example.com") for i in range(3)]
+        db.add_all([job, *talents])
+        db.flush()
+        db.add_all([
+            Application(job_id=job.id, talent_profile_id=talents[0].id, status="applied"),
+            Application(job_id=job.id, talent_profile_id=talents[1].id, status="applied"),
+            Application(job_id=job.id, talent_profile_id=talents[2].id, status="hired"),
+        ])
+        db.commit()
+        job_id = job.id
+
+    with engine.begin() as connection:
+        connection.execute(text("DELETE FROM job_application_stats"))
+        install_application_stats(connection)
+
+    with Session() as db:
+        counts = dict(db.execute(
+            select(JobApplicationStat.status, JobApplicationStat.count).where(JobApplicationStat.job_id == job_id)
+        ).all())
+    assert counts == {"applied": 2, "hired": 1}
@@ -0,0 +1,90 @@
+"""Bulk imports: per-row results, and the row limit checked before anything is written"""
+import asyncio
+import json
+
+from sqlalchemy import func, select, text
+from sqlalchemy.exc import DataError
+
+from app import bulk_import
+from app.bulk_import import BulkImporter, TalentProfileImport, _check_talent_emails
+from app.models import TalentProfile
+
+
+def _talent_count(db) -> int:
+    return db.execute(select(func.count()).select_from(TalentProfile)).scalar()
+
+
+def test_each_row_gets_its_own_result(client):
+    rows = [
+        {"name": "Bulk Ok", "email": "bulk-ok@example.com"},
+        {"email": "bulk-no-name@example.com"},
+        "not an object",
+        {"name": "Taken", "email": "talent1@example.com"},
+        {"name": "First", "email": "bulk-dup@example.com"},
+        {"name": "Second", "email": "BULK-DUP@example.com"},
+    ]
+    response = client.post("/api/talent/bulk", json=rows)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["total"], body["created"], body["failed"]) == (6, 2, 4)
+    results = body["results"]
+    assert [r["index"] for r in results] == list(range(6))
+    assert [r["status"] for r in results] == ["created", "error", "error", "error", "created", "error"]
+    assert "name" in results[1]["error"]
+    assert results[2]["error"] == "Row must be a JSON object"
+    assert "already exists" in results[3]["error"]
+    assert "Duplicate email" in results[5]["error"]
+
+
+def test_missing_business_is_reported_per_row(client):
+    rows = [{"business_profile_id": 1, "title": "Bulk job"}, {"business_profile_id": 999999, "title": "Orphan"}]
+    results = client.post("/api/jobs/bulk", json=rows).json()["results"]
+    assert results[0]["status"] == "created"
+    assert results[1] == {"index": 1, "status": "error", "error": "business_profile_id 999999 does not exist"}
+
+
+def test_unparseable_ndjson_line_fails_only_that_row(client):
+    body = "\n".join([
+        json.dumps({"name": "Ndjson One", "email": "ndjson-1@example.com"}),
+        "{not json",
+        json.dumps({"name": "Ndjson Two", "email": "ndjson-2@example.com"}),
+    ])
+    response = client.post("/api/talent/bulk", content=body, headers={"Content-Type": "application/x-ndjson"})
+    results = response.json()["results"]
+    assert [r["status"] for r in results] == ["created", "error", "created"]
+    assert results[1]["error"].startswith("Invalid JSON")
+
+
+def test_oversized_import_is_rejected_before_writing(client, db, monkeypatch):
+    monkeypatch.setattr(bulk_import, "BULK_MAX_ROWS", 3)
+    before = _talent_count(db)
+    rows = [{"name": f"Too Many {i}", "email": f"too-many-{i}@example.com"} for i in range(4)]
+    response = client.post("/api/talent/bulk", json=rows)
+    assert response.status_code == 413
+    assert _talent_count(db) == before
+
+
+def test_rejected_value_fails_only_its_row(db):
+    def reject_poison(connection, rows, ids):
+        # Stands in for a database error the checks cannot predict, e.g. a value too long for its column
+        if any(row["name"] == "Poison" for row in rows):
+            raise DataError("INSERT INTO talent_skills ...", {}, Exception("value too long"))
+
+    importer = BulkImporter(TalentProfile, TalentProfileImport, _check_talent_emails, reject_poison)
+
+    async def rows():
+        for index, name in enumerate(["Chunk One", "Poison", "Chunk Two"]):
+            yield index, {"name": name, "email": f"dbapi-{index}@example.com"}
+
+    body = asyncio.run(importer.run(db, rows()))
+    assert [r["status"] for r in body["results"]] == ["created", "error", "created"]
+    assert body["results"][1]["error"] == "value too long"
+    emails = set(db.execute(select(TalentProfile.email).where(TalentProfile.email.like("dbapi-%"))).scalars())
+    assert emails == {"dbapi-0@example.com", "dbapi-2@example.com"}
+
+
+def test_email_check_uses_the_lower_email_index(db):
+    plan = db.execute(text(
+        "EXPLAIN QUERY PLAN SELECT email FROM talent_profiles WHERE lower(email) IN ('a@example.com', 'b@example.com')"
+    )).all()
+    assert any("ix_talent_profiles_email_lower" in str(row) for row in plan)
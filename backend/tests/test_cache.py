@@ -0,0 +1,158 @@
+"""Cache generations, invalidation (local, remote and on commit) and the shared-entry encoding"""
+import json
+import threading
+import time
+from datetime import datetime
+
+import fakeredis
+import pytest
+
+from app import cache as cache_module
+from app.auth import UserIdentity
+from app.cache import WORKER_ID, Cache, InvalidationBus, decode_value, encode_value, invalidation_bus
+from app.response_cache import CachedBody
+
+
+def test_fill_that_raced_an_eviction_is_dropped():
+    cache = Cache("test_race", maxsize=16, ttl=60)
+    generation = cache.generation  # read before the slow computation
+    cache.delete("k")              # another request's write lands meanwhile
+    cache.set("k", "stale", generation=generation)
+    assert cache.get("k") is None
+    cache.set("k", "fresh", generation=cache.generation)
+    assert cache.get("k") == "fresh"
+
+
+def test_concurrent_fills_and_clears_never_store_a_pre_clear_value():
+    cache = Cache("test_concurrent", maxsize=1024, ttl=60)
+    version = {"value": 0}
+    stop = threading.Event()
+
+    def writer():
+        while not stop.is_set():
+            version["value"] += 1
+            cache.clear()
+
+    def reader():
+        while not stop.is_set():
+            generation = cache.generation
+            value = version["value"]
+            cache.set("v", value, generation=generation)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    stop.wait(0.3)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    cached = cache.get("v")
+    assert cached is None or cached == version["value"]
+
+
+def test_remote_invalidation_evicts_and_bumps_the_generation():
+    cache = Cache("test_remote", maxsize=16, ttl=60)
+    cache.set(("a", 1), "x")
+    cache.set(("b", 2), "y")
+    generation = cache.generation
+
+    invalidation_bus.apply(json.dumps({"origin": "another-worker", "cache": "test_remote", "keys": [["a", 1]]}))
+    assert cache.get(("a", 1)) is None
+    assert cache.get(("b", 2)) == "y"
+    assert cache.generation > generation
+
+    invalidation_bus.apply(json.dumps({"origin": "another-worker", "cache": "test_remote", "keys": None}))
+    assert cache.get(("b", 2)) is None
+
+
+def test_own_invalidations_are_ignored_when_echoed_back():
+    cache = Cache("test_echo", maxsize=16, ttl=60)
+    cache.set("k", "v")
+    invalidation_bus.apply(json.dumps({"origin": WORKER_ID, "cache": "test_echo", "keys": None}))
+    assert cache.get("k") == "v"
+
+
+@pytest.mark.parametrize("value, value_type", [
+    (UserIdentity(1, "a@example.com", "a", None, "talent", True, 3, None, datetime(2026, 1, 2, 3, 4, 5)), UserIdentity),
+    (CachedBody(b'{"jobs":[]}', '"etag"', datetime(2026, 1, 2)), CachedBody),
+    ({"nested": [1, "two", None]}, None),
+])
+def test_shared_entries_round_trip_as_json(value, value_type):
+    raw = encode_value(value)
+    json.loads(raw)  # plain JSON, not pickle
+    assert decode_value(raw, value_type) == value
+
+
+def test_unencodable_values_are_refused():
+    with pytest.raises(TypeError):
+        encode_value(object())
+
+
+def test_redis_backend_reads_garbage_as_a_miss():
+    from app.cache import _MISSING, RedisBackend, _ServerHealth
+
+    backend = RedisBackend("test_redis", fakeredis.FakeRedis(), _ServerHealth(), UserIdentity)
+    identity = UserIdentity(1, "a@example.com", "a", None, "talent", True, None, None, None)
+    backend.set("user", identity, ttl=60)
+    assert backend.get("user") == identity
+    backend.client.set(backend._key("bad"), b"\x80not json")
+    assert backend.get("bad") is _MISSING
+    backend.clear()
+    assert len(backend) == 0
+
+
+@pytest.fixture
+def workers(monkeypatch):
+    """Two workers' invalidation buses on one fake Redis server"""
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(cache_module, "_redis_client", lambda url, timeout: fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(cache_module, "_shared", None)
+    buses = [InvalidationBus("redis://cache", "test:invalidate", worker_id=name) for name in ("worker-a", "worker-b")]
+    for bus in buses:
+        bus.start()
+        assert bus.subscribed.wait(2)
+    yield buses
+    for bus in buses:
+        bus.stop()
+
+
+def _wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_eviction_reaches_another_workers_memory_cache(workers):
+    bus_a, bus_b = workers
+    cache_a = Cache("cross_worker", ttl=60, bus=bus_a)
+    cache_b = Cache("cross_worker", ttl=60, bus=bus_b)
+    cache_a.set("k", "a's copy")
+    cache_b.set("k", "b's copy")
+    cache_b.set("other", "kept")
+    generation = cache_b.generation
+
+    cache_a.delete("k")
+    assert _wait_for(lambda: cache_b.generation > generation)
+    assert cache_b.get("k") is None
+    assert cache_b.get("other") == "kept"
+    assert cache_a.generation == 1  # its own message came back and was ignored
+
+
+def test_eviction_on_the_shared_redis_backend(workers, monkeypatch):
+    monkeypatch.setattr(cache_module, "CACHE_BACKEND", "redis")
+    monkeypatch.setattr(cache_module, "CACHE_REDIS_URL", "redis://cache")
+    bus_a, bus_b = workers
+    cache_a = Cache("cross_worker_shared", ttl=60, bus=bus_a)
+    cache_b = Cache("cross_worker_shared", ttl=60, bus=bus_b)
+    assert isinstance(cache_b.backend, cache_module.RedisBackend)
+    cache_a.set(("user", 1), "stored once")
+    assert cache_b.get(("user", 1)) == "stored once"
+
+    # b started computing a value before a's eviction; its fill must be dropped
+    generation = cache_b.generation
+    cache_a.clear()
+    assert cache_b.get(("user", 1)) is None
+    assert _wait_for(lambda: cache_b.generation > generation)
+    cache_b.set(("user", 1), "stale", generation=generation)
+    assert cache_a.get(("user", 1)) is None
@@ -0,0 +1,32 @@
+"""Every route against its query and latency budget in endpoint_budgets.json"""
+import pytest
+
+from bench_endpoints import _request, check, load_budgets, measure, uncovered_routes
+
+BUDGETS = load_budgets()
+RUNS = 5
+
+
+@pytest.mark.parametrize("endpoint", BUDGETS["endpoints"], ids=lambda endpoint: endpoint["name"])
+def test_endpoint_within_budget(client, endpoint):
+    result = measure(client, endpoint, RUNS)
+    if endpoint.get("requires") and result["statuses"] == [503]:
+        pytest.skip(f"{endpoint['requires']} not available")
+    assert check(endpoint, result) == []
+
+
+def test_every_route_has_a_budget(seeded):
+    _, app = seeded
+    assert uncovered_routes(app, BUDGETS) == []
+
+
+def test_status_budget_measures_real_transitions(client, db):
+    # Each request moves a different applied application, so none is a no-op write
+    from app.models import Application
+
+    endpoint = next(e for e in BUDGETS["endpoints"] if e["name"] == "applications_status")
+    for n in (30, 31):
+        assert db.get(Application, n).status == "applied"
+        assert _request(client, endpoint, n).status_code == 200
+        db.expire_all()
+        assert db.get(Application, n).status == endpoint["json"]["status"]
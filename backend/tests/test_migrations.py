@@ -0,0 +1,25 @@
+"""Versioned migrations on throwaway SQLite databases"""
+from sqlalchemy import create_engine, select
+
+from app.migrations import MIGRATIONS, SCHEMA_VERSION, current_version, run_migrations, schema_migrations
+
+
+def _engine(tmp_path):
+    return create_engine(f"sqlite:///{tmp_path / 'migrations.db'}")
+
+
+def test_fresh_database_reaches_the_current_version(tmp_path):
+    engine = _engine(tmp_path)
+    assert current_version(engine) is None
+    assert run_migrations(engine) == SCHEMA_VERSION
+    with engine.connect() as connection:
+        applied = connection.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version))
+        assert list(applied.scalars()) == [migration.version for migration in MIGRATIONS]
+
+
+def test_current_schema_is_a_no_op(tmp_path):
+    engine = _engine(tmp_path)
+    run_migrations(engine)
+    assert run_migrations(engine) == SCHEMA_VERSION
+    with engine.connect() as connection:
+        assert len(connection.execute(select(schema_migrations.c.version)).all()) == len(MIGRATIONS)
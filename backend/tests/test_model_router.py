@@ -0,0 +1,88 @@
+"""Model routing: size thresholds, escalation, and recording the model that actually ran"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import model_router
+from app.ai_service import AIService
+from app.model_router import ModelRouter
+
+FAST, LARGE = "fast-model", "large-model"
+
+
+@pytest.fixture
+def router(monkeypatch):
+    monkeypatch.setenv("OPENAI_MODEL", LARGE)
+    monkeypatch.setenv("OPENAI_FAST_MODEL", FAST)
+    monkeypatch.setenv("AI_ROUTE_POLISH_MAX_CHARS", "100")
+    monkeypatch.setenv("AI_ROUTE_RESUME_MAX_DATES", "3")
+    monkeypatch.setenv("AI_LATENCY_BUDGET_POLISH_MS", "500")
+    return ModelRouter()
+
+
+class FakeOpenAI:
+    """chat.completions.create answering per model; records the models called"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.models = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, **kwargs):
+        self.models.append(model)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=self.answers[model]))])
+
+
+@pytest.fixture
+def service(router):
+    service = AIService()
+    service.router = router
+    return service
+
+
+def test_size_threshold(router):
+    assert (router.choose("polish", "x" * 100).model, router.choose("polish", "x" * 100).reason) == (FAST, "small_input")
+    assert (router.choose("polish", "x" * 101).model, router.choose("polish", "x" * 101).reason) == (LARGE, "large_input")
+
+
+def test_dated_resume_is_complex(router):
+    assert router.choose("resume_parse", "2019 2020 2021").model == FAST
+    decision = router.choose("resume_parse", "2018 2019 2020 2021")
+    assert (decision.model, decision.reason) == (LARGE, "complex_input")
+
+
+def test_slow_large_model_keeps_mid_size_inputs_on_the_fast_model(router, monkeypatch):
+    monkeypatch.setattr(model_router.metrics, "summary", lambda name, **labels: {"p95": 2.0})
+    assert router.choose("polish", "x" * 200).reason == "latency_budget"
+    assert router.choose("polish", "x" * 201).model == LARGE
+
+
+def test_routing_disabled(monkeypatch):
+    monkeypatch.setenv("AI_ROUTING_ENABLED", "false")
+    assert ModelRouter().choose("polish", "short").reason == "routing_disabled"
+
+
+def test_escalate(router):
+    escalated = router.escalate(router.choose("polish", "short"), "invalid_json")
+    assert (escalated.model, escalated.reason, escalated.escalated) == (LARGE, "invalid_json", True)
+    assert router.escalate(escalated, "invalid_json") is None
+
+
+def test_failed_validation_falls_back_to_the_large_model(service):
+    service.openai_client = FakeOpenAI({FAST: "not json", LARGE: json.dumps({"experience": [{"company": "A"}]})})
+    parsed, decision = service._parse_resume_once(service.router.choose("resume_parse", "short"), "system", "short")
+    assert service.openai_client.models == [FAST, LARGE]
+    assert decision.model == LARGE and decision.escalated
+    assert parsed["experience"] == [{"company": "A"}]
+
+
+def test_insights_record_the_model_that_ran(service, db, session_factory):
+    from app.models import ResumeInsights
+    from app.resume_insights import generate_resume_insights
+
+    service.openai_client = FakeOpenAI({FAST: json.dumps({"strengths": ["x"]}), LARGE: "{}"})
+    service.router.max_chars["enhance"] = 10 ** 6
+    generate_resume_insights(8, service, session_factory)
+    row = db.query(ResumeInsights).filter(ResumeInsights.resume_id == 8).one()
+    assert (row.status, row.model) == ("completed", FAST)
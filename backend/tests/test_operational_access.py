@@ -0,0 +1,39 @@
+"""Operational endpoints (metrics, pool, routing) need the metrics token or an admin"""
+from types import SimpleNamespace
+
+import pytest
+
+from app import admin_access
+from app.admin_access import revoke_admin_access
+from bench_endpoints import METRICS_TOKEN
+
+
+@pytest.fixture
+def non_admin(monkeypatch):
+    user = SimpleNamespace(email="someone@example.com", user_metadata={})
+    client = SimpleNamespace(auth=SimpleNamespace(admin=SimpleNamespace(
+        get_user_by_id=lambda user_id: SimpleNamespace(user=user)
+    )))
+    monkeypatch.setattr(admin_access, "_service_client", client)
+    revoke_admin_access()
+    yield "non-admin"
+    revoke_admin_access()
+
+
+@pytest.mark.parametrize("path", ["/metrics", "/api/metrics", "/api/db/pool", "/api/ai/routing"])
+def test_anonymous_and_non_admin_callers_are_refused(client, non_admin, path):
+    assert client.get(path).status_code == 403
+    assert client.get(path, headers={"X-User-Id": non_admin}).status_code == 403
+    assert client.get(path, headers={"Authorization": "Bearer wrong"}).status_code == 403
+
+
+def test_metrics_token_is_accepted(client):
+    assert client.get("/api/metrics", headers={"Authorization": f"Bearer {METRICS_TOKEN}"}).status_code == 200
+
+
+def test_label_values_are_escaped():
+    from app.metrics import MetricsRegistry
+
+    registry = MetricsRegistry()
+    registry.incr("requests_total", path='a"b\\c\nd')
+    assert 'path="a\\"b\\\\c\\nd"' in registry.render_prometheus()
@@ -0,0 +1,40 @@
+"""Per-request SQL tracking: statement shapes and the N+1 flag"""
+from sqlalchemy import create_engine, text
+
+from app.query_tracker import (
+    N_PLUS_ONE_THRESHOLD, RequestQueries, end_request, instrument_engine, start_request, statement_shape,
+)
+
+
+def test_shapes_ignore_whitespace_and_in_list_length():
+    assert statement_shape("SELECT *\n  FROM jobs WHERE id IN (?, ?, ?)") == "SELECT * FROM jobs WHERE id IN (?)"
+    assert statement_shape("SELECT * FROM jobs WHERE id IN (%(id_1)s)") == "SELECT * FROM jobs WHERE id IN (?)"
+
+
+def test_repeated_shape_above_the_threshold_is_flagged():
+    queries = RequestQueries()
+    for i in range(N_PLUS_ONE_THRESHOLD):
+        queries.record(f"SELECT * FROM talent_profiles WHERE id IN ({', '.join('?' * (i + 1))})", 0.001)
+    queries.record("SELECT * FROM jobs", 0.5)
+    assert queries.n_plus_one() == []
+    assert "X-DB-N-Plus-One" not in queries.headers()
+
+    queries.record("SELECT  * FROM talent_profiles WHERE id IN (?)", 0.001)
+    assert queries.n_plus_one() == [("SELECT * FROM talent_profiles WHERE id IN (?)", N_PLUS_ONE_THRESHOLD + 1)]
+    headers = queries.headers()
+    assert headers["X-DB-Query-Count"] == str(N_PLUS_ONE_THRESHOLD + 2)
+    assert headers["X-DB-N-Plus-One"].startswith(f"{N_PLUS_ONE_THRESHOLD + 1}x SELECT")
+    assert queries.slowest[0] == (0.5, "SELECT * FROM jobs")
+
+
+def test_engine_events_record_into_the_current_request():
+    engine = instrument_engine(create_engine("sqlite://"))
+    tracker, token = start_request()
+    try:
+        with engine.connect() as connection:
+            for value in range(N_PLUS_ONE_THRESHOLD + 1):
+                connection.execute(text("SELECT :value"), {"value": value})
+    finally:
+        end_request(token)
+    assert tracker.count == N_PLUS_ONE_THRESHOLD + 1
+    assert [count for _, count in tracker.n_plus_one()] == [N_PLUS_ONE_THRESHOLD + 1]
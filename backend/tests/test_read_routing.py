@@ -0,0 +1,89 @@
+"""Read replica routing: read-your-writes pins, and falling back to the primary when the replica fails"""
+import time
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.auth import create_access_token
+
+
+@pytest.fixture
+def database(seeded, monkeypatch):
+    from app import database
+
+    # Pretend a replica is configured; routing only looks at whether it exists
+    monkeypatch.setattr(database, "ReadSessionLocal", object())
+    monkeypatch.setattr(database, "SIGNED_READ_PINS", True)
+    database.read_after_write_pins.clear()
+    return database
+
+
+def _request(headers=()):
+    return Request({
+        "type": "http", "method": "GET", "path": "/", "query_string": b"",
+        "headers": [(name.lower().encode(), value.encode()) for name, value in headers],
+        "client": ("203.0.113.7", 1234),
+    })
+
+
+def _bearer(email):
+    return ("Authorization", f"Bearer {create_access_token({'sub': email})}")
+
+
+def test_writer_is_pinned_by_verified_identity(database):
+    database.mark_client_write(_request([_bearer("writer@example.com")]), Response())
+    assert database._read_target(_request([_bearer("writer@example.com")])) == "read_after_write"
+    # Same address, different user
+    assert database._read_target(_request([_bearer("someone@example.com")])) == "replica"
+
+
+def test_unverified_identities_do_not_pin(database):
+    forged = create_access_token({"sub": "writer@example.com"})[:-4] + "AAAA"
+    database.mark_client_write(_request([("X-User-Id", "1"), ("Authorization", f"Bearer {forged}")]), Response())
+    assert len(database.read_after_write_pins) == 0
+    assert database._read_target(_request([("X-User-Id", "1")])) == "replica"
+
+
+def test_signed_pin_routes_any_worker_to_the_primary(database):
+    response = Response()
+    database.mark_client_write(_request(), response)
+    pin = response.headers[database.READ_AFTER_WRITE_HEADER]
+    assert database.READ_AFTER_WRITE_COOKIE in response.headers["set-cookie"]
+    assert database._read_target(_request([(database.READ_AFTER_WRITE_HEADER, pin)])) == "read_after_write"
+    assert database._read_target(_request([("Cookie", f"{database.READ_AFTER_WRITE_COOKIE}={pin}")])) == "read_after_write"
+
+
+def test_forged_or_expired_pins_are_ignored(database):
+    until = int(time.time()) + 3600
+    assert not database.read_pin_valid(f"{until}.{'0' * 64}")
+    assert not database.read_pin_valid(database.sign_read_pin(int(time.time()) - 1))
+    assert not database.read_pin_valid("garbage")
+    assert database.read_pin_valid(database.sign_read_pin(until))
+
+
+def test_default_secret_key_disables_signed_pins(database, monkeypatch):
+    monkeypatch.setattr(database, "SIGNED_READ_PINS", False)
+    response = Response()
+    database.mark_client_write(_request(), response)
+    assert database.READ_AFTER_WRITE_HEADER not in response.headers
+    assert not database.read_pin_valid(database.sign_read_pin(int(time.time()) + 3600))
+
+
+@pytest.mark.parametrize("path", ["/api/resume", "/api/business/search"])
+def test_replica_failing_mid_request_falls_back_to_the_primary(client, database, monkeypatch, tmp_path, path):
+    # Both replica engines point at a database that cannot be opened
+    missing = tmp_path / "missing" / "replica.db"
+    monkeypatch.setattr(database, "ReadSessionLocal", sessionmaker(bind=create_engine(f"sqlite:///{missing}")))
+    monkeypatch.setattr(database, "AsyncReadSessionLocal",
+                        database._async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{missing}")))
+    monkeypatch.setitem(database._replica_state, "healthy", True)
+    monkeypatch.setitem(database._replica_state, "error", None)
+
+    response = client.get(path)
+    assert response.status_code == 200
+    assert database.REPLICA_FAILED_HEADER not in response.headers
+    assert database._replica_state["healthy"] is False
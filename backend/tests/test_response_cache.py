@@ -0,0 +1,50 @@
+"""Conditional GETs on /api/jobs/public: 304 for a current copy, a new ETag after a job write"""
+from app.models import Job
+from app.response_cache import public_jobs_cache
+
+PARAMS = {"limit": 200}
+
+
+def test_matching_etag_is_not_modified(client):
+    first = client.get("/api/jobs/public", params=PARAMS)
+    etag = first.headers["etag"]
+    assert first.status_code == 200 and first.headers["cache-control"] == "public, no-cache"
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get("/api/jobs/public", params=PARAMS, headers={"If-None-Match": header})
+        assert response.status_code == 304 and response.content == b""
+        assert response.headers["etag"] == etag
+    response = client.get("/api/jobs/public", params=PARAMS, headers={"If-None-Match": '"other"'})
+    assert response.status_code == 200 and response.json() == first.json()
+
+    since = client.get("/api/jobs/public", params=PARAMS, headers={"If-Modified-Since": first.headers["last-modified"]})
+    assert since.status_code == 304
+
+
+def test_job_write_changes_the_etag(client, db):
+    etag = client.get("/api/jobs/public", params=PARAMS).headers["etag"]
+    job = db.get(Job, 3)
+    job.title = "Retitled for a new ETag"
+    db.commit()
+
+    response = client.get("/api/jobs/public", params=PARAMS, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert "Retitled for a new ETag" in [j["title"] for j in response.json()["jobs"]]
+
+
+def test_job_commit_clears_public_jobs_and_rollback_does_not(client, db):
+    client.get("/api/jobs/public")
+    generation = public_jobs_cache.generation
+    job = db.get(Job, 1)
+    job.title = "Retitled in a rolled back transaction"
+    db.flush()
+    db.rollback()
+    assert public_jobs_cache.generation == generation
+
+    job = db.get(Job, 2)
+    job.title = "Retitled"
+    db.commit()
+    assert public_jobs_cache.generation > generation
+    titles = [j["title"] for j in client.get("/api/jobs/public", params=PARAMS).json()["jobs"]]
+    assert "Retitled" in titles
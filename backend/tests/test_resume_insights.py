@@ -0,0 +1,133 @@
+"""Insights generation: failures are reported and retried only after their backoff"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from app.migrations import SCHEMA_VERSION, run_migrations, schema_migrations
+from app.models import ResumeInsights
+from app.resume_insights import (
+    PENDING_TIMEOUT_SECONDS, RETRY_MAX_SECONDS, generate_resume_insights, needs_generation, retry_delay,
+)
+
+
+class FailingAI:
+    model = "test"
+
+    def __init__(self):
+        self.calls = 0
+
+    async def enhance_resume_data_routed(self, payload):
+        self.calls += 1
+        raise RuntimeError("model unavailable")
+
+
+def _row(**values):
+    return ResumeInsights(content_hash="h", **values)
+
+
+def test_retry_delay_doubles_up_to_the_cap():
+    assert retry_delay(2) == 2 * retry_delay(1)
+    assert retry_delay(100) == timedelta(seconds=RETRY_MAX_SECONDS)
+
+
+def test_needs_generation():
+    now = datetime(2026, 1, 1, 12)
+    assert needs_generation(None, "h", now)
+    assert needs_generation(_row(status="completed"), "changed", now)
+    assert not needs_generation(_row(status="completed"), "h", now)
+    assert not needs_generation(_row(status="pending", updated_at=now), "h", now)
+    assert needs_generation(_row(status="pending", updated_at=now - timedelta(seconds=PENDING_TIMEOUT_SECONDS)), "h", now)
+    assert not needs_generation(_row(status="failed", retry_after=now + timedelta(seconds=1)), "h", now)
+    assert needs_generation(_row(status="failed", retry_after=now), "h", now)
+
+
+def test_failure_backs_off_instead_of_retrying_every_request(client, db, session_factory, monkeypatch):
+    import main
+
+    ai = FailingAI()
+    generate_resume_insights(2, ai, session_factory)
+    generate_resume_insights(2, ai, session_factory)
+    assert ai.calls == 1
+    row = db.query(ResumeInsights).filter(ResumeInsights.resume_id == 2).one()
+    assert (row.status, row.attempts) == ("failed", 1)
+    assert row.retry_after > datetime.utcnow()
+
+    scheduled = []
+    monkeypatch.setattr(main, "ai_service", ai)
+    monkeypatch.setattr(main, "generate_resume_insights", lambda *args: scheduled.append(args))
+    response = client.get("/api/resume/2/insights")
+    assert response.status_code == 200
+    assert response.json()["status"] == "failed"
+    assert response.json()["attempts"] == 1
+    assert scheduled == []
+
+    # Once the backoff has passed the next request schedules a retry
+    row.retry_after = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+    response = client.get("/api/resume/2/insights")
+    assert response.status_code == 202
+    assert len(scheduled) == 1
+
+
+@pytest.mark.parametrize("failures", [1, 3])
+def test_attempts_count_consecutive_failures(db, session_factory, failures):
+    resume_id = 2 + failures
+    ai = FailingAI()
+    for _ in range(failures):
+        generate_resume_insights(resume_id, ai, session_factory)
+        db.query(ResumeInsights).filter(ResumeInsights.resume_id == resume_id).update(
+            {"retry_after": datetime.utcnow() - timedelta(seconds=1)}
+        )
+        db.commit()
+    row = db.query(ResumeInsights).filter(ResumeInsights.resume_id == resume_id).one()
+    assert (ai.calls, row.attempts) == (failures, failures)
+
+
+def test_retry_columns_are_added_to_an_old_table(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'insights.db'}")
+    run_migrations(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("ALTER TABLE resume_insights DROP COLUMN attempts")
+        connection.exec_driver_sql("ALTER TABLE resume_insights DROP COLUMN retry_after")
+        connection.execute(schema_migrations.delete().where(schema_migrations.c.version >= 6))
+
+    assert run_migrations(engine) == SCHEMA_VERSION
+    columns = {column["name"] for column in inspect(engine).get_columns("resume_insights")}
+    assert {"attempts", "retry_after"} <= columns
+
+
+def test_only_one_worker_claims_a_retry(db, session_factory):
+    from app.resume_insights import _claim, compute_content_hash, resume_payload
+    from app.models import ResumeData
+
+    resume = db.get(ResumeData, 6)
+    content_hash = compute_content_hash(resume_payload(resume))
+    db.add(ResumeInsights(
+        resume_id=6, content_hash=content_hash, status="failed", attempts=1,
+        retry_after=datetime.utcnow() - timedelta(seconds=1),
+    ))
+    db.commit()
+
+    # Both workers read the row while it was claimable
+    first, second = session_factory(), session_factory()
+    try:
+        rows = [s.query(ResumeInsights).filter(ResumeInsights.resume_id == 6).one() for s in (first, second)]
+        assert all(needs_generation(row, content_hash) for row in rows)
+        claimed = _claim(first, rows[0], 6, content_hash)
+        assert claimed is not None and claimed.status == "pending" and claimed.attempts == 1
+        assert _claim(second, rows[1], 6, content_hash) is None
+    finally:
+        first.close()
+        second.close()
+
+
+def test_changed_content_resets_the_failure_count(db, session_factory):
+    from app.resume_insights import _claim
+
+    db.add(ResumeInsights(resume_id=7, content_hash="old", status="failed", attempts=4,
+                          retry_after=datetime.utcnow() + timedelta(hours=1)))
+    db.commit()
+    row = db.query(ResumeInsights).filter(ResumeInsights.resume_id == 7).one()
+    claimed = _claim(db, row, 7, "new")
+    assert (claimed.status, claimed.content_hash, claimed.attempts) == ("pending", "new", 0)
@@ -0,0 +1,75 @@
+"""Progressive parsing: experience entries are emitted as soon as they close, and reset on escalation"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app.ai_service import AIService
+from app.model_router import ModelRouter
+from app.resume_stream import ExperienceStreamScanner
+
+FAST, LARGE = "fast-model", "large-model"
+
+ENTRIES = [
+    {"company": "Brace {Co}", "title": "Dev \"lead\"", "highlights": [{"text": "a ] b"}]},
+    {"company": "Plain", "title": "Engineer\\Ops"},
+]
+RESPONSE = json.dumps({
+    "name": "Sam",
+    "meta": {"experience": [{"company": "nested, not top level"}]},
+    "experience": ENTRIES,
+    "skills": ["Python"],
+})
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_entries_survive_deltas_split_mid_token(size):
+    scanner = ExperienceStreamScanner()
+    emitted = []
+    for start in range(0, len(RESPONSE), size):
+        emitted.extend(scanner.feed(RESPONSE[start:start + size]))
+    assert emitted == ENTRIES
+    assert scanner.text == RESPONSE
+
+
+def test_entry_is_emitted_on_its_closing_brace():
+    scanner = ExperienceStreamScanner()
+    first_end = RESPONSE.index(json.dumps(ENTRIES[0])) + len(json.dumps(ENTRIES[0]))
+    assert scanner.feed(RESPONSE[:first_end - 1]) == []
+    assert scanner.feed(RESPONSE[first_end - 1]) == [ENTRIES[0]]
+
+
+class StreamingOpenAI:
+    """Streams each model's answer in small deltas"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.models = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model, stream=False, **kwargs):
+        self.models.append(model)
+        content = self.answers[model]
+        return [
+            SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=content[i:i + 5]))])
+            for i in range(0, len(content), 5)
+        ]
+
+
+def test_rejected_fast_output_resets_the_streamed_experiences(monkeypatch):
+    monkeypatch.setenv("OPENAI_MODEL", LARGE)
+    monkeypatch.setenv("OPENAI_FAST_MODEL", FAST)
+    service = AIService()
+    service.router = ModelRouter()
+    # The fast model streams one complete entry, then its output is cut off
+    truncated = json.dumps({"experience": [{"company": "Guess"}, {"company": "Cut"}]})[:-12]
+    service.openai_client = StreamingOpenAI({FAST: truncated, LARGE: RESPONSE})
+
+    events = list(service.stream_parse_resume(b"Sam\nEngineer at Plain", "resume.txt"))
+    names = [event for event, _ in events]
+    assert names[:2] == ["page", "experience"] and events[1][1] == {"company": "Guess"}
+    reset = names.index("reset")
+    assert events[reset][1] == {"reason": "invalid_json", "model": LARGE}
+    assert [data for event, data in events[reset:] if event == "experience"] == ENTRIES
+    assert names[-1] == "complete" and events[-1][1]["experience"] == ENTRIES
+    assert service.openai_client.models == [FAST, LARGE]
@@ -0,0 +1,95 @@
+"""Stored resume texts: deduplicated under concurrent uploads, re-parsed from a checkpoint"""
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import resume_text_store
+from app.migrations import run_migrations
+from app.models import ReparseCheckpoint, ResumeData, ResumeText
+from app.reparse_job import run_reparse_job
+from app.resume_text_store import load_resume_text, normalize_text, store_resume_text, text_hash
+
+
+@pytest.fixture
+def make_session(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'texts.db'}")
+    run_migrations(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def test_same_text_is_stored_once(make_session):
+    db = make_session()
+    first = store_resume_text(db, "Sam Smith  \r\nEngineer\n\n\n\nPython")
+    second = store_resume_text(db, "Sam Smith\nEngineer\n\nPython")
+    db.commit()
+    assert first == second
+    assert db.query(ResumeText).count() == 1
+    assert load_resume_text(db, first) == "Sam Smith\nEngineer\n\nPython"
+    db.close()
+
+
+def test_conflicting_insert_is_ignored(make_session, monkeypatch):
+    text = "Alex Jones\nDesigner"
+    compress = resume_text_store.compress_text
+
+    def upload_wins_race(value):
+        # Another upload stores the same text between our existence check and our insert
+        other = make_session()
+        other.add(ResumeText(content_hash=text_hash(text), compressed_text=compress(value), filename="other.pdf"))
+        other.commit()
+        other.close()
+        return compress(value)
+
+    db = make_session()
+    monkeypatch.setattr(resume_text_store, "compress_text", upload_wins_race)
+    store_resume_text(db, text, "ours.pdf")
+    db.commit()
+    rows = db.query(ResumeText).all()
+    assert [row.filename for row in rows] == ["other.pdf"]
+    db.close()
+
+
+class FakeParser:
+    """parse_text stand-in recording the texts it was asked to parse"""
+
+    def __init__(self):
+        self.texts = []
+
+    async def parse_text(self, text, filename):
+        self.texts.append(text)
+        return {
+            "name": text.split("\n")[0].upper(),
+            "raw_data": {"text_hash": text_hash(normalize_text(text)), "parsing_model": "fast-model"},
+        }
+
+
+def test_reparse_resumes_from_its_checkpoint(make_session):
+    texts = ["Resume one\nPython", "Resume two\nGo", "Resume one\nPython", "Resume four\nRust", "Resume five\nSQL"]
+    db = make_session()
+    for text in texts:
+        db.add(ResumeData(name="old", raw_data={"text_hash": store_resume_text(db, text)}))
+    db.add(ResumeData(name="no text", raw_data={}))
+    db.commit()
+    db.close()
+
+    ai = FakeParser()
+    progress = []
+    state = asyncio.run(run_reparse_job(ai, make_session, batch_size=2, max_resumes=2, progress=progress.append))
+    assert (state["status"], state["last_resume_id"], state["processed"]) == ("running", 2, 2)
+
+    # The second run picks up after resume 2; the duplicate text in batch 2 is parsed once
+    ai.texts.clear()
+    state = asyncio.run(run_reparse_job(ai, make_session, batch_size=2, progress=progress.append))
+    assert (state["status"], state["processed"], state["skipped"], state["failed"]) == ("completed", 5, 1, 0)
+    assert state["parsing_model"] == "fast-model"
+    assert ai.texts == ["Resume one\nPython", "Resume four\nRust", "Resume five\nSQL"]
+
+    db = make_session()
+    assert [r.name for r in db.query(ResumeData).order_by(ResumeData.id)] == [
+        "RESUME ONE", "RESUME TWO", "RESUME ONE", "RESUME FOUR", "RESUME FIVE", "no text",
+    ]
+    assert db.query(ReparseCheckpoint).one().last_resume_id == 6
+    db.close()
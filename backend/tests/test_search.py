@@ -0,0 +1,28 @@
+"""Full-text search terms: stopword-only queries still find rows"""
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+
+from app.models import BusinessProfile, Job
+from app.search import apply_fulltext, search_tokens
+
+
+def test_search_tokens_drop_punctuation_and_stopwords():
+    assert search_tokens("Head of Sales & (Marketing)!") == ["Head", "Sales", "Marketing"]
+    assert search_tokens("the and of") == []
+    assert search_tokens("___ --") == []
+
+
+def test_postgres_query_has_no_stopwords():
+    stmt, _ = apply_fulltext(select(Job.id), Job, "engineer for the team", "postgresql")
+    params = stmt.compile(dialect=postgresql.dialect()).params
+    assert "engineer:* & team:*" in params.values()
+
+
+def test_stopword_only_query_falls_back_to_substring_matching(client, db):
+    # Seeded business descriptions read "Engineering and consulting firm ..."
+    expected = db.query(BusinessProfile).filter(
+        BusinessProfile.name.ilike("%and%") | BusinessProfile.description.ilike("%and%")
+    ).count()
+    response = client.get("/api/business/search", params={"query": "and"})
+    assert response.status_code == 200
+    assert response.json()["count"] == expected > 0
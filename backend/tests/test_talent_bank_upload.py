@@ -0,0 +1,70 @@
+"""Talent bank uploads: per-file failures are reported, a failed database write keeps nothing"""
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from app.models import TalentBankItem
+
+
+class FakeStorage:
+    """Storage bucket whose upload fails for files named bad*"""
+
+    def __init__(self):
+        self.objects = {}
+
+    def upload(self, path, content):
+        if path.split("_", 1)[1].startswith("bad"):
+            return SimpleNamespace(error="bucket rejected the file")
+        self.objects[path] = content
+        return SimpleNamespace(error=None)
+
+    def get_public_url(self, path):
+        return f"https://storage.example.com/{path}"
+
+    def remove(self, paths):
+        for path in paths:
+            self.objects.pop(path, None)
+
+
+@pytest.fixture
+def storage(seeded, monkeypatch):
+    import main
+
+    bucket = FakeStorage()
+    monkeypatch.setattr(main, "get_supabase", lambda: SimpleNamespace(storage=SimpleNamespace(from_=lambda name: bucket)))
+    return bucket
+
+
+def _upload(client, names):
+    files = [("files", (name, f"content of {name}".encode(), "text/plain")) for name in names]
+    return client.post("/api/talent-bank/upload", params={"email": "talent@example.com"}, files=files)
+
+
+def _titles(db, prefix):
+    return sorted(title for title, in db.query(TalentBankItem.title).filter(TalentBankItem.title.like(f"{prefix}%")))
+
+
+def test_failed_file_is_reported_and_the_rest_are_kept(client, db, storage):
+    response = _upload(client, ["partial-a.txt", "bad-partial.txt", "partial-b.txt"])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2
+    assert body["failed"] == [{"filename": "bad-partial.txt", "error": "bucket rejected the file"}]
+    assert _titles(db, "partial-") == ["partial-a.txt", "partial-b.txt"]
+
+
+def test_failed_database_write_keeps_no_rows_and_no_objects(client, db, storage):
+    def reject(mapper, connection, item):
+        if item.title == "rollback-b.txt":
+            raise RuntimeError("insert failed")
+
+    event.listen(TalentBankItem, "before_insert", reject)
+    try:
+        response = _upload(client, ["rollback-a.txt", "rollback-b.txt", "rollback-c.txt"])
+    finally:
+        event.remove(TalentBankItem, "before_insert", reject)
+    assert response.status_code == 500
+    # The rows are written in one transaction, so the files that did insert are rolled back too
+    assert _titles(db, "rollback-") == []
+    assert storage.objects == {}
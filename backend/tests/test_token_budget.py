@@ -0,0 +1,84 @@
+"""Pre-flight budgeting: one-shot, chunked and trimmed plans, and the output reserve"""
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from app import token_budget
+from app.token_budget import (
+    OUTPUT_TOKEN_RESERVE, estimate_tokens, plan_prompt, split_exact, to_json, trim_fields,
+)
+
+MODEL = "tiny-test-model"
+
+
+@pytest.fixture(autouse=True)
+def tiny_context(monkeypatch):
+    # Polish input is capped by its own reserve; give the other tasks a small window too
+    monkeypatch.setitem(token_budget.MODEL_CONTEXT_WINDOWS, MODEL, 6000)
+
+
+DOCUMENT = "\n\n".join(
+    f"Heading {i}\n" + " ".join(f"Sentence {i}.{j} about delivery, teams and  spacing." for j in range(12))
+    for i in range(60)
+) + "\n"
+
+
+def test_small_input_is_one_shot():
+    plan = plan_prompt("polish", MODEL, "Polish this:", "A short paragraph.")
+    assert (plan.strategy, plan.chunks) == ("one_shot", [])
+
+
+def test_polish_chunks_join_back_to_the_exact_input():
+    plan = plan_prompt("polish", MODEL, "Polish this:", DOCUMENT)
+    assert plan.strategy == "chunk" and len(plan.chunks) > 1
+    assert "".join(plan.chunks) == DOCUMENT
+    assert all(estimate_tokens(chunk, MODEL) <= plan.max_input_tokens for chunk in plan.chunks)
+    # Breaks fall after blank lines, so no chunk starts mid-paragraph
+    assert all(chunk.startswith("Heading") for chunk in plan.chunks)
+
+
+@pytest.mark.parametrize("max_tokens", [5, 40, 300])
+def test_split_exact_is_lossless(max_tokens):
+    text = "Line one.\n\nLine  two has\ttabs and   spaces.\nLine three. Ünïcödé text — dashes.\n" * 20
+    assert "".join(split_exact(text, max_tokens, MODEL)) == text
+
+
+def test_resume_parse_chunks_cover_every_paragraph():
+    plan = plan_prompt("resume_parse", MODEL, "Parse:", DOCUMENT)
+    assert plan.strategy == "chunk" and len(plan.chunks) > 1
+    assert all(estimate_tokens(chunk, MODEL) <= plan.max_input_tokens for chunk in plan.chunks)
+    joined = "\n".join(plan.chunks)
+    assert all(f"Sentence {i}.11 " in joined for i in range(60))
+
+
+def test_enhance_is_trimmed_to_well_formed_json():
+    data = {
+        "name": "Sam",
+        "summary": "Engineer",
+        "experience": [{"company": f"Company {i}", "description": "Work. " * 40} for i in range(80)],
+        "skills": [f"skill {i}" for i in range(50)],
+    }
+    plan = plan_prompt("enhance", MODEL, "Enhance:", to_json(data))
+    assert plan.strategy == "trim" and plan.chunks == []
+    trimmed = trim_fields(data, plan.max_input_tokens, MODEL)
+    assert estimate_tokens(to_json(trimmed), MODEL) <= plan.max_input_tokens
+    assert json.loads(to_json(trimmed))["name"] == "Sam"
+    assert trimmed["experience"] == data["experience"][:len(trimmed["experience"])]
+    assert len(data["experience"]) == 80  # the caller's data is not modified
+
+
+def test_completion_is_capped_at_the_reserve():
+    from app.ai_service import AIService
+
+    calls = []
+
+    def create(model, **kwargs):
+        calls.append(kwargs)
+        content = json.dumps({"experience": [{"company": "A"}]})
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    service = AIService()
+    service.openai_client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create)))
+    service._parse_resume_once(service.router.choose("resume_parse", "text"), "system", "text")
+    assert calls[0]["max_tokens"] == OUTPUT_TOKEN_RESERVE["resume_parse"]
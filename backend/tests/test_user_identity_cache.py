@@ -0,0 +1,64 @@
+"""User identity cache: committed User and profile changes evict it, stale entries are dropped"""
+import pytest
+from sqlalchemy import delete
+
+from app.auth import get_user_identity, user_cache
+from app.models import TalentProfile, User
+
+
+def _user(db, name, **values):
+    user = User(email=f"{name}@example.com", username=name, hashed_password="", **values)
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _cached(email):
+    return user_cache.get(("email", email))
+
+
+def test_committed_user_change_evicts_the_identity(db):
+    user = _user(db, "identity-rename", full_name="Before")
+    assert get_user_identity(db, user.email).full_name == "Before"
+
+    user.full_name = "After"
+    db.flush()
+    assert _cached(user.email).full_name == "Before"  # not until the commit
+    db.commit()
+    assert _cached(user.email) is None
+    assert get_user_identity(db, user.email).full_name == "After"
+
+
+def test_rolled_back_change_keeps_the_identity(db):
+    user = _user(db, "identity-rollback", full_name="Kept")
+    get_user_identity(db, user.email)
+    user.full_name = "Discarded"
+    db.flush()
+    db.rollback()
+    assert _cached(user.email).full_name == "Kept"
+
+
+def test_deleted_talent_profile_evicts_identities(db):
+    talent = TalentProfile(name="Identity Talent", email="identity-talent@example.com")
+    db.add(talent)
+    db.flush()
+    user = _user(db, "identity-talent-owner", talent_profile_id=talent.id)
+    assert get_user_identity(db, user.email).talent_profile_id == talent.id
+
+    user.talent_profile_id = None
+    db.delete(talent)
+    db.commit()
+    assert _cached(user.email) is None
+
+
+@pytest.mark.parametrize("path, user_type", [("/api/talent/me", "talent"), ("/api/business/profile/me", "business")])
+def test_profile_update_for_a_deleted_user_is_404(client, db, path, user_type):
+    user = _user(db, f"identity-gone-{user_type}", user_type=user_type)
+    get_user_identity(db, user.email)
+    # Removed behind the ORM's back, so nothing evicted the cached identity
+    db.execute(delete(User).where(User.id == user.id))
+    db.commit()
+
+    response = client.put(path, params={"email": user.email}, json={"name": "Nobody"})
+    assert response.status_code == 404
+    assert _cached(user.email) is None